@@ -10,12 +10,26 @@ from ..settings import (
     DISKETTE_DUMP_PATH,
     DISKETTE_DUMP_FILENAME,
     DISKETTE_DUMP_PERMISSIONS,
+    DISKETTE_DUMP_COMPRESSION,
+    DISKETTE_DUMP_COMPRESSION_THREADS,
+    DISKETTE_DUMP_STORE_INCOMPRESSIBLE,
+    DISKETTE_DUMP_LAYOUT,
+    DISKETTE_DUMP_SPOOL_SIZE,
+    DISKETTE_DUMP_CHUNK,
     DISKETTE_LOAD_STORAGES_PATH,
     DISKETTE_LOAD_MINIMAL_FILESIZE,
+    DISKETTE_LOAD_LEDGER_PATH,
+    DISKETTE_EXTRACTION_CACHE_PATH,
+    DISKETTE_EXTRACTION_CACHE_SIZE,
     DISKETTE_DOWNLOAD_ALLOWED_PROTOCOLS,
     DISKETTE_DOWNLOAD_CHUNK,
     DISKETTE_DOWNLOAD_TIMEOUT,
     DISKETTE_DOWNLOAD_ALLOW_REDIRECT,
+    DISKETTE_DOWNLOAD_SEGMENTS,
+    DISKETTE_DOWNLOAD_CACHE_PATH,
+    DISKETTE_DOWNLOAD_CACHE_SIZE,
+    DISKETTE_DOWNLOAD_RETRIES,
+    DISKETTE_DOWNLOAD_RETRY_DELAY,
 )
 
 
@@ -52,10 +66,25 @@ class DisketteDefaultSettings:
 
     DISKETTE_DUMP_PERMISSIONS = DISKETTE_DUMP_PERMISSIONS
 
+    DISKETTE_DUMP_COMPRESSION = DISKETTE_DUMP_COMPRESSION
+    DISKETTE_DUMP_COMPRESSION_THREADS = DISKETTE_DUMP_COMPRESSION_THREADS
+    DISKETTE_DUMP_STORE_INCOMPRESSIBLE = DISKETTE_DUMP_STORE_INCOMPRESSIBLE
+    DISKETTE_DUMP_LAYOUT = DISKETTE_DUMP_LAYOUT
+
+    DISKETTE_DUMP_SPOOL_SIZE = DISKETTE_DUMP_SPOOL_SIZE
+
+    DISKETTE_DUMP_CHUNK = DISKETTE_DUMP_CHUNK
+
     DISKETTE_LOAD_STORAGES_PATH = DISKETTE_LOAD_STORAGES_PATH
 
     DISKETTE_LOAD_MINIMAL_FILESIZE = DISKETTE_LOAD_MINIMAL_FILESIZE
 
+    DISKETTE_LOAD_LEDGER_PATH = DISKETTE_LOAD_LEDGER_PATH
+
+    DISKETTE_EXTRACTION_CACHE_PATH = DISKETTE_EXTRACTION_CACHE_PATH
+
+    DISKETTE_EXTRACTION_CACHE_SIZE = DISKETTE_EXTRACTION_CACHE_SIZE
+
     DISKETTE_DOWNLOAD_ALLOWED_PROTOCOLS = DISKETTE_DOWNLOAD_ALLOWED_PROTOCOLS
 
     DISKETTE_DOWNLOAD_CHUNK = DISKETTE_DOWNLOAD_CHUNK
@@ -63,3 +92,13 @@ class DisketteDefaultSettings:
     DISKETTE_DOWNLOAD_TIMEOUT = DISKETTE_DOWNLOAD_TIMEOUT
 
     DISKETTE_DOWNLOAD_ALLOW_REDIRECT = DISKETTE_DOWNLOAD_ALLOW_REDIRECT
+
+    DISKETTE_DOWNLOAD_SEGMENTS = DISKETTE_DOWNLOAD_SEGMENTS
+
+    DISKETTE_DOWNLOAD_CACHE_PATH = DISKETTE_DOWNLOAD_CACHE_PATH
+
+    DISKETTE_DOWNLOAD_CACHE_SIZE = DISKETTE_DOWNLOAD_CACHE_SIZE
+
+    DISKETTE_DOWNLOAD_RETRIES = DISKETTE_DOWNLOAD_RETRIES
+
+    DISKETTE_DOWNLOAD_RETRY_DELAY = DISKETTE_DOWNLOAD_RETRY_DELAY
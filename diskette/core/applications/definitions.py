@@ -3,8 +3,12 @@ from pathlib import Path
 from django.utils.text import slugify
 
 from ...exceptions import ApplicationConfigError
-from ..defaults import DEFAULT_FORMAT, AVAILABLE_FORMATS
+from ..defaults import (
+    DEFAULT_FORMAT, AVAILABLE_FORMATS, AVAILABLE_PAGINATIONS, AVAILABLE_SERIALIZERS,
+    DUMP_ENGINE_COMMAND, TUNED_DUMP_COMMANDS,
+)
 
+from ..serializers.values import ValuesSerializer
 from .store import get_appstore
 
 
@@ -48,6 +52,29 @@ class ApplicationConfig:
             ``django-polymorphic`` you should give value ``polymorphic_dumpdata`` here.
         use_base_manager (boolean): Bypass possible custom manager from model(s). This
             is the equivalent of ``all`` option from Django command ``dumpdata``.
+        chunk_size (integer): Number of objects to fetch at once from database when
+            dumping model objects. If not given, the default one from Django queryset
+            iterator is used.
+        pagination (string): Define how model objects are iterated during dump, either
+            ``cursor`` to use a queryset iterator (which is a named server side cursor
+            with PostgreSQL) or ``keyset`` to walk over primary key ranges with a short
+            query for each chunk. If not given, the ``cursor`` mode is used.
+        partitions (integer): Number of primary key ranges to split the model table
+            into. Each range is dumped into its own dump file (a shard) so they can be
+            dumped concurrently. This can only be used with an application that
+            includes a single model. If not given, the model table is dumped in a
+            single file.
+        serializer (string): Serializer to use for dump, either ``django`` to use the
+            Django serializer for the format from filename extension or ``values`` to
+            use a faster serializer which reads raw row values without to instanciate
+            model objects. The ``values`` serializer only supports ``json`` and
+            ``jsonl`` formats and can not be used with natural keys. If not given, the
+            ``django`` serializer is used.
+
+        Options ``chunk_size``, ``pagination``, ``partitions`` and ``serializer`` are
+        dump tuning options only implemented by Diskette dump commands, application
+        using one of them will use the ``diskette_dumpdata`` command instead of
+        ``dumpdata``.
 
     Attributes:
         CONFIG_ATTRS (list): List of object attribute names to export in application
@@ -72,6 +99,10 @@ class ApplicationConfig:
         "allow_drain",
         "dump_command",
         "use_base_manager",
+        "chunk_size",
+        "pagination",
+        "partitions",
+        "serializer",
     ]
     OPTIONS_ATTRS = [
         "models",
@@ -85,7 +116,8 @@ class ApplicationConfig:
     def __init__(self, name, models=[], excludes=None, natural_foreign=False,
                  natural_primary=False, comments=None, filename=None,
                  is_drain=None, allow_drain=False, dump_command=None,
-                 use_base_manager=False):
+                 use_base_manager=False, chunk_size=None, pagination=None,
+                 partitions=None, serializer=None):
         self.name = name
         self._models = [models] if isinstance(models, str) else models
         self._excludes = excludes or []
@@ -97,6 +129,10 @@ class ApplicationConfig:
         self.dump_command = dump_command
         self.is_drain = False
         self.use_base_manager = use_base_manager
+        self.chunk_size = chunk_size
+        self.pagination = pagination
+        self.partitions = partitions
+        self.serializer = serializer
 
     def __repr__(self):
         return "<{klass}: {name}>".format(
@@ -171,6 +207,74 @@ class ApplicationConfig:
         """
         return slugify(self.name) + "." + (format_extension or DEFAULT_FORMAT)
 
+    @property
+    def is_tuned(self):
+        """
+        Determine if application defines some dump tuning options.
+
+        Returns:
+            boolean: True if at least one tuning option is defined.
+        """
+        return (
+            self.chunk_size is not None or
+            self.pagination is not None or
+            self.partitions is not None or
+            self.serializer is not None
+        )
+
+    @property
+    def filenames(self):
+        """
+        List all dump filenames for application.
+
+        Returns:
+            list: Either every shard filenames if application is partitioned, else
+            just the application filename.
+        """
+        if self.partitions:
+            return [
+                self.get_shard_filename(i)
+                for i in range(1, self.partitions + 1)
+            ]
+
+        return [self.filename]
+
+    def get_shard_filename(self, index):
+        """
+        Build a shard filename from application filename.
+
+        Arguments:
+            index (integer): Shard position, starting from ``1``.
+
+        Returns
+            string: Shard filename, like ``foo_part02.json`` for the second shard of
+            an application with filename ``foo.json`` and at least 10 partitions.
+        """
+        path = Path(self.filename)
+
+        return "{stem}_part{index}{suffix}".format(
+            stem=path.stem,
+            index=str(index).zfill(len(str(self.partitions))),
+            suffix=path.suffix,
+        )
+
+    @property
+    def effective_dump_command(self):
+        """
+        Returns the dump command name to use for application, if any.
+
+        Returns:
+            string: Either the custom command name from ``dump_command``, the Diskette
+            dump command name if application defines tuning options, else ``None``.
+        """
+        if self.dump_command:
+            return self.dump_command
+
+        if self.is_tuned:
+            return DUMP_ENGINE_COMMAND
+
+        return None
+
     def as_config(self):
         """
         Returns Application configuration suitable for dump history.
@@ -302,6 +406,94 @@ class ApplicationConfig:
                     formats=", ".join(AVAILABLE_FORMATS),
                 ))
 
+    def validate_tuning(self):
+        """
+        Validate dump tuning options.
+        """
+        if self.chunk_size is not None and (
+            isinstance(self.chunk_size, bool) or
+            not isinstance(self.chunk_size, int) or
+            self.chunk_size < 1
+        ):
+            msg = "{obj}: 'chunk_size' must be a positive integer."
+            raise ApplicationConfigError(msg.format(
+                obj=self.__repr__(),
+            ))
+
+        if (
+            self.pagination is not None and
+            self.pagination not in AVAILABLE_PAGINATIONS
+        ):
+            msg = (
+                "{obj}: Given pagination '{pagination}' is not allowed, it must be "
+                "one of: {choices}"
+            )
+            raise ApplicationConfigError(msg.format(
+                obj=self.__repr__(),
+                pagination=self.pagination,
+                choices=", ".join(AVAILABLE_PAGINATIONS),
+            ))
+
+        if self.partitions is not None:
+            if (
+                isinstance(self.partitions, bool) or
+                not isinstance(self.partitions, int) or
+                self.partitions < 2
+            ):
+                msg = "{obj}: 'partitions' must be an integer greater than 1."
+                raise ApplicationConfigError(msg.format(
+                    obj=self.__repr__(),
+                ))
+
+            if len(self.models) != 1:
+                msg = (
+                    "{obj}: 'partitions' can only be used with an application that "
+                    "includes a single model."
+                )
+                raise ApplicationConfigError(msg.format(
+                    obj=self.__repr__(),
+                ))
+
+        if self.serializer is not None:
+            if self.serializer not in AVAILABLE_SERIALIZERS:
+                msg = (
+                    "{obj}: Given serializer '{serializer}' is not allowed, it must be "
+                    "one of: {choices}"
+                )
+                raise ApplicationConfigError(msg.format(
+                    obj=self.__repr__(),
+                    serializer=self.serializer,
+                    choices=", ".join(AVAILABLE_SERIALIZERS),
+                ))
+
+            if self.serializer == "values":
+                if Path(self.filename).suffix[1:] not in ValuesSerializer.FORMATS:
+                    msg = (
+                        "{obj}: Serializer 'values' only supports these formats: "
+                        "{formats}"
+                    )
+                    raise ApplicationConfigError(msg.format(
+                        obj=self.__repr__(),
+                        formats=", ".join(ValuesSerializer.FORMATS),
+                    ))
+
+                if self.natural_foreign or self.natural_primary:
+                    msg = "{obj}: Serializer 'values' does not support natural keys."
+                    raise ApplicationConfigError(msg.format(
+                        obj=self.__repr__(),
+                    ))
+
+        if self.is_tuned and self.effective_dump_command not in TUNED_DUMP_COMMANDS:
+            msg = (
+                "{obj}: Dump tuning options can not be used with custom dump command "
+                "'{command}', only these ones support them: {commands}"
+            )
+            raise ApplicationConfigError(msg.format(
+                obj=self.__repr__(),
+                command=self.dump_command,
+                commands=", ".join(TUNED_DUMP_COMMANDS),
+            ))
+
     def validate(self):
         """
         Validate Application options.
@@ -312,6 +504,7 @@ class ApplicationConfig:
         self.validate_filename()
         self.validate_includes()
         self.validate_excludes()
+        self.validate_tuning()
 
 
 class DrainApplicationConfig(ApplicationConfig):
@@ -338,6 +531,10 @@ class DrainApplicationConfig(ApplicationConfig):
         "is_drain",
         "drain_excluded",
         "dump_command",
+        "chunk_size",
+        "pagination",
+        "partitions",
+        "serializer",
     ]
     OPTIONS_ATTRS = [
         "models",
@@ -7,3 +7,119 @@ AVAILABLE_FORMATS = ("json", "jsonl", "xml", "yaml")
 """
 Available format for serialization with Django ``dumpdata`` command.
 """
+
+AVAILABLE_PAGINATIONS = ("cursor", "keyset")
+"""
+Available pagination modes to iterate over model objects from Diskette dump command.
+"""
+
+AVAILABLE_SERIALIZERS = ("django", "values")
+"""
+Available serializers from Diskette dump command, ``values`` one is a fast serializer
+which only supports ``json`` and ``jsonl`` formats.
+"""
+
+DEFAULT_CHUNK_SIZE = 2000
+"""
+Default number of objects to fetch at once from database when iterating over model
+objects, this is the same default value than Django ``QuerySet.iterator()``.
+"""
+
+DUMP_ENGINE_COMMAND = "diskette_dumpdata"
+"""
+Name of Diskette dump command which implements the dump tuning options from
+applications.
+"""
+
+TUNED_DUMP_COMMANDS = (DUMP_ENGINE_COMMAND, "polymorphic_dumpdata")
+"""
+Dump commands which accept the dump tuning options from applications.
+"""
+
+AVAILABLE_LOAD_ENGINES = ("loaddata", "bulk")
+"""
+Available engines to load data dumps, ``loaddata`` is the Django command which saves
+objects one by one and ``bulk`` is the Diskette command which inserts objects in
+batches.
+"""
+
+DEFAULT_LOAD_BATCH_SIZE = 1000
+"""
+Default number of objects to insert at once with the bulk load engine.
+"""
+
+LOAD_ENGINE_COMMAND = "diskette_loaddata"
+"""
+Name of Diskette load command which implements the bulk load engine.
+"""
+
+DEFAULT_PIPELINE_QUEUE_SIZE = 64
+"""
+Maximum number of extracted files waiting to be handed over to the data loading
+stage of a pipelined deploy.
+"""
+
+AVAILABLE_COMPRESSIONS = ("gzip", "bz2", "xz", "zstd", "none")
+"""
+Available compression codecs for dump archives, ``zstd`` requires the package
+``zstandard`` and ``none`` writes a plain tarball.
+"""
+
+DEFAULT_GZIP_BLOCK_SIZE = 1024 * 1024
+"""
+Size in bytes of blocks compressed independently by the parallel gzip writer. Each
+block adds a gzip header and trailer of 18 bytes and compression does not share
+history between blocks, a smaller size is faster but a bit less efficient.
+"""
+
+INCOMPRESSIBLE_EXTENSIONS = (
+    ".7z", ".apk", ".avif", ".avi", ".bz2", ".docx", ".epub", ".flac", ".gif",
+    ".gz", ".heic", ".jar", ".jpeg", ".jpg", ".m4a", ".m4v", ".mkv", ".mov", ".mp3",
+    ".mp4", ".odp", ".ods", ".odt", ".ogg", ".ogv", ".opus", ".pdf", ".png", ".pptx",
+    ".rar", ".tgz", ".webm", ".webp", ".woff", ".woff2", ".xlsx", ".xz", ".zip",
+    ".zst",
+)
+"""
+File extensions of formats which are already compressed, they are not worth to be
+compressed again.
+"""
+
+COMPRESSIBILITY_SAMPLE_SIZE = 64 * 1024
+"""
+Size in bytes of the sample read from a file to check if it is compressible.
+"""
+
+COMPRESSIBILITY_MINIMUM_SIZE = 512
+"""
+Files smaller than this size in bytes are not checked and assumed compressible.
+"""
+
+COMPRESSIBILITY_RATIO = 0.9
+"""
+A file is assumed to be incompressible when its compressed sample is bigger than this
+ratio of the sample size.
+"""
+
+AVAILABLE_LAYOUTS = ("single", "sections", "indexed")
+"""
+Available dump archive layouts. With ``single`` everything is in a compressed
+archive, with ``sections`` data and each storage are archives compressed on their own
+inside an uncompressed archive and with ``indexed`` every archive member is compressed
+on its own and an index of their positions is at the front of archive.
+"""
+
+ARCHIVE_INDEX_FILENAME = "index.json"
+"""
+Filename of the index member at the front of archives with the ``indexed`` layout.
+"""
+
+ARCHIVE_INDEX_VERSION = 1
+"""
+Version of index format for archives with the ``indexed`` layout.
+"""
+
+DOWNLOAD_SEGMENT_MINIMAL_SIZE = 8 * 1024 * 1024
+"""
+Minimal size in bytes of a download segment. Archives smaller than twice this size
+are downloaded in a single stream.
+"""
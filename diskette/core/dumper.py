@@ -1,8 +1,10 @@
 import datetime
+import io
 import json
 import shutil
 import tarfile
 import tempfile
+from contextlib import contextmanager, nullcontext
 from pathlib import Path
 
 from django.conf import settings
@@ -11,13 +13,67 @@ from django.template.defaultfilters import filesizeformat
 from ..exceptions import (
     ApplicationConfigError, ApplicationRegistryError, DumperError
 )
-from ..utils import versionning
+from ..utils import hashs, versionning
+from ..utils.archives import (
+    get_gzip_writer, is_compressible, open_archive_writer, parse_compression,
+    replace_archive_extension
+)
 from ..utils.lists import get_duplicates, unduplicated_merge_lists
-from ..utils.loggers import NoOperationLogger
+from ..utils.loggers import NoOperationLogger, RecordingOutput
+from ..utils.querysets import get_pk_boundaries
+from ..utils.streams import EncodedWriter
 
 from .applications import ApplicationConfig, DrainApplicationConfig
+from .applications.store import get_appstore
 from .serializers import DumpdataSerializerAbstract
 from .storages import StorageMixin
+from .workers import get_process_pool
+
+
+# Dumper instance shared with forked dump workers
+_WORKER_DUMPER = None
+
+
+def _dump_worker_initializer(dumper):
+    """
+    Store the dumper instance to use in a dump worker.
+
+    Arguments:
+        dumper (Dumper): The dumper instance inherited from parent process.
+    """
+    global _WORKER_DUMPER
+    _WORKER_DUMPER = dumper
+
+
+def _dump_worker(index, shard=None, destination=None, indent=None):
+    """
+    Dump an application data from a worker.
+
+    Messages from dump are recorded instead of being output since the worker can not
+    reach the parent logger.
+
+    Arguments:
+        index (integer): Index of application to dump in ``Dumper.apps``.
+
+    Keyword Arguments:
+        shard (tuple): Application shard to dump, see ``Dumper.get_dump_tasks``.
+        destination (Path): Directory where to write dump file.
+        indent (integer): Indentation level for dump data.
+
+    Returns:
+        tuple: The dump output and the list of recorded messages.
+    """
+    output = RecordingOutput()
+    _WORKER_DUMPER.logger = output
+
+    content = _WORKER_DUMPER.call(
+        _WORKER_DUMPER.apps[index],
+        destination=destination,
+        indent=indent,
+        shard=shard,
+    )
+
+    return content, output.records
 
 
 class Dumper(StorageMixin, DumpdataSerializerAbstract):
@@ -44,23 +100,55 @@ class Dumper(StorageMixin, DumpdataSerializerAbstract):
             dump.
         indent (integer): Indentation level in data dumps. If not given, dumps won't
             be indented.
+        compression (string): Compression codec for archives, optionally followed by
+            a level like ``gzip:6``. If not given, the value from setting
+            ``DISKETTE_DUMP_COMPRESSION`` is used. See
+            ``diskette.utils.archives.parse_compression`` for allowed values.
+        compression_threads (integer): Number of threads to compress ``gzip``
+            archives. If not given, the value from setting
+            ``DISKETTE_DUMP_COMPRESSION_THREADS`` is used.
+        store_incompressible (boolean): If enabled, storage files which are not
+            compressible are stored without compression in ``gzip`` archives. If not
+            given, the value from setting ``DISKETTE_DUMP_STORE_INCOMPRESSIBLE`` is
+            used.
+        layout (string): Archive layout, either ``single``, ``sections`` or
+            ``indexed``. If not given, the value from setting ``DISKETTE_DUMP_LAYOUT``
+            is used. See ``Dumper.get_sections`` about sections and
+            ``diskette.utils.archives.ArchiveIndex`` about index.
         logger (object): Instance of a logger object to use. Logger object must
             implement common logging message methods (like error, info, etc..). See
             ``diskette.utils.loggers`` for available loggers. If not given, a dummy
             logger will be used that ignores any messages and won't output anything.
+
+    Attributes:
+        checksum (string): The blake2b checksum of the last written archive. It is
+            computed while the archive is written so the archive file does not have
+            to be read again. This is ``None`` until an archive has been written.
     """
     MANIFEST_FILENAME = "manifest.json"
     TEMPDIR_PREFIX = "diskette_"
 
     def __init__(self, apps, executable=None, storages_basepath=None, storages=None,
-                 storages_excludes=None, logger=None, indent=None):
+                 storages_excludes=None, logger=None, indent=None,
+                 compression=None, compression_threads=None,
+                 store_incompressible=None, layout=None):
         self.storages_basepath = storages_basepath or Path.cwd()
         self.executable = executable + " " if executable else ""
         self.logger = logger or NoOperationLogger()
         self.storages = storages or []
         self.storages_excludes = storages_excludes or []
         self.indent = indent
+        self.compression = compression or settings.DISKETTE_DUMP_COMPRESSION
+        self.compression_threads = (
+            compression_threads or settings.DISKETTE_DUMP_COMPRESSION_THREADS
+        )
+        self.store_incompressible = (
+            settings.DISKETTE_DUMP_STORE_INCOMPRESSIBLE
+            if store_incompressible is None else store_incompressible
+        )
+        self.layout = layout or settings.DISKETTE_DUMP_LAYOUT
         self.now = datetime.datetime.now()
+        self.checksum = None
 
         self.apps = self.load(apps)
 
@@ -201,7 +289,50 @@ class Dumper(StorageMixin, DumpdataSerializerAbstract):
             for app in self.apps
         ]
 
-    def dump_data(self, destination=None, indent=None, check=False):
+    def get_dump_tasks(self):
+        """
+        Build the list of dumps to perform.
+
+        An application is dumped with a single task except if it is partitioned, then
+        its model table is split into primary key ranges with a task for each range.
+
+        Returns:
+            list: List of tuples, each tuple contains the application object then the
+            shard to dump. A shard is ``None`` for an application which is not
+            partitioned, else this is a tuple of shard position (starting from ``1``),
+            the first primary key of range (included) and the last one (excluded),
+            where ``None`` means the range is unbounded on this side.
+        """
+        tasks = []
+
+        for app in self.apps:
+            if not app.partitions:
+                tasks.append((app, None))
+                continue
+
+            # Use base manager to compute ranges from every rows of table
+            model = get_appstore().get_model(app.models[0]).object
+            boundaries = get_pk_boundaries(
+                model._base_manager.all(),
+                app.partitions
+            )
+
+            # An empty table has no boundary, the first shard takes the whole table
+            # and the other ones have the same range which will be empty unless some
+            # objects are created meanwhile
+            if not boundaries:
+                boundaries = [None] * (app.partitions - 1)
+
+            starts = [None] + boundaries
+            ends = boundaries + [None]
+            tasks.extend([
+                (app, (i, start, end))
+                for i, (start, end) in enumerate(zip(starts, ends), start=1)
+            ])
+
+        return tasks
+
+    def dump_data(self, destination=None, indent=None, check=False, jobs=None):
         """
         Call dumpdata command to dump each application data.
 
@@ -211,19 +342,115 @@ class Dumper(StorageMixin, DumpdataSerializerAbstract):
                 during this method.
             indent (integer): Indentation level for dump data.
             check (boolean): Perform operations writhout writing or querying anything.
+            jobs (integer): Number of worker processes to dump applications
+                concurrently. If empty or lower than 2, applications are dumped
+                sequentially. This is ignored with ``check`` mode.
 
         Returns:
-            list: List of tuples for processed applications, each tuple contains
-                firstly application name then the command output.
+            list: List of tuples for processed dumps, each tuple contains firstly
+                application name then the command output. A partitioned application
+                has an item for each of its shards except in ``check`` mode since it
+                does not query anything to compute shards.
         """
+        if check:
+            return [
+                (
+                    app.name,
+                    self.call(app, destination=destination, indent=indent, check=True)
+                )
+                for app in self.apps
+            ]
+
+        tasks = self.get_dump_tasks()
+
+        if jobs and jobs > 1 and len(tasks) > 1:
+            return self.dump_data_parallel(
+                jobs,
+                destination=destination,
+                indent=indent,
+                tasks=tasks,
+            )
+
         return [
             (
                 app.name,
-                self.call(app, destination=destination, indent=indent, check=check)
+                self.call(app, destination=destination, indent=indent, shard=shard)
             )
-            for app in self.apps
+            for app, shard in tasks
         ]
 
+    def dump_data_parallel(self, jobs, destination=None, indent=None, tasks=None):
+        """
+        Dump each application data from a pool of worker processes.
+
+        Each worker opens its own database connection. Messages from workers are
+        output in the same order than applications once all dumps are done.
+
+        Arguments:
+            jobs (integer): Maximum number of worker processes.
+
+        Keyword Arguments:
+            destination (string or Path): Destination file where to write dump if
+                given.
+            indent (integer): Indentation level for dump data.
+            tasks (list): List of dumps to perform as returned by
+                ``Dumper.get_dump_tasks``. If not given, it is built from this method.
+
+        Raises:
+            DumperError: When a dump has failed in a worker.
+
+        Returns:
+            list: List of tuples for processed applications, each tuple contains
+                firstly application name then the command output.
+        """
+        tasks = self.get_dump_tasks() if tasks is None else tasks
+        jobs = min(jobs, len(tasks))
+        self.logger.info(
+            "Dumping data with {} worker processes".format(jobs)
+        )
+
+        results = []
+        executor = get_process_pool(
+            jobs,
+            initializer=_dump_worker_initializer,
+            initargs=(self,),
+        )
+        try:
+            futures = [
+                executor.submit(
+                    _dump_worker,
+                    self.apps.index(app),
+                    shard=shard,
+                    destination=destination,
+                    indent=indent
+                )
+                for app, shard in tasks
+            ]
+
+            # Collect results in the application order
+            for (app, shard), future in zip(tasks, futures):
+                try:
+                    content, records = future.result()
+                except Exception as e:
+                    raise DumperError(
+                        "Data dump for application '{name}' has failed: {error}".format(
+                            name=app.name,
+                            error=e,
+                        )
+                    ) from e
+
+                for level, msg in records:
+                    getattr(self.logger, level)(msg)
+
+                if destination:
+                    app._written = Path(json.loads(content)["destination"])
+
+                results.append((app.name, content))
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+        return results
+
     def validate_applications(self):
         """
         Call validators from all enabled application model objects.
@@ -250,11 +477,13 @@ class Dumper(StorageMixin, DumpdataSerializerAbstract):
         Format archive filename depending features.
 
         Keyword Arguments:
-            filename (string): Filename to use instead. It must end with ``.tar.gz``.
-                Filename format may be like ``diskette{features}_{date}.tar.gz`` where
-                ``features`` pattern can include either ``_data``, ``_storages`` or both
-                depending enabled dump kinds, and ``date`` pattern would be a datetime
-                string like ``2025-02-03T175309``.
+            filename (string): Filename to use instead. Filename format may be like
+                ``diskette{features}_{date}.tar.gz`` where ``features`` pattern can
+                include either ``_data``, ``_storages`` or both depending enabled dump
+                kinds, and ``date`` pattern would be a datetime string like
+                ``2025-02-03T175309``. Archive extension is replaced with the one
+                from compression codec (like ``.tar.xz``) or with ``.tar`` for the
+                ``sections`` layout since its sections are compressed instead.
             with_data (boolean): Enable dump of application datas.
             with_storages (boolean): Enable dump of media storages.
 
@@ -267,30 +496,104 @@ class Dumper(StorageMixin, DumpdataSerializerAbstract):
         if with_storages is True:
             filename_features += "_storages"
 
-        return filename.format(
-            features=filename_features,
-            date=self.now.isoformat(timespec="seconds").replace(":", ""),
+        codec, level = parse_compression(self.compression)
+        if self.layout == "sections":
+            codec = "none"
+
+        return replace_archive_extension(
+            filename.format(
+                features=filename_features,
+                date=self.now.isoformat(timespec="seconds").replace(":", ""),
+            ),
+            codec
         )
 
-    def build_dump_manifest(self, destination, data_path, with_data=True,
-                            with_storages=True):
+    def get_sections(self, with_data=True, with_storages=True):
+        """
+        Get sections of an archive with the ``sections`` layout.
+
+        Data and each storage are written in their own archive compressed with the
+        dump codec, they are the sections. Sections are appended in an uncompressed
+        archive so a section can be extracted without reading the other ones.
+
+        Example of returned data: ::
+
+            {
+                "data": "sections/data.tar.gz",
+                "storages": {
+                    "var/media": "sections/storage-1.tar.gz"
+                }
+            }
+
+        Keyword Arguments:
+            with_data (boolean): Enable dump of application datas.
+            with_storages (boolean): Enable dump of media storages.
+
+        Returns:
+            dict: Archive member names of data section and storage sections, an item
+            is ``None`` when its dump is disabled. This is ``None`` if layout is not
+            ``sections``.
+        """
+        if self.layout != "sections":
+            return None
+
+        codec, level = parse_compression(self.compression)
+        sections = {
+            "data": None,
+            "storages": None,
+        }
+
+        if with_data is True:
+            sections["data"] = "sections/" + replace_archive_extension("data", codec)
+
+        if with_storages is True:
+            sections["storages"] = {
+                str(storage.relative_to(self.storages_basepath)): (
+                    "sections/" + replace_archive_extension(
+                        "storage-{}".format(i),
+                        codec
+                    )
+                )
+                for i, storage in enumerate(self.storages, start=1)
+            }
+
+        return sections
+
+    def get_manifest_payload(self, data_dirname="data", with_data=True,
+                             with_storages=True, stored_files=None,
+                             sections=None):
         """
-        Build dump JSON manifest.
+        Build dump manifest data.
 
-        Example of built file (real build is not indented): ::
+        Example of built data: ::
 
             {
                 "version": "0.0.0",
                 "creation": "2024-01-01T12:12:12",
+                "compression": "gzip",
                 "datas": [
                     "data/djangocontribsites.json",
                     "data/djangocontribauth.json"
                 ],
                 "storages": [
                     "var/media"
-                ]
+                ],
+                "stored_files": [
+                    "var/media/cover.jpg"
+                ],
+                "sections": {
+                    "data": "sections/data.tar.gz",
+                    "storages": {
+                        "var/media": "sections/storage-1.tar.gz"
+                    }
+                }
             }
 
+        Item ``stored_files`` lists storage files that have been stored without
+        compression, it is ``null`` when this mode is disabled. Item ``sections``
+        gives the archive members of each section with the ``sections`` layout, it is
+        ``null`` with the ``single`` layout.
+
         .. Note::
             Involves relative path resolving so it implies that storage paths are
             proper children of given destination path (that is removed from lead of
@@ -305,31 +608,37 @@ class Dumper(StorageMixin, DumpdataSerializerAbstract):
 
         .. Note::
             Manifest preserve order of registered applications when writing data dump
-            list so it safe for loading them.
-
-        Arguments:
-            destination (Path): Destination file where to write manifest.
+            list so it safe for loading them. Shards of a partitioned application
+            are listed in their primary key order.
 
         Keyword Arguments:
+            data_dirname (string or Path): Relative directory path where data dumps
+                are stored in archive.
             with_data (boolean): Enable dump of application datas.
             with_storages (boolean): Enable dump of media storages.
+            stored_files (list): Archive names of storage files stored without
+                compression.
+            sections (dict): Sections from ``Dumper.get_sections``.
 
         Returns:
-            Path: Path to the written manifest file.
+            dict: The manifest data.
         """
-        manifest_path = destination / self.MANIFEST_FILENAME
         data = {
             "version": self.get_diskette_version(),
             "creation": self.now.isoformat(timespec="seconds"),
+            "compression": parse_compression(self.compression)[0],
             "datas": None,
             "storages": None,
+            "stored_files": None,
+            "sections": sections,
         }
 
         # Build a list of expected data dump filenames from registered applications
         if with_data is True:
             data["datas"] = [
-                str((data_path / app.filename).relative_to(destination))
+                str(Path(data_dirname) / filename)
                 for app in self.apps
+                for filename in app.filenames
             ]
 
         # Build a list of expected storage dump directories from registered storages
@@ -339,6 +648,45 @@ class Dumper(StorageMixin, DumpdataSerializerAbstract):
                 for storage in self.storages
             ]
 
+        if stored_files is not None:
+            data["stored_files"] = [str(item) for item in stored_files]
+
+        return data
+
+    def build_dump_manifest(self, destination, data_path, with_data=True,
+                            with_storages=True, stored_files=None,
+                            sections=None):
+        """
+        Build dump JSON manifest file.
+
+        See ``Dumper.get_manifest_payload`` for details about manifest content, real
+        written file is not indented.
+
+        Arguments:
+            destination (Path): Destination file where to write manifest.
+            data_path (Path): Directory where data dumps are written. It must be a
+                child of ``destination``.
+
+        Keyword Arguments:
+            with_data (boolean): Enable dump of application datas.
+            with_storages (boolean): Enable dump of media storages.
+            stored_files (list): Archive names of storage files stored without
+                compression.
+            sections (dict): Sections from ``Dumper.get_sections``.
+
+        Returns:
+            Path: Path to the written manifest file.
+        """
+        manifest_path = destination / self.MANIFEST_FILENAME
+
+        data = self.get_manifest_payload(
+            data_dirname=data_path.relative_to(destination),
+            with_data=with_data,
+            with_storages=with_storages,
+            stored_files=stored_files,
+            sections=sections,
+        )
+
         # Write built manifest into destination path
         manifest_path.write_text(json.dumps(data))
 
@@ -351,11 +699,244 @@ class Dumper(StorageMixin, DumpdataSerializerAbstract):
         self.validate_applications()
         self.validate_storages()
 
+    def get_storages_layout(self, with_storages_excludes=True, storages=None):
+        """
+        Split storages files between the compressible ones and the others that are
+        to be stored without compression.
+
+        See ``diskette.utils.archives.is_compressible`` about file classification.
+
+        Keyword Arguments:
+            with_storages_excludes (boolean): Enable usage of excluding patterns when
+                collecting storages files.
+            storages (list): Storage paths to split instead of all storages.
+
+        Returns:
+            tuple: Respectively the list of compressible files and the list of files
+            to store, each item is a tuple of file path and archive name. This is
+            ``None`` if option ``store_incompressible`` is disabled or if archive
+            codec is not ``gzip``.
+        """
+        if (
+            not self.store_incompressible or
+            parse_compression(self.compression)[0] != "gzip"
+        ):
+            return None
+
+        compressed, stored = [], []
+        for path, arcname in self.iter_storages_files(
+            allow_excludes=with_storages_excludes,
+            storages=storages,
+        ):
+            if is_compressible(path):
+                compressed.append((path, arcname))
+            else:
+                stored.append((path, arcname))
+
+        return compressed, stored
+
+    def archive_storages(self, tar, with_storages_excludes=True, layout=None,
+                         storages=None):
+        """
+        Append collected storages files to an archive.
+
+        Arguments:
+            tar (tarfile.TarFile): The archive object opened in a writing mode.
+
+        Keyword Arguments:
+            with_storages_excludes (boolean): Enable usage of excluding patterns when
+                collecting storages files.
+            layout (tuple): Storages layout from ``Dumper.get_storages_layout``.
+                Compressible files are appended first then the other ones are
+                stored without compression. If not given, every file is compressed.
+            storages (list): Storage paths to append instead of all storages.
+        """
+        self.logger.info("Appending storages to the archive")
+
+        if layout is None:
+            layout = (
+                self.iter_storages_files(
+                    allow_excludes=with_storages_excludes,
+                    storages=storages,
+                ),
+                [],
+            )
+        compressed, stored = layout
+
+        for path, arcname in compressed:
+            self.logger.debug("- {name} ({size})".format(
+                name=arcname,
+                size=filesizeformat(path.stat().st_size),
+            ))
+            tar.add(path, arcname=arcname)
+
+        if stored:
+            writer = get_gzip_writer(tar)
+            with writer.uncompressed() if writer else nullcontext():
+                for path, arcname in stored:
+                    self.logger.debug("- {name} ({size}, stored)".format(
+                        name=arcname,
+                        size=filesizeformat(path.stat().st_size),
+                    ))
+                    tar.add(path, arcname=arcname)
+
+    @contextmanager
+    def build_section(self, tar, workdir, arcname, store_incompressible=False):
+        """
+        Context manager to build a section archive and append it to an archive.
+
+        Arguments:
+            tar (tarfile.TarFile): The archive object opened in a writing mode.
+            workdir (Path): Directory where to build the section archive, it is
+                removed once appended.
+            arcname (string): Section member name in archive.
+
+        Keyword Arguments:
+            store_incompressible (boolean): Section archive is opened to be able to
+                store files without compression.
+
+        Returns:
+            tarfile.TarFile: The section archive object opened in a writing mode.
+        """
+        section_path = workdir / Path(arcname).name
+
+        try:
+            with open_archive_writer(
+                section_path,
+                self.compression,
+                threads=self.compression_threads,
+                store_incompressible=store_incompressible,
+            ) as section:
+                yield section
+
+            tar.add(section_path, arcname=arcname)
+        finally:
+            if section_path.exists():
+                section_path.unlink()
+
+    def archive_sections(self, tar, workdir, sections, data_path=None,
+                         with_storages_excludes=True, layout=None):
+        """
+        Append data section and storage sections to an archive.
+
+        Arguments:
+            tar (tarfile.TarFile): The archive object opened in a writing mode, it
+                should not be compressed since sections already are.
+            workdir (Path): Directory where to build section archives.
+            sections (dict): Sections from ``Dumper.get_sections``.
+
+        Keyword Arguments:
+            data_path (Path): Directory of data dumps to append. If not given,
+                application data are dumped straight into the data section.
+            with_storages_excludes (boolean): Enable usage of excluding patterns when
+                collecting storages files.
+            layout (tuple): Storages layout from ``Dumper.get_storages_layout``.
+        """
+        if sections["data"]:
+            with self.build_section(tar, workdir, sections["data"]) as section:
+                if data_path:
+                    self.logger.info("Appending data to the archive")
+                    section.add(data_path, arcname="data")
+                else:
+                    self.logger.info("Streaming data to the archive")
+                    self.stream_data(section, spool_dir=workdir, indent=self.indent)
+
+        for storage in self.storages if sections["storages"] else []:
+            storage_layout = None
+            if layout is not None:
+                storage_layout = tuple(
+                    [item for item in items if storage in item[0].parents]
+                    for items in layout
+                )
+
+            with self.build_section(
+                tar,
+                workdir,
+                sections["storages"][str(storage.relative_to(self.storages_basepath))],
+                store_incompressible=layout is not None,
+            ) as section:
+                self.archive_storages(
+                    section,
+                    with_storages_excludes=with_storages_excludes,
+                    layout=storage_layout,
+                    storages=[storage],
+                )
+
+    def archive_buffer(self, tar, arcname, fileobj, size):
+        """
+        Append the content of a binary file object to an archive as a regular file.
+
+        Arguments:
+            tar (tarfile.TarFile): The archive object opened in a writing mode.
+            arcname (string): The member name in archive.
+            fileobj (object): A binary file object which is read from its beginning.
+            size (integer): Size in bytes of content to read from the file object.
+        """
+        tarinfo = tarfile.TarInfo(name=arcname)
+        tarinfo.size = size
+        tarinfo.mtime = int(self.now.timestamp())
+        tarinfo.mode = 0o644
+
+        fileobj.seek(0)
+        tar.addfile(tarinfo, fileobj)
+
+    def stream_data(self, tar, spool_dir=None, indent=None):
+        """
+        Dump each application data straight into an archive member.
+
+        Each dump is written in a spooled buffer which stays in memory until its size
+        reaches the setting ``DISKETTE_DUMP_SPOOL_SIZE``, then it is spilled into a
+        temporary file. The buffer is appended to the archive as soon as the dump is
+        done then it is released.
+
+        Arguments:
+            tar (tarfile.TarFile): The archive object opened in a writing mode.
+
+        Keyword Arguments:
+            spool_dir (Path): Directory where to create temporary file for buffers
+                that have been spilled. On default this is the system temporary
+                directory.
+            indent (integer): Indentation level for dump data.
+
+        Returns:
+            list: List of tuples for processed applications, each tuple contains
+                firstly application name then the command output.
+        """
+        results = []
+
+        for app, shard in self.get_dump_tasks():
+            with tempfile.SpooledTemporaryFile(
+                max_size=settings.DISKETTE_DUMP_SPOOL_SIZE,
+                prefix=self.TEMPDIR_PREFIX,
+                dir=spool_dir,
+            ) as spool:
+                output = self.call(
+                    app,
+                    indent=indent,
+                    stream=EncodedWriter(spool),
+                    shard=shard,
+                )
+                filename = json.loads(output)["stream"]
+                size = spool.tell()
+                self.logger.debug("- Streamed file: {name} ({size})".format(
+                    name=filename,
+                    size=filesizeformat(size),
+                ))
+                self.archive_buffer(tar, "data/" + filename, spool, size)
+
+            results.append((app.name, output))
+
+        return results
+
     def make_archive(self, destination, filename, with_data=True, with_storages=True,
-                     with_storages_excludes=True, destination_chmod=None):
+                     with_storages_excludes=True, destination_chmod=None, jobs=None,
+                     streaming=False):
         """
         Dump data and storages then archive everything in an archive.
 
+        Archive is checksumed while it is written, the checksum is available from
+        ``Dumper.checksum`` once the archive is complete.
+
         .. Note::
             Arguments 'with_data' and 'with_storages' can not be both disabled, at
             least one must be enabled else it is assumed as an error.
@@ -365,8 +946,9 @@ class Dumper(StorageMixin, DumpdataSerializerAbstract):
 
         Keyword Arguments:
             filename (string): Custom archive filename to use instead of the default
-                one. Your custom filename must end with ``.tar.gz``. Default filename
-                is ``diskette[_data][_storages].tar.gz`` (parts depend from options).
+                one. Its archive extension is replaced with the one from compression
+                codec. Default filename is ``diskette[_data][_storages].tar.gz``
+                (parts depend from options).
             with_data (boolean): Enable dump of application datas.
             with_storages (boolean): Enable dump of media storages.
             with_storages_excludes (boolean): Enable usage of excluding patterns when
@@ -374,10 +956,25 @@ class Dumper(StorageMixin, DumpdataSerializerAbstract):
             destination_chmod (integer): File permission to apply on archive files and
                 also on destination directory if it did not exists. Value must be in
                 an octal notation, default is ``0o755``.
+            jobs (integer): Number of worker processes to dump applications data
+                concurrently. If empty, applications are dumped sequentially.
+            streaming (boolean): If enabled, the archive is built with
+                ``Dumper.make_streaming_archive`` instead.
 
         Returns:
             Path: Path to the written archive file.
         """
+        if streaming:
+            return self.make_streaming_archive(
+                destination,
+                filename,
+                with_data=with_data,
+                with_storages=with_storages,
+                with_storages_excludes=with_storages_excludes,
+                destination_chmod=destination_chmod,
+                jobs=jobs,
+            )
+
         destination_chmod = (
             destination_chmod or settings.DISKETTE_DUMP_PERMISSIONS or 0o755
         )
@@ -396,14 +993,28 @@ class Dumper(StorageMixin, DumpdataSerializerAbstract):
 
         # Dump data into temp directory
         if with_data is True:
-            self.dump_data(destination=data_tmpdir, indent=self.indent)
+            self.dump_data(destination=data_tmpdir, indent=self.indent, jobs=jobs)
+
+        # Split storages files between compressible ones and the ones to store
+        layout = None
+        if with_storages is True:
+            layout = self.get_storages_layout(
+                with_storages_excludes=with_storages_excludes
+            )
+
+        sections = self.get_sections(
+            with_data=with_data,
+            with_storages=with_storages
+        )
 
         # Compute history/stats file
         manifest_path = self.build_dump_manifest(
             destination_tmpdir,
             data_tmpdir,
             with_data=with_data,
-            with_storages=with_storages
+            with_storages=with_storages,
+            stored_files=[arcname for path, arcname in layout[1]] if layout else None,
+            sections=sections,
         )
 
         # Build dump archive paths
@@ -416,29 +1027,49 @@ class Dumper(StorageMixin, DumpdataSerializerAbstract):
         archive_destination = destination / archive_filename
 
         # Then add everything to the archive
+        self.checksum = None
         try:
-            with tarfile.open(archive_path, "w:gz") as tar:
-                # Add data dumps dir
-                if with_data is True:
-                    self.logger.info("Appending data to the archive")
-                    tar.add(data_tmpdir, arcname="data")
-                    # Clear space from data dumps
-                    shutil.rmtree(data_tmpdir)
-
-                # Append collected storages files
-                if with_storages is True:
-                    self.logger.info("Appending storages to the archive")
-                    for path, arcname in self.iter_storages_files(
-                        allow_excludes=with_storages_excludes
-                    ):
-                        self.logger.debug("- {name} ({size})".format(
-                            name=arcname,
-                            size=filesizeformat(path.stat().st_size),
-                        ))
-                        tar.add(path, arcname=arcname)
-
-                # Append dump manifest
-                tar.add(manifest_path, arcname=self.MANIFEST_FILENAME)
+            with archive_path.open("wb") as fp:
+                stream = hashs.ChecksumStream(fp)
+
+                if sections:
+                    with open_archive_writer(stream, "none") as tar:
+                        tar.add(manifest_path, arcname=self.MANIFEST_FILENAME)
+                        self.archive_sections(
+                            tar,
+                            destination_tmpdir,
+                            sections,
+                            data_path=data_tmpdir,
+                            with_storages_excludes=with_storages_excludes,
+                            layout=layout,
+                        )
+                else:
+                    with open_archive_writer(
+                        stream,
+                        self.compression,
+                        threads=self.compression_threads,
+                        store_incompressible=layout is not None,
+                        indexed=self.layout == "indexed",
+                        spool_dir=destination_tmpdir,
+                    ) as tar:
+                        # Add dump manifest first so a loader knows what archive
+                        # contains before reading its other members
+                        tar.add(manifest_path, arcname=self.MANIFEST_FILENAME)
+
+                        # Add data dumps dir
+                        if with_data is True:
+                            self.logger.info("Appending data to the archive")
+                            tar.add(data_tmpdir, arcname="data")
+                            # Clear space from data dumps
+                            shutil.rmtree(data_tmpdir)
+
+                        # Append collected storages files
+                        if with_storages is True:
+                            self.archive_storages(
+                                tar,
+                                with_storages_excludes=with_storages_excludes,
+                                layout=layout,
+                            )
 
             # Create destination directory with the right permission if needed
             if not destination.exists():
@@ -452,6 +1083,7 @@ class Dumper(StorageMixin, DumpdataSerializerAbstract):
             # with different devices
             shutil.move(archive_path, archive_destination)
             archive_destination.chmod(destination_chmod)
+            self.checksum = stream.hexdigest()
 
         finally:
             # Always remove temporary working directory
@@ -460,6 +1092,228 @@ class Dumper(StorageMixin, DumpdataSerializerAbstract):
 
         return archive_destination
 
+    def make_streaming_archive(self, destination, filename, with_data=True,
+                               with_storages=True, with_storages_excludes=True,
+                               destination_chmod=None, jobs=None):
+        """
+        Dump data and storages straight into an archive without any temporary data
+        directory.
+
+        The archive is directly written into the destination directory with a
+        ``.part`` suffix until it is complete, see ``Dumper.stream_archive``. Its
+        checksum is available from ``Dumper.checksum`` once it is complete.
+
+        .. Note::
+            Arguments 'with_data' and 'with_storages' can not be both disabled, at
+            least one must be enabled else it is assumed as an error.
+
+        Arguments:
+            destination (Path): Directory where to write archive file.
+            filename (string): Custom archive filename to use instead of the default
+                one. Its archive extension is replaced with the one from compression
+                codec.
+
+        Keyword Arguments:
+            with_data (boolean): Enable dump of application datas.
+            with_storages (boolean): Enable dump of media storages.
+            with_storages_excludes (boolean): Enable usage of excluding patterns when
+                collecting storages files.
+            destination_chmod (integer): File permission to apply on archive files and
+                also on destination directory if it did not exists. Value must be in
+                an octal notation, default is ``0o755``.
+            jobs (integer): Parallel dumps are not supported in streaming mode, any
+                value greater than 1 will raise an error.
+
+        Returns:
+            Path: Path to the written archive file.
+        """
+        destination_chmod = (
+            destination_chmod or settings.DISKETTE_DUMP_PERMISSIONS or 0o755
+        )
+
+        if not with_data and not with_storages:
+            raise DumperError(
+                "Arguments 'with_data' and 'with_storages' can not be both 'False'"
+            )
+
+        if jobs and jobs > 1:
+            raise DumperError(
+                "Parallel data dumps can not be used to build a streaming archive"
+            )
+
+        # Create destination directory with the right permission if needed
+        if not destination.exists():
+            destination.mkdir(
+                mode=destination_chmod,
+                parents=True,
+                exist_ok=True
+            )
+
+        archive_filename = self.format_archive_filename(
+            filename,
+            with_data=with_data,
+            with_storages=with_storages
+        )
+        archive_destination = destination / archive_filename
+        # Archive is written with a temporary name until it is complete
+        archive_partial = destination / (archive_filename + ".part")
+
+        try:
+            self.stream_archive(
+                archive_partial,
+                with_data=with_data,
+                with_storages=with_storages,
+                with_storages_excludes=with_storages_excludes,
+                spool_dir=destination,
+            )
+
+            archive_partial.replace(archive_destination)
+            archive_destination.chmod(destination_chmod)
+
+        finally:
+            # Remove uncomplete archive on failure
+            if archive_partial.exists():
+                archive_partial.unlink()
+
+        return archive_destination
+
+    def stream_archive(self, target, with_data=True, with_storages=True,
+                       with_storages_excludes=True, spool_dir=None):
+        """
+        Dump data and storages straight into an archive written on a file or a file
+        object.
+
+        Archive is written in a single pass without any temporary data directory or
+        archive, so the target may be a pipe or the standard output. The manifest is
+        the first archive member since it does not depend from dump results and each
+        application dump is streamed into its archive member through a spooled buffer
+        (see ``Dumper.stream_data``).
+
+        Archive is checksumed while it is written, the checksum is available from
+        ``Dumper.checksum`` once the archive is complete.
+
+        .. Note::
+            With the ``indexed`` layout, nothing is written to the target until all
+            archive members have been compressed into a temporary file from the spool
+            directory, since the index is written at the front of archive.
+
+        Arguments:
+            target (Path or object): Archive file path or a binary file object where
+                to write archive.
+
+        Keyword Arguments:
+            with_data (boolean): Enable dump of application datas.
+            with_storages (boolean): Enable dump of media storages.
+            with_storages_excludes (boolean): Enable usage of excluding patterns when
+                collecting storages files.
+            spool_dir (Path): Directory where spooled buffers, sections and indexed
+                archive members are written when they are too big to be kept in
+                memory. If not given, the system temporary directory is used.
+
+        Returns:
+            string: The archive checksum.
+        """
+        if not with_data and not with_storages:
+            raise DumperError(
+                "Arguments 'with_data' and 'with_storages' can not be both 'False'"
+            )
+
+        # Split storages files between compressible ones and the ones to store
+        layout = None
+        if with_storages is True:
+            layout = self.get_storages_layout(
+                with_storages_excludes=with_storages_excludes
+            )
+
+        sections = self.get_sections(
+            with_data=with_data,
+            with_storages=with_storages
+        )
+
+        manifest = json.dumps(
+            self.get_manifest_payload(
+                with_data=with_data,
+                with_storages=with_storages,
+                stored_files=(
+                    [arcname for path, arcname in layout[1]] if layout else None
+                ),
+                sections=sections,
+            )
+        ).encode("utf-8")
+
+        self.checksum = None
+        sections_tmpdir = None
+        try:
+            with (
+                nullcontext(target) if hasattr(target, "write") else target.open("wb")
+            ) as fp:
+                stream = hashs.ChecksumStream(fp)
+
+                if sections:
+                    # Sections are built in the spool directory before being appended
+                    sections_tmpdir = Path(tempfile.mkdtemp(
+                        prefix=self.TEMPDIR_PREFIX,
+                        dir=spool_dir,
+                    ))
+
+                    with open_archive_writer(stream, "none") as tar:
+                        self.archive_buffer(
+                            tar,
+                            self.MANIFEST_FILENAME,
+                            io.BytesIO(manifest),
+                            len(manifest)
+                        )
+                        self.archive_sections(
+                            tar,
+                            sections_tmpdir,
+                            sections,
+                            with_storages_excludes=with_storages_excludes,
+                            layout=layout,
+                        )
+                else:
+                    with open_archive_writer(
+                        stream,
+                        self.compression,
+                        threads=self.compression_threads,
+                        store_incompressible=layout is not None,
+                        indexed=self.layout == "indexed",
+                        spool_dir=spool_dir,
+                    ) as tar:
+                        # Append dump manifest
+                        self.archive_buffer(
+                            tar,
+                            self.MANIFEST_FILENAME,
+                            io.BytesIO(manifest),
+                            len(manifest)
+                        )
+
+                        # Stream data dumps
+                        if with_data is True:
+                            self.logger.info("Streaming data to the archive")
+                            self.stream_data(
+                                tar,
+                                spool_dir=spool_dir,
+                                indent=self.indent
+                            )
+
+                        # Append collected storages files
+                        if with_storages is True:
+                            self.archive_storages(
+                                tar,
+                                with_storages_excludes=with_storages_excludes,
+                                layout=layout,
+                            )
+
+                fp.flush()
+
+        finally:
+            if sections_tmpdir and sections_tmpdir.exists():
+                shutil.rmtree(sections_tmpdir)
+
+        self.checksum = stream.hexdigest()
+
+        return self.checksum
+
     def make_script(self, destination, with_data=True, with_storages=True,
                     with_storages_excludes=True):
         """
@@ -507,8 +1361,9 @@ class Dumper(StorageMixin, DumpdataSerializerAbstract):
 
         Keyword Arguments:
             filename (string): Custom archive filename to use instead of the default
-                one. Your custom filename must end with ``.tar.gz``. Default filename
-                is ``diskette[_data][_storages].tar.gz`` (parts depend from options).
+                one. Its archive extension is replaced with the one from compression
+                codec. Default filename is ``diskette[_data][_storages].tar.gz``
+                (parts depend from options).
             with_data (boolean): Enable dump of application datas.
             with_storages (boolean): Enable dump of media storages.
             with_storages_excludes (boolean): Enable usage of excluding patterns when
@@ -1,10 +1,13 @@
 import json
+import sys
+from contextlib import nullcontext
 from pathlib import Path
 
 from django.conf import settings
 from django.template.defaultfilters import filesizeformat
 
-from ...utils import hashs
+from ...utils.archives import parse_compression
+from ..defaults import AVAILABLE_LAYOUTS
 from ..dumper import Dumper
 from .base import BaseHandler
 
@@ -16,7 +19,13 @@ class DumpCommandHandler(BaseHandler):
 
     This relies on ``logger`` attribute that is not provided here. The logger object
     should be one of compatible classes from ``diskette.utils.loggers``.
+
+    Attributes:
+        checksum (string): The checksum of the last archive created from
+            ``DumpCommandHandler.dump``.
     """
+    checksum = None
+
     def get_archive_destination(self, path=None):
         """
         Either get the archive destination path from given argument if given else from
@@ -61,6 +70,59 @@ class DumpCommandHandler(BaseHandler):
 
         return filename
 
+    def get_compression(self, compression=None):
+        """
+        Either get the archive compression from given argument if given else from
+        ``settings.DISKETTE_DUMP_COMPRESSION``.
+
+        A critical error object is raised from logger if compression codec is unknown,
+        unavailable or if its level is invalid.
+
+        Keyword Arguments:
+            compression (string): Compression codec, optionally followed by a level
+                like ``gzip:6``.
+
+        Returns:
+            string: Discovered compression.
+        """
+        compression = compression or settings.DISKETTE_DUMP_COMPRESSION
+
+        try:
+            parse_compression(compression)
+        except ValueError as e:
+            self.logger.critical(str(e))
+
+        self.logger.debug(
+            "- Tarball compression: {}".format(compression)
+        )
+
+        return compression
+
+    def get_layout(self, layout=None):
+        """
+        Either get the archive layout from given argument if given else from
+        ``settings.DISKETTE_DUMP_LAYOUT``.
+
+        A critical error object is raised from logger if layout is unknown.
+
+        Keyword Arguments:
+            layout (string): Layout name.
+
+        Returns:
+            string: Discovered layout.
+        """
+        layout = layout or settings.DISKETTE_DUMP_LAYOUT
+
+        if layout not in AVAILABLE_LAYOUTS:
+            self.logger.critical(
+                "Given layout '{}' is not allowed, it must be one of: {}".format(
+                    layout,
+                    ", ".join(AVAILABLE_LAYOUTS),
+                )
+            )
+
+        return layout
+
     def get_application_configurations(self, appconfs=None, no_data=False):
         """
         Either get the application configurations from ``appconfs`` value if not empty,
@@ -261,10 +323,53 @@ class DumpCommandHandler(BaseHandler):
 
         return commandlines
 
+    def stream(self, dumper, output, with_data=True, with_storages=True,
+               with_storages_excludes=True, no_checksum=False):
+        """
+        Stream an archive to an output as it is produced.
+
+        Archive is checksumed while it is written so it is not read again.
+
+        Arguments:
+            dumper (Dumper): The dumper object to make archive.
+            output (string or Path): File path where to write archive or ``-`` for
+                the standard output.
+
+        Keyword Arguments:
+            with_data (boolean): Enable dump of application datas.
+            with_storages (boolean): Enable dump of media storages.
+            with_storages_excludes (boolean): Enable usage of excluding patterns when
+                collecting storages files.
+            no_checksum (boolean): Disable archive checksum.
+        """
+        to_stdout = str(output) == "-"
+
+        with (
+            nullcontext(sys.stdout.buffer) if to_stdout else Path(output).open("wb")
+        ) as fp:
+            dumper.stream_archive(
+                fp,
+                with_data=with_data,
+                with_storages=with_storages,
+                with_storages_excludes=with_storages_excludes,
+            )
+
+        self.logger.info(
+            "Dump archive was streamed to: {}".format(
+                "standard output" if to_stdout else output
+            )
+        )
+
+        if not no_checksum:
+            self.logger.info("Checksum: {}".format(dumper.checksum))
+
     def dump(self, archive_destination=None, archive_filename=None,
              application_configurations=None, storages=None, storages_basepath=None,
              storages_excludes=None, no_data=False, no_checksum=False,
-             no_storages=False, no_storages_excludes=False, indent=None, check=False):
+             no_storages=False, no_storages_excludes=False, indent=None, check=False,
+             jobs=None, streaming=False, compression=None,
+             compression_threads=None, store_incompressible=None, layout=None,
+             output=None):
         """
         Run configuration validation and proceed to archiving operations for datas and
         storages.
@@ -274,9 +379,9 @@ class DumpCommandHandler(BaseHandler):
                 given the value from setting ``DISKETTE_DUMP_PATH`` will be used
                 instead.
             archive_filename (string): Custom archive filename to use instead of the
-                default one. Your custom filename must end with ``.tar.gz``. Default
-                filename is ``diskette[_data][_storages].tar.gz`` (parts depend from
-                options).
+                default one. Its archive extension is replaced with the one from
+                compression codec. Default filename is
+                ``diskette[_data][_storages].tar.gz`` (parts depend from options).
             application_configurations (string or list or Path): Either:
 
                 * A list which includes application configurations;
@@ -302,11 +407,38 @@ class DumpCommandHandler(BaseHandler):
             check (boolean): Only run validations and some additional configurations
                 checking instead of performing real dump operations and archiving.
                 Nothing should be queried or created in this mode.
+            jobs (integer): Number of worker processes to dump applications data
+                concurrently. If empty, applications are dumped sequentially.
+            streaming (boolean): Stream application data dumps straight into the
+                archive instead of writing them into a temporary directory first.
+            compression (string): Compression codec for the archive, optionally
+                followed by a level like ``gzip:6``. If not given the value from
+                setting ``DISKETTE_DUMP_COMPRESSION`` will be used instead.
+            compression_threads (integer): Number of threads to compress ``gzip``
+                archive. If not given the value from setting
+                ``DISKETTE_DUMP_COMPRESSION_THREADS`` will be used instead.
+            store_incompressible (boolean): Store storage files that are not
+                compressible without compression. If not given the value from setting
+                ``DISKETTE_DUMP_STORE_INCOMPRESSIBLE`` will be used instead.
+            layout (string): Archive layout, either ``single``, ``sections`` or
+                ``indexed``. If not given the value from setting
+                ``DISKETTE_DUMP_LAYOUT`` will be used instead.
+            output (string or Path): If given, the archive is streamed to this file
+                path as it is produced (see ``Dumper.stream_archive``) instead of
+                being written in archive destination. Value ``-`` streams the
+                archive to the standard output. Options ``archive_destination``,
+                ``archive_filename`` and ``jobs`` are ignored and the ``indexed``
+                layout is not allowed.
 
         Returns:
             Path: Path to the written archive file. With 'check' mode enable the
-            returned path won't exists since nothing is created.
+            returned path won't exists since nothing is created. With an output this
+            returns ``None``. The archive checksum is computed while the archive is
+            written and is available from attribute ``checksum`` (``None`` in
+            'check' mode).
         """
+        self.checksum = None
+
         if not check:
             self.logger.info("=== Starting dump ===")
         else:
@@ -316,6 +448,17 @@ class DumpCommandHandler(BaseHandler):
 
         archive_destination = self.get_archive_destination(archive_destination)
         archive_filename = self.get_archive_filename(archive_filename)
+        compression = self.get_compression(compression)
+
+        if compression_threads is not None and compression_threads < 1:
+            self.logger.critical("Compression threads must be a positive integer.")
+
+        layout = self.get_layout(layout)
+        if layout == "indexed" and parse_compression(compression)[0] != "gzip":
+            self.logger.critical("Layout 'indexed' requires the 'gzip' compression.")
+
+        if output and layout == "indexed":
+            self.logger.critical("Layout 'indexed' can not be streamed to an output.")
 
         with_data, application_configurations = self.get_application_configurations(
             appconfs=application_configurations,
@@ -345,19 +488,37 @@ class DumpCommandHandler(BaseHandler):
             storages=storages,
             storages_excludes=storages_excludes,
             indent=indent,
+            compression=compression,
+            compression_threads=compression_threads,
+            store_incompressible=store_incompressible,
+            layout=layout,
         )
 
         # Validate configuration
         dumper.validate()
 
-        if not check:
+        if output and not check:
+            archive_path = None
+            self.stream(
+                dumper,
+                output,
+                with_data=with_data,
+                with_storages=with_storages,
+                with_storages_excludes=with_storages_excludes,
+                no_checksum=no_checksum,
+            )
+            self.checksum = dumper.checksum
+        elif not check:
             archive_path = dumper.make_archive(
                 archive_destination,
                 archive_filename,
                 with_data=with_data,
                 with_storages=with_storages,
                 with_storages_excludes=with_storages_excludes,
+                jobs=jobs,
+                streaming=streaming,
             )
+            self.checksum = dumper.checksum
 
             self.logger.info(
                 "Dump archive was created at: {path} ({size})".format(
@@ -367,9 +528,7 @@ class DumpCommandHandler(BaseHandler):
             )
 
             if not no_checksum:
-                self.logger.info(
-                    "Checksum: {}".format(hashs.file_checksum(archive_path))
-                )
+                self.logger.info("Checksum: {}".format(dumper.checksum))
         else:
             archive_path = dumper.check(
                 archive_destination,
@@ -1,7 +1,9 @@
+import sys
 from pathlib import Path
 
 from django.conf import settings
 
+from ..defaults import AVAILABLE_LOAD_ENGINES
 from ..loader import Loader
 from ...utils.http import is_url
 from .base import BaseHandler
@@ -24,9 +26,14 @@ class LoadCommandHandler(BaseHandler):
             path (string or Path): The path to convert if elligible.
 
         Returns:
-            string or Path: If given path is not an URL this returns a Path object else
-                it returns given path unchanged as a string.
+            string or Path or object: If given path is not an URL this returns a Path
+            object else it returns given path unchanged as a string. Path ``-`` is
+            turned to the standard input binary file object.
         """
+        if path == "-":
+            self.logger.debug("- Archive is read from standard input")
+            return sys.stdin.buffer
+
         return path if is_url(path) else Path(path)
 
     def get_checksum(self, checksum):
@@ -84,9 +91,40 @@ class LoadCommandHandler(BaseHandler):
 
         return path
 
+    def get_load_engine(self, engine=None, batch_size=None):
+        """
+        Validate load engine options.
+
+        A critical error object is raised from logger if engine is unknown or if
+        batch size is not a positive integer.
+
+        Keyword Arguments:
+            engine (string): Load engine name. Default to ``loaddata``.
+            batch_size (integer): Number of objects to insert at once with the
+                ``bulk`` engine.
+
+        Returns:
+            string: Load engine name.
+        """
+        engine = engine or "loaddata"
+
+        if engine not in AVAILABLE_LOAD_ENGINES:
+            self.logger.critical(
+                "Given load engine '{}' is not allowed, it must be one of: {}".format(
+                    engine,
+                    ", ".join(AVAILABLE_LOAD_ENGINES),
+                )
+            )
+
+        if batch_size is not None and batch_size < 1:
+            self.logger.critical("Batch size must be a positive integer.")
+
+        return engine
+
     def load(self, archive_path, storages_basepath=None, data_exclusions=None,
              no_data=False, no_storages=False, download_destination=None, keep=False,
-             checksum=None, ignorenonexistent_data=False):
+             checksum=None, ignorenonexistent_data=False, engine=None,
+             batch_size=None, jobs=None, pipeline=False, if_changed=False):
         """
         Proceed to load and deploy archive contents.
 
@@ -120,6 +158,20 @@ class LoadCommandHandler(BaseHandler):
             ignorenonexistent_data (boolean): If true, fields and models that does not
                 exists in current models will be ignored instead of raising an error.
                 This is false on default
+            engine (string): Load engine name for datas, either ``loaddata`` to save
+                objects one by one with Django ``loaddata`` or ``bulk`` to insert them
+                in batches with Diskette command ``diskette_loaddata``. Default to
+                ``loaddata``.
+            batch_size (integer): Number of objects to insert at once with the
+                ``bulk`` engine. Default to 1000.
+            jobs (integer): Number of worker processes to load data dumps
+                concurrently. Dumps are loaded as soon as the dumps they depend on
+                have been loaded. If empty, dumps are loaded sequentially.
+            pipeline (boolean): If enabled, data dumps are loaded as soon as they
+                are extracted while the archive extraction continues in background.
+            if_changed (boolean): If enabled, only the data dumps and storages which
+                have changed since the previous load are loaded and the load is
+                skipped if the same archive has already been loaded.
 
         Returns:
             dict: Statistics of deployed storages and datas.
@@ -140,6 +192,7 @@ class LoadCommandHandler(BaseHandler):
         checksum = self.get_checksum(checksum)
         storages_basepath = self.get_storages_basepath(storages_basepath)
         download_destination = self.get_download_destination(download_destination)
+        engine = self.get_load_engine(engine, batch_size=batch_size)
 
         manager = Loader(logger=self.logger)
 
@@ -157,6 +210,11 @@ class LoadCommandHandler(BaseHandler):
             keep=keep,
             checksum=checksum,
             ignorenonexistent_data=ignorenonexistent_data,
+            engine=engine,
+            batch_size=batch_size,
+            jobs=jobs,
+            pipeline=pipeline,
+            if_changed=if_changed,
         )
 
         return stats
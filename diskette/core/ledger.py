@@ -0,0 +1,206 @@
+import json
+
+from ..utils import hashs
+
+
+class LoadLedger:
+    """
+    Ledger of what has been loaded from archives, so a load can skip the archive
+    contents which have already been loaded.
+
+    Ledger is a JSON file which records:
+
+    * The checksum of the last archive which has been completely loaded, with the
+      scope of this load;
+    * The checksum of each loaded data dump;
+    * The fingerprint of each deployed storage, see
+      ``diskette.utils.hashs.directory_fingerprint``.
+
+    Ledger is bound to a database identity, a ledger from another database (or from
+    the same database before it has been recreated) is ignored.
+
+    .. Warning::
+        Ledger only knows about what has been loaded, it can not know about changes
+        made since in the database or the storages.
+
+    Arguments:
+        path (Path): Path to the ledger file. It is created once something is
+            recorded.
+
+    Keyword Arguments:
+        database (string): Identity of the database where data is loaded, it must
+            change when database is recreated.
+    """
+    def __init__(self, path, database=None):
+        self.path = path
+        self.database = database
+        self.content = self.read()
+        self.checksums = {}
+
+    def read(self):
+        """
+        Read ledger file.
+
+        Returns:
+            dict: Ledger content. It is empty if the file does not exist or is for
+            another database.
+        """
+        content = {}
+        if self.path.exists():
+            content = json.loads(self.path.read_text())
+
+        if content.get("database") != self.database:
+            content = {}
+
+        return {
+            "database": self.database,
+            "archive": content.get("archive"),
+            "datas": content.get("datas", {}),
+            "storages": content.get("storages", {}),
+        }
+
+    def write(self):
+        """
+        Write ledger content into its file.
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps(self.content, indent=4))
+
+    def get_scope(self, with_data=True, with_storages=True, data_exclusions=None):
+        """
+        Build the scope of a load.
+
+        Keyword Arguments:
+            with_data (boolean): If data dumps are loaded.
+            with_storages (boolean): If storages are loaded.
+            data_exclusions (list): List of excluded dump filenames.
+
+        Returns:
+            dict: The load scope.
+        """
+        return {
+            "with_data": with_data,
+            "with_storages": with_storages,
+            "data_exclusions": sorted(data_exclusions or []) if with_data else [],
+        }
+
+    def is_archive_loaded(self, checksum, **scope):
+        """
+        Check if an archive has already been loaded with at least the given scope.
+
+        Arguments:
+            checksum (string): The archive checksum.
+
+        Keyword Arguments:
+            **scope: Scope options, see ``LoadLedger.get_scope``.
+
+        Returns:
+            boolean: True if the last completely loaded archive has the same
+            checksum and its load covered the given scope.
+        """
+        archive = self.content["archive"]
+        if not checksum or not archive or archive["checksum"] != checksum:
+            return False
+
+        wanted = self.get_scope(**scope)
+        loaded = archive["scope"]
+
+        if wanted["with_data"] and (
+            not loaded["with_data"] or
+            not set(loaded["data_exclusions"]) <= set(wanted["data_exclusions"])
+        ):
+            return False
+
+        return not wanted["with_storages"] or loaded["with_storages"]
+
+    def start_archive(self):
+        """
+        Forget the last loaded archive since a new load starts and it may change
+        what has been loaded.
+        """
+        self.content["archive"] = None
+        self.write()
+
+    def record_archive(self, checksum, **scope):
+        """
+        Record an archive which has been completely loaded.
+
+        Arguments:
+            checksum (string): The archive checksum. If empty nothing is recorded.
+
+        Keyword Arguments:
+            **scope: Scope options, see ``LoadLedger.get_scope``.
+        """
+        if not checksum:
+            return
+
+        self.content["archive"] = {
+            "checksum": checksum,
+            "scope": self.get_scope(**scope),
+        }
+        self.write()
+
+    def get_data_checksum(self, dump):
+        """
+        Get the checksum of a data dump file.
+
+        Checksum is computed once for a path, so a dump can be checked then recorded
+        without to be read twice.
+
+        Arguments:
+            dump (Path): The dump file path.
+
+        Returns:
+            string: The dump checksum.
+        """
+        if dump not in self.checksums:
+            self.checksums[dump] = hashs.file_checksum(dump)
+
+        return self.checksums[dump]
+
+    def is_data_loaded(self, dump):
+        """
+        Check if a data dump has already been loaded.
+
+        Arguments:
+            dump (Path): The dump file path.
+
+        Returns:
+            boolean: True if a dump with the same filename and checksum has been
+            loaded.
+        """
+        return self.content["datas"].get(dump.name) == self.get_data_checksum(dump)
+
+    def record_data(self, dump):
+        """
+        Record a loaded data dump.
+
+        Arguments:
+            dump (Path): The dump file path.
+        """
+        self.content["datas"][dump.name] = self.get_data_checksum(dump)
+        self.write()
+
+    def is_storage_loaded(self, name, fingerprint):
+        """
+        Check if a storage has already been deployed.
+
+        Arguments:
+            name (string): The storage path from manifest.
+            fingerprint (string): The storage fingerprint.
+
+        Returns:
+            boolean: True if the storage has been deployed with the same fingerprint.
+        """
+        return self.content["storages"].get(name) == fingerprint
+
+    def record_storage(self, name, fingerprint):
+        """
+        Record a deployed storage.
+
+        Arguments:
+            name (string): The storage path from manifest.
+            fingerprint (string): The storage fingerprint.
+        """
+        self.content["storages"][name] = fingerprint
+        self.write()
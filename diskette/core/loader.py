@@ -1,20 +1,86 @@
 import json
+import os
+import queue
 import shutil
-import tarfile
 import tempfile
+import threading
+import time
 import requests
+from concurrent.futures import (
+    FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+)
+from contextlib import contextmanager, nullcontext
 from pathlib import Path
 
 from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.migrations.recorder import MigrationRecorder
 from django.template.defaultfilters import filesizeformat
 
+from ..exceptions import LoaderError
+from ..utils.archives import ArchiveIndex, open_archive_reader
+from ..utils.cache import DownloadCache, ExtractionCache
 from ..utils.filesystem import directory_size
-from ..utils.loggers import NoOperationLogger
+from ..utils.fixtures import get_fixture_models, get_related_models
+from ..utils.loggers import NoOperationLogger, RecordingOutput
 from ..utils import hashs
-from ..utils.http import is_url
+from ..utils.http import is_url, parse_content_range
 
+from .defaults import (
+    ARCHIVE_INDEX_FILENAME, DEFAULT_PIPELINE_QUEUE_SIZE, DOWNLOAD_SEGMENT_MINIMAL_SIZE
+)
+from .ledger import LoadLedger
 from .serializers import LoaddataSerializerAbstract
 from .storages import StorageMixin
+from .workers import get_process_pool
+
+
+# Loader instance shared with forked load workers
+_WORKER_LOADER = None
+
+
+def _load_worker_initializer(loader):
+    """
+    Store the loader instance to use in a load worker.
+
+    Arguments:
+        loader (Loader): The loader instance inherited from parent process.
+    """
+    global _WORKER_LOADER
+    _WORKER_LOADER = loader
+
+
+def _load_worker(dump, ignorenonexistent=False, engine=None, batch_size=None):
+    """
+    Load a data dump from a worker.
+
+    Messages from load are recorded instead of being output since the worker can not
+    reach the parent logger.
+
+    Arguments:
+        dump (Path): Path to the dump file to load.
+
+    Keyword Arguments:
+        ignorenonexistent (boolean): If true, fields and models that does not
+            exists in current models will be ignored instead of raising an error.
+        engine (string): Load engine name.
+        batch_size (integer): Number of objects to insert at once with the ``bulk``
+            engine.
+
+    Returns:
+        tuple: The load output and the list of recorded messages.
+    """
+    output = RecordingOutput()
+    _WORKER_LOADER.logger = output
+
+    content = _WORKER_LOADER.call(
+        dump,
+        ignorenonexistent=ignorenonexistent,
+        engine=engine,
+        batch_size=batch_size,
+    )
+
+    return content, output.records
 
 
 class Loader(StorageMixin, LoaddataSerializerAbstract):
@@ -26,6 +92,13 @@ class Loader(StorageMixin, LoaddataSerializerAbstract):
             implement common logging message methods (like error, info, etc..). See
             ``diskette.utils.loggers`` for available loggers. If not given, a dummy
             logger will be used that ignores any messages and won't output anything.
+
+    Attributes:
+        download_checksum (string): The blake2b checksum of the last downloaded
+            archive, computed while it was downloaded. This is ``None`` until an
+            archive has been downloaded.
+        archive_checksum (string): The blake2b checksum of the last opened archive.
+            This is ``None`` until an archive has been opened with a checksum.
     """
     MANIFEST_FILENAME = "manifest.json"
     TEMPDIR_PREFIX = "diskette_"
@@ -33,11 +106,476 @@ class Loader(StorageMixin, LoaddataSerializerAbstract):
 
     def __init__(self, logger=None):
         self.logger = logger or NoOperationLogger()
+        self.download_checksum = None
+        self.archive_checksum = None
+
+    def is_retryable_error(self, error):
+        """
+        Check if a download error is worth a retry.
+
+        Arguments:
+            error (requests.exceptions.RequestException): The download error.
+
+        Returns:
+            boolean: True for connection errors, timeouts, interrupted transfers and
+            server errors.
+        """
+        if isinstance(error, requests.exceptions.HTTPError):
+            return (
+                error.response is not None and
+                error.response.status_code >= 500
+            )
+
+        return isinstance(error, (
+            requests.exceptions.ConnectionError,
+            requests.exceptions.Timeout,
+            requests.exceptions.ChunkedEncodingError,
+        ))
+
+    def get_download_cache(self):
+        """
+        Get the cache of downloaded archives.
+
+        Returns:
+            diskette.utils.cache.DownloadCache: The cache object from settings
+            ``DISKETTE_DOWNLOAD_CACHE_PATH`` and ``DISKETTE_DOWNLOAD_CACHE_SIZE``.
+            This is ``None`` if cache is disabled.
+        """
+        if not settings.DISKETTE_DOWNLOAD_CACHE_PATH:
+            return None
+
+        return DownloadCache(
+            Path(settings.DISKETTE_DOWNLOAD_CACHE_PATH),
+            max_size=settings.DISKETTE_DOWNLOAD_CACHE_SIZE,
+        )
+
+    def get_extraction_cache(self):
+        """
+        Get the cache of extracted archives.
+
+        Returns:
+            diskette.utils.cache.ExtractionCache: The cache object from settings
+            ``DISKETTE_EXTRACTION_CACHE_PATH`` and ``DISKETTE_EXTRACTION_CACHE_SIZE``.
+            This is ``None`` if cache is disabled.
+        """
+        if not settings.DISKETTE_EXTRACTION_CACHE_PATH:
+            return None
+
+        return ExtractionCache(
+            Path(settings.DISKETTE_EXTRACTION_CACHE_PATH),
+            max_size=settings.DISKETTE_EXTRACTION_CACHE_SIZE,
+        )
+
+    def get_download_session(self):
+        """
+        Get a HTTP session to download an archive.
+
+        Its connection pool is big enough to keep a connection for each download
+        segment so they are reused from a retry to another.
+
+        Returns:
+            requests.Session: The session object.
+        """
+        session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(
+            pool_maxsize=max(settings.DISKETTE_DOWNLOAD_SEGMENTS, 1)
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+
+        return session
+
+    def get_download_segments(self, length):
+        """
+        Split an archive length into byte ranges to download concurrently.
+
+        Arguments:
+            length (integer): The archive length in bytes.
+
+        Returns:
+            list: Segments as lists of their first byte, their end (excluded) and
+            their next byte to download. This is ``None`` if archive is not worth to
+            be split.
+        """
+        count = min(
+            settings.DISKETTE_DOWNLOAD_SEGMENTS,
+            length // DOWNLOAD_SEGMENT_MINIMAL_SIZE
+        )
+        if count < 2:
+            return None
+
+        size = -(-length // count)
+
+        return [
+            [start, min(start + size, length), start]
+            for start in range(0, length, size)
+        ]
+
+    def fetch_archive(self, url, partial, session, conditions=None):
+        """
+        Download archive from given URL into a partial file, resuming from its
+        already downloaded content if any.
+
+        Archive entity tag and length are stored in a state file next to the partial
+        file (with a ``.json`` suffix) so a next attempt can resume the download with
+        a ``Range`` request. Download only resumes if server still serves the same
+        archive, it restarts from scratch else.
+
+        A new download starts with a request for the whole archive as a byte range.
+        If server accepts it and archive is big enough, the archive is downloaded in
+        segments with ``Loader.fetch_segments``. Else the archive is downloaded in a
+        single stream and checksumed while it is downloaded.
+
+        Arguments:
+            url (string): The archive URL to download.
+            partial (Path): The partial file where to write downloaded content.
+            session (requests.Session): The HTTP session to perform requests.
+
+        Keyword Arguments:
+            conditions (dict): Conditional request headers for a new download, see
+                ``DownloadCache.get_conditions``.
+
+        Raises:
+            requests.exceptions.ConnectionError: When connection has ended before
+                the end of archive.
+
+        Returns:
+            string: The archive checksum. This is ``None`` if server responded the
+            archive has not been modified from the given conditions.
+        """
+        state_path = partial.with_name(partial.name + ".json")
+        state = {}
+        if partial.exists() and state_path.exists():
+            state = json.loads(state_path.read_text())
+
+        # Only resume from a strong entity tag of the same URL
+        offset = 0
+        headers = {}
+        etag = state.get("etag") or ""
+        if state.get("url") == url and etag and not etag.startswith("W/"):
+            if state.get("segments"):
+                return self.fetch_segments(url, partial, state, session)
+
+            offset = partial.stat().st_size
+
+        if offset:
+            headers = {"Range": "bytes={}-".format(offset), "If-Range": etag}
+        else:
+            headers = dict(conditions or {})
+            if settings.DISKETTE_DOWNLOAD_SEGMENTS > 1:
+                # Probe server support of ranges, it still sends the whole archive
+                headers["Range"] = "bytes=0-"
+
+        response = session.get(
+            url,
+            headers=headers,
+            allow_redirects=settings.DISKETTE_DOWNLOAD_ALLOW_REDIRECT,
+            timeout=settings.DISKETTE_DOWNLOAD_TIMEOUT,
+            stream=True
+        )
+
+        with response:
+            if response.status_code == 304:
+                return None
+
+            content_range = None
+            if response.status_code == 206:
+                content_range = parse_content_range(
+                    response.headers.get("Content-Range")
+                )
+
+            # Partial content does not match the partial file, restart from scratch
+            if (offset and response.status_code == 416) or (
+                offset and content_range is not None and
+                content_range != (offset, state.get("length"))
+            ):
+                self.logger.warning(
+                    "Partial download does not match archive, restarting download"
+                )
+                partial.unlink()
+                state_path.unlink()
+                response.close()
+                return self.fetch_archive(
+                    url,
+                    partial,
+                    session,
+                    conditions=conditions
+                )
+
+            response.raise_for_status()
+
+            if offset and content_range is not None:
+                self.logger.info("Resuming download from byte {}".format(offset))
+                length = state.get("length")
+            else:
+                if offset:
+                    self.logger.info(
+                        "Archive has changed or server does not support ranges, "
+                        "restarting download"
+                    )
+                offset = 0
+                length = response.headers.get("Content-Length")
+                # Length does not match the decoded content with a content encoding
+                if length and not response.headers.get("Content-Encoding"):
+                    length = int(length)
+                else:
+                    length = None
+
+                state = {
+                    "url": url,
+                    "etag": response.headers.get("ETag"),
+                    "last_modified": response.headers.get("Last-Modified"),
+                    "length": length,
+                }
+
+                # Archive is downloaded in segments if server accepts ranges
+                etag = state["etag"] or ""
+                if (
+                    content_range is not None and content_range[0] == 0 and
+                    content_range[1] == length and
+                    etag and not etag.startswith("W/")
+                ):
+                    state["segments"] = self.get_download_segments(length)
+
+                state_path.write_text(json.dumps(state))
+
+                if state.get("segments"):
+                    return self.fetch_segments(
+                        url,
+                        partial,
+                        state,
+                        session,
+                        response=response
+                    )
+
+            with partial.open("r+b" if offset else "wb") as fp:
+                stream = hashs.ChecksumStream(fp)
+                # Checksum the already downloaded content, this leaves the file
+                # position at its end where to append downloaded content
+                if offset:
+                    stream.drain()
+
+                # Use the chunk way to avoid retaining the whole file in memory
+                for chunk in response.iter_content(
+                    chunk_size=settings.DISKETTE_DOWNLOAD_CHUNK
+                ):
+                    stream.write(chunk)
+
+        size = partial.stat().st_size
+        if length is not None and size != length:
+            raise requests.exceptions.ConnectionError(
+                "Connection ended after {} bytes of {} bytes".format(size, length)
+            )
+
+        return stream.hexdigest()
+
+    def fetch_segment(self, url, partial, segment, etag, session, response=None,
+                      aborted=None):
+        """
+        Download a segment of archive into its range of the partial file.
+
+        Arguments:
+            url (string): The archive URL to download.
+            partial (Path): The partial file where to write downloaded content.
+            segment (list): The segment to download, as returned by
+                ``Loader.get_download_segments``. Its next byte to download is
+                updated while it is downloaded.
+            etag (string): The archive entity tag.
+            session (requests.Session): The HTTP session to perform requests.
+
+        Keyword Arguments:
+            response (requests.Response): A response already opened on the segment
+                range. If not given a request is performed for the remaining range
+                of segment.
+            aborted (threading.Event): Event to stop the download once it is set.
+
+        Raises:
+            requests.exceptions.ConnectionError: When connection has ended before
+                the end of segment.
+
+        Returns:
+            boolean: False if server does not send the segment range, it means the
+            archive has changed. Else True.
+        """
+        start, end, position = segment
+        if position >= end:
+            return True
+
+        if response is None:
+            response = session.get(
+                url,
+                headers={
+                    "Range": "bytes={}-{}".format(position, end - 1),
+                    "If-Range": etag,
+                },
+                allow_redirects=settings.DISKETTE_DOWNLOAD_ALLOW_REDIRECT,
+                timeout=settings.DISKETTE_DOWNLOAD_TIMEOUT,
+                stream=True
+            )
+
+        with response:
+            response.raise_for_status()
+
+            content_range = parse_content_range(response.headers.get("Content-Range"))
+            if response.status_code != 206 or content_range is None or (
+                content_range[0] != position
+            ):
+                return False
+
+            with partial.open("r+b") as fp:
+                fp.seek(position)
+
+                for chunk in response.iter_content(
+                    chunk_size=settings.DISKETTE_DOWNLOAD_CHUNK
+                ):
+                    if aborted is not None and aborted.is_set():
+                        break
+
+                    # A response opened on a wider range is cut at segment end
+                    chunk = chunk[:end - position]
+                    fp.write(chunk)
+                    position += len(chunk)
+                    segment[2] = position
+
+                    if position >= end:
+                        break
+
+        if position < end:
+            raise requests.exceptions.ConnectionError(
+                "Connection ended at byte {} of segment {}-{}".format(
+                    position, start, end - 1
+                )
+            )
+
+        return True
+
+    def fetch_segments(self, url, partial, state, session, response=None):
+        """
+        Download archive segments concurrently into the partial file.
+
+        Partial file is preallocated to the archive length then each segment is
+        downloaded from a thread with its own connection and written at its offset.
+        Segment progress is stored in the state file once a segment is complete or
+        has failed, so a next attempt only downloads the missing ranges. A failed
+        segment does not stop the other ones, while they are all stopped if the
+        archive has changed.
+
+        Archive checksum is computed as soon as all segments before a complete segment
+        are complete too, by reading back the segments which have just been written.
+
+        Arguments:
+            url (string): The archive URL to download.
+            partial (Path): The partial file where to write downloaded content.
+            state (dict): The download state with the archive entity tag, length and
+                segments.
+            session (requests.Session): The HTTP session to perform requests.
+
+        Keyword Arguments:
+            response (requests.Response): A response opened on the whole archive
+                range, it is used for the first segment.
+
+        Returns:
+            string: The archive checksum.
+        """
+        state_path = partial.with_name(partial.name + ".json")
+        segments = state["segments"]
+
+        if not partial.exists() or partial.stat().st_size != state["length"]:
+            with partial.open("wb") as fp:
+                try:
+                    os.posix_fallocate(fp.fileno(), 0, state["length"])
+                except (AttributeError, OSError):
+                    fp.truncate(state["length"])
+
+        self.logger.info(
+            "Downloading {} bytes in {} segments".format(
+                sum([end - position for start, end, position in segments]),
+                len(segments),
+            )
+        )
+
+        aborted = threading.Event()
+        error = None
+        changed = False
+
+        with ThreadPoolExecutor(max_workers=len(segments)) as executor:
+            futures = {
+                executor.submit(
+                    self.fetch_segment,
+                    url,
+                    partial,
+                    segment,
+                    state["etag"],
+                    session,
+                    response=response if i == 0 and segment[2] == 0 else None,
+                    aborted=aborted,
+                ): i
+                for i, segment in enumerate(segments)
+            }
+
+            # File is not buffered since buffering would read ahead the segments
+            # which are not complete yet
+            with partial.open("rb", buffering=0) as fp:
+                stream = hashs.ChecksumStream(fp)
+                done = set()
+                hashed = 0
+
+                for future in as_completed(futures):
+                    try:
+                        if future.result() is False:
+                            changed = True
+                            aborted.set()
+                    except requests.exceptions.RequestException as e:
+                        # Other segments go on so a retry only has to download
+                        # the missing ranges
+                        error = error or e
+                    else:
+                        done.add(futures[future])
+
+                    state_path.write_text(json.dumps(state))
+
+                    # Checksum every complete segment following the hashed ones
+                    while not aborted.is_set() and hashed in done:
+                        remaining = segments[hashed][1] - segments[hashed][0]
+                        while remaining:
+                            remaining -= len(stream.read(
+                                min(remaining, settings.DISKETTE_DOWNLOAD_CHUNK)
+                            ))
+                        hashed += 1
+
+        if changed:
+            self.logger.warning("Archive has changed, restarting download")
+            partial.unlink()
+            state_path.unlink()
+            return self.fetch_archive(url, partial, session)
+
+        if error is not None:
+            raise error
+
+        return stream.hexdigest()
 
     def download_archive(self, url, destination=None):
         """
         Download archive from given URL into destination directory.
 
+        Archive is written into a partial file (destination with a ``.part`` suffix)
+        until it is complete, all requests are performed from a single HTTP session
+        (see ``Loader.get_download_session``). A failed download is retried as many
+        times as setting ``DISKETTE_DOWNLOAD_RETRIES`` allows, waiting for a delay
+        doubled at each retry from setting ``DISKETTE_DOWNLOAD_RETRY_DELAY``. Each
+        attempt resumes from the partial file, even from a previous failed call, see
+        ``Loader.fetch_archive``.
+
+        Archive checksum is computed while it is downloaded, it is available from
+        ``Loader.download_checksum`` once the download is complete. Archive may be
+        downloaded in concurrent segments depending setting
+        ``DISKETTE_DOWNLOAD_SEGMENTS``.
+
+        When the download cache is enabled (see ``Loader.get_download_cache``), the
+        archive is downloaded into the cache with a conditional request if it has
+        already been cached. The cached archive is used as is when server responds
+        it has not been modified.
+
         Arguments:
             url (string): The archive URL to download.
 
@@ -45,37 +583,135 @@ class Loader(StorageMixin, LoaddataSerializerAbstract):
             destination (Path): A path where to write downloaded archive file. If not
                 given, the archive file will be written as
                 ``diskette_downloaded_archive.tar.gz`` into the current working
-                directory.
+                directory. This is ignored when the download cache is enabled.
+
+        Raises:
+            requests.exceptions.RequestException: The last download error when there
+                is no retry left or the error is not worth a retry.
 
         Returns:
             Path: Path to downloaded archive file.
         """
-        destination = destination or Path.cwd() / self.DOWNLOAD_FILENAME
+        cache = self.get_download_cache()
+        conditions = {}
+        if cache is not None:
+            destination = cache.get_archive_path(url)
+            conditions = cache.get_conditions(url)
+        else:
+            destination = destination or Path.cwd() / self.DOWNLOAD_FILENAME
+
+        partial = destination.with_name(destination.name + ".part")
+        state_path = partial.with_name(partial.name + ".json")
+        self.download_checksum = None
         self.logger.info(
             "Downloading archive from '{}' to '{}'".format(url, destination)
         )
 
-        request = requests.get(
-            url,
-            allow_redirects=settings.DISKETTE_DOWNLOAD_ALLOW_REDIRECT,
-            timeout=settings.DISKETTE_DOWNLOAD_TIMEOUT,
-            stream=True
-        )
-        request.raise_for_status()
+        retries = settings.DISKETTE_DOWNLOAD_RETRIES
+        attempt = 0
+        with self.get_download_session() as session:
+            while True:
+                try:
+                    checksum = self.fetch_archive(
+                        url,
+                        partial,
+                        session,
+                        conditions=conditions
+                    )
+                except requests.exceptions.RequestException as e:
+                    if attempt >= retries or not self.is_retryable_error(e):
+                        raise
 
-        # Use the chunk way to avoid retaining the whole file in memory
-        with open(destination, "wb") as fd:
-            for chunk in request.iter_content(
-                chunk_size=settings.DISKETTE_DOWNLOAD_CHUNK
-            ):
-                fd.write(chunk)
+                    attempt += 1
+                    delay = (
+                        settings.DISKETTE_DOWNLOAD_RETRY_DELAY * 2 ** (attempt - 1)
+                    )
+                    self.logger.warning(
+                        "Download failed ({error}), retry {attempt}/{retries} in "
+                        "{delay}s".format(
+                            error=e,
+                            attempt=attempt,
+                            retries=retries,
+                            delay=delay,
+                        )
+                    )
+                    time.sleep(delay)
+                else:
+                    break
+
+        if checksum is None:
+            self.logger.info("Archive has not been modified, using cached archive")
+            cache.touch(url)
+            self.download_checksum = cache.get(url)["checksum"]
+            return destination
+
+        state = json.loads(state_path.read_text())
+        if cache is not None:
+            # Previous entry is not valid anymore once its archive is replaced
+            cache.get_metadata_path(url).unlink(missing_ok=True)
+
+        partial.replace(destination)
+        state_path.unlink()
+        self.download_checksum = checksum
+
+        if cache is not None:
+            cache.store(
+                url,
+                etag=state["etag"],
+                last_modified=state.get("last_modified"),
+                checksum=checksum,
+            )
 
         return destination
 
-    def open(self, source, download_destination=None, keep=False, checksum=None):
+    def get_archive(self, source, download_destination=None):
+        """
+        Get the local archive file from a load source, the archive is downloaded if
+        source is an URL.
+
+        Arguments:
+            source (Path or string or object): A Path object to a local archive file,
+                a string for an URL to download the archive or a binary file object
+                which is returned as is.
+
+        Keyword Arguments:
+            download_destination (Path): A path where to write downloaded archive file,
+                see ``Loader.open``.
+
+        Returns:
+            tuple: Respectively the archive, its checksum if it is already known
+            (from a download) else ``None`` and a boolean for if the archive comes
+            from the download cache.
+        """
+        archive = source
+        archive_checksum = None
+        is_cached = False
+
+        if hasattr(source, "read"):
+            return archive, archive_checksum, is_cached
+
+        if is_url(source):
+            archive = self.download_archive(source, destination=download_destination)
+            # Downloaded archive has been checksumed during download
+            archive_checksum = self.download_checksum
+            is_cached = self.get_download_cache() is not None
+
+        if not archive.exists():
+            self.logger.critical(
+                "Given archive path does not exists: {}".format(archive)
+            )
+
+        return archive, archive_checksum, is_cached
+
+    def open(self, source, download_destination=None, keep=False, checksum=None,
+             with_data=True, with_storages=True, data_exclusions=None,
+             callback=None, destination=None):
         """
         Extract archive files in a temporary directory.
 
+        Only the archive files required by the load options are extracted, see
+        ``Loader.extract``.
+
         .. Warning::
             Using this method, you are responsible to remove the temporary directory
             once you are done with it. Your code must be safe about it and remove it
@@ -83,7 +719,10 @@ class Loader(StorageMixin, LoaddataSerializerAbstract):
             directories.
 
         Arguments:
-            source (Path): A Path object to the archive to open.
+            source (Path or string or object): A Path object to the archive to open,
+                a string for an URL to download the archive or a binary file object
+                (like the standard input) to read the archive as a stream, see
+                ``Loader.extract_stream``.
 
         Keyword Arguments:
             download_destination (Path): A path where to write downloaded archive file.
@@ -91,7 +730,9 @@ class Loader(StorageMixin, LoaddataSerializerAbstract):
                 ``diskette_downloaded_archive.tar.gz`` into the current working
                 directory. This argument is useless with local archive file.
             keep (boolean): Archive won't be removed from filesystem if True, else the
-                archive file is removed once it have been extracted.
+                archive file is removed once it have been extracted. This argument is
+                useless with a file object or an archive from the download cache
+                which is never removed.
             checksum (object): Manage if archive is checksumed or not depending value:
 
                 * If ``None``: Checksum is done and just output to logs;
@@ -100,40 +741,51 @@ class Loader(StorageMixin, LoaddataSerializerAbstract):
                 * Any other value is assumed to be a string for a checksum to compare.
                   Then a checksum is done on archive and compared to the given one, if
                   comparaison fails it results to a critical error.
+            with_data (boolean): Extract data dumps.
+            with_storages (boolean): Extract storages.
+            data_exclusions (list): List of dump filenames which are not extracted.
+            callback (function): Function called with the path of each extracted
+                file once it has been extracted, see ``Loader.extract``.
+            destination (Path): An existing directory where to extract archive files.
+                If not given a temporary directory is created.
 
         Returns:
             Path: The temporary directory where archive files have been extracted.
         """
-        archive = source
-        if is_url(source):
-            archive = self.download_archive(source, destination=download_destination)
-
-        if not archive.exists():
-            self.logger.critical(
-                "Given archive path does not exists: {}".format(archive)
-            )
+        is_stream = hasattr(source, "read")
+        archive, archive_checksum, is_cached = self.get_archive(
+            source,
+            download_destination=download_destination,
+        )
 
         # The temporary directory where to extract archive content
-        destination_tmpdir = Path(tempfile.mkdtemp(prefix=self.TEMPDIR_PREFIX))
+        destination_tmpdir = destination or Path(
+            tempfile.mkdtemp(prefix=self.TEMPDIR_PREFIX)
+        )
 
-        # Perform checksum if not explicitely disabled
-        if checksum is not False:
-            archive_checksum = hashs.file_checksum(archive)
-            self.logger.debug(
-                "Archive checksum: {}".format(archive_checksum)
-            )
-            # Compare checksums if any
-            if checksum and checksum is not True:
-                if archive_checksum != checksum:
-                    self.logger.critical(
-                        "Checksums do not match. Your archive file is probably "
-                        "corrupted."
-                    )
+        # Perform checksum if not explicitely disabled, a stream is checksumed
+        # while it is extracted
+        if checksum is not False and not is_stream:
+            self.archive_checksum = archive_checksum or hashs.file_checksum(archive)
+            self.check_checksum(self.archive_checksum, checksum)
+
+        options = {
+            "with_data": with_data,
+            "with_storages": with_storages,
+            "data_exclusions": data_exclusions,
+            "callback": callback,
+        }
 
         try:
-            # Extract everything in temporary directory
-            with tarfile.open(archive, "r:gz") as archive_fp:
-                archive_fp.extractall(destination_tmpdir)
+            if is_stream:
+                self.extract_stream(
+                    archive,
+                    destination_tmpdir,
+                    checksum=checksum,
+                    **options
+                )
+            else:
+                self.extract(archive, destination_tmpdir, **options)
         except Exception as e:
             # Remove destination_tmpdir on extraction failure
             if destination_tmpdir.exists():
@@ -142,11 +794,392 @@ class Loader(StorageMixin, LoaddataSerializerAbstract):
             raise e
         finally:
             # Remove archive if not required to be keeped
-            if not keep:
+            if not keep and not is_stream and not is_cached:
                 archive.unlink()
 
         return destination_tmpdir
 
+    @contextmanager
+    def open_cached(self, archive, cache, keep=False):
+        """
+        Use the directory of an extracted archive from the extraction cache.
+
+        Archive is extracted into the cache if it is not there yet, then the cached
+        directory is used for the next loads of an archive with the same checksum.
+        All archive files are extracted whatever the load options so an entry can be
+        used for any load.
+
+        Entry is locked for the context duration so it can not be evicted from
+        another load meanwhile, see ``ExtractionCache.lock``.
+
+        .. Warning::
+            Cached directory is shared between loads, it must not be modified nor
+            removed.
+
+        Arguments:
+            archive (Path): The local archive file which has already been checksumed
+                into ``Loader.archive_checksum``.
+            cache (diskette.utils.cache.ExtractionCache): The extraction cache.
+
+        Keyword Arguments:
+            keep (boolean): Archive won't be removed from filesystem if True, else the
+                archive file is removed once it have been used.
+
+        Raises:
+            LoaderError: When extracted archive has been stored from another load
+                then evicted before it could be locked.
+
+        Yields:
+            Path: The cached directory where archive files have been extracted.
+        """
+        key = self.archive_checksum
+
+        with cache.lock(key) as directory:
+            if directory:
+                self.logger.info("Using extracted archive from cache")
+
+                if not keep:
+                    archive.unlink()
+
+                yield directory
+                return
+
+        # Temporary directory is removed by 'open' on extraction failure
+        tmpdir = cache.make_tmpdir()
+        self.open(archive, keep=keep, checksum=False, destination=tmpdir)
+
+        with cache.store(key, tmpdir) as directory:
+            if directory is None:
+                raise LoaderError(
+                    "Extracted archive has been evicted from cache before it could "
+                    "be used."
+                )
+
+            # Stored entry is locked so it is never evicted
+            cache.evict(keep=key)
+
+            yield directory
+
+    def check_checksum(self, archive_checksum, checksum=None):
+        """
+        Output archive checksum and compare it to the expected one if any.
+
+        Arguments:
+            archive_checksum (string): The archive checksum.
+
+        Keyword Arguments:
+            checksum (object): The expected checksum string. Any other value (like
+                ``None`` or ``True``) disables comparison.
+        """
+        self.logger.debug(
+            "Archive checksum: {}".format(archive_checksum)
+        )
+        # Compare checksums if any
+        if checksum and checksum is not True:
+            if archive_checksum != checksum:
+                self.logger.critical(
+                    "Checksums do not match. Your archive file is probably "
+                    "corrupted."
+                )
+
+    def get_extraction_filter(self, manifest, with_data=True, with_storages=True,
+                              data_exclusions=None):
+        """
+        Build the function which selects the archive members to extract for a load.
+
+        Selection is planned from the manifest, a data dump is selected if data are
+        loaded and it is not excluded, a storage member is selected if storages are
+        loaded. The manifest itself is never selected since it is always read first.
+
+        Arguments:
+            manifest (dict): The manifest data.
+
+        Keyword Arguments:
+            with_data (boolean): Select data dumps.
+            with_storages (boolean): Select storages.
+            data_exclusions (list): List of dump filenames to not select.
+
+        Returns:
+            function: A function which takes a member name and returns True if member
+            is to be extracted.
+        """
+        excludes = data_exclusions or []
+
+        datas = set()
+        if with_data:
+            for dump in manifest["datas"]:
+                if dump.name not in excludes:
+                    datas.add(str(dump))
+                    # Directory members of dump are selected to keep their modes
+                    datas.update([
+                        str(parent) for parent in dump.parents if parent.name
+                    ])
+
+        storages = []
+        if with_storages:
+            storages = [str(path) for path in manifest["storages"]]
+
+        def is_selected(name):
+            if name in datas:
+                return True
+
+            return any([
+                name == prefix or name.startswith(prefix + "/")
+                for prefix in storages
+            ])
+
+        return is_selected
+
+    def extract(self, archive, destination, with_data=True, with_storages=True,
+                data_exclusions=None, callback=None):
+        """
+        Extract archive files required for a load.
+
+        The manifest is read first to select the members to extract, so excluded
+        dumps and skipped storages never reach the filesystem:
+
+        * With the ``indexed`` layout and when some files are not required, only
+          selected members are read from the index;
+        * Else the archive is read once, since the manifest is its first member,
+          see ``Loader.extract_members``. For archives with the manifest at their
+          end, the manifest is searched for then archive is read again.
+
+        Arguments:
+            archive (Path): Path object to the archive file.
+            destination (Path): Directory where to extract archive files.
+
+        Keyword Arguments:
+            with_data (boolean): Extract data dumps.
+            with_storages (boolean): Extract storages.
+            data_exclusions (list): List of dump filenames which are not extracted.
+            callback (function): Function called with the path of each extracted
+                file once it has been extracted, the manifest is always the first
+                one except for archives with the manifest at their end.
+        """
+        selective = not (with_data and with_storages) or bool(data_exclusions)
+        options = {
+            "with_data": with_data,
+            "with_storages": with_storages,
+            "data_exclusions": data_exclusions,
+        }
+
+        index = ArchiveIndex.read(archive) if selective else None
+        if index is not None and self.MANIFEST_FILENAME in index:
+            self.logger.debug("Extracting archive members from its index")
+            content = index.read_member(self.MANIFEST_FILENAME)
+            self.write_manifest(destination, content, callback=callback)
+            is_selected = self.get_extraction_filter(
+                self.parse_manifest(content.decode("utf-8")),
+                **options
+            )
+
+            for name in index.members:
+                if is_selected(name):
+                    index.extract_member(name, destination)
+                    if callback and (destination / name).is_file():
+                        callback(destination / name)
+
+            return
+
+        # Compression is detected from archive content
+        with open_archive_reader(archive) as archive_fp:
+            if self.extract_members(
+                archive_fp,
+                destination,
+                callback=callback,
+                **options
+            ):
+                return
+
+        # Manifest is not at the front of archive
+        is_selected = None
+        if selective:
+            is_selected = self.get_extraction_filter(
+                self.get_archive_manifest(archive),
+                **options
+            )
+
+        with open_archive_reader(archive) as archive_fp:
+            self.extract_selected(
+                archive_fp,
+                destination,
+                is_selected=lambda name: (
+                    is_selected is None or
+                    name == self.MANIFEST_FILENAME or
+                    is_selected(name)
+                ),
+                callback=callback,
+            )
+
+    def extract_selected(self, archive_fp, destination, is_selected,
+                         callback=None):
+        """
+        Extract the selected members of an archive in their order.
+
+        Arguments:
+            archive_fp (tarfile.TarFile): The archive object opened in a reading mode.
+            destination (Path): Directory where to extract archive files.
+            is_selected (function): Function which takes a member name and returns
+                True if member is to be extracted.
+
+        Keyword Arguments:
+            callback (function): Function called with the path of each extracted
+                file once it has been extracted.
+        """
+        members = (
+            tarinfo
+            for tarinfo in archive_fp
+            if is_selected(tarinfo.name)
+        )
+
+        if callback is None:
+            archive_fp.extractall(destination, members=members)
+            return
+
+        for tarinfo in members:
+            archive_fp.extract(tarinfo, destination)
+            if tarinfo.isfile():
+                callback(destination / tarinfo.name)
+
+    def write_manifest(self, destination, content, callback=None):
+        """
+        Write manifest content read from an archive.
+
+        Arguments:
+            destination (Path): Directory where to write manifest file.
+            content (bytes): Manifest content.
+
+        Keyword Arguments:
+            callback (function): Function called with the manifest path once it has
+                been written.
+        """
+        path = destination / self.MANIFEST_FILENAME
+        path.write_bytes(content)
+
+        if callback:
+            callback(path)
+
+    def extract_members(self, archive_fp, destination, with_data=True,
+                        with_storages=True, data_exclusions=None, callback=None):
+        """
+        Extract archive files required for a load while reading archive members in
+        their order.
+
+        Manifest must be the first archive member (after the index with the
+        ``indexed`` layout) so members are selected as soon as they are read. Archive
+        is read only once so this works with an archive opened as a stream. With the
+        ``sections`` layout, only the sections of enabled loadings are extracted.
+
+        Arguments:
+            archive_fp (tarfile.TarFile): The archive object opened in a reading mode
+                with no member read yet.
+            destination (Path): Directory where to extract archive files.
+
+        Keyword Arguments:
+            with_data (boolean): Extract data dumps.
+            with_storages (boolean): Extract storages.
+            data_exclusions (list): List of dump filenames which are not extracted.
+            callback (function): Function called with the path of each extracted
+                file once it has been extracted, starting with the manifest.
+
+        Returns:
+            boolean: True if archive files have been extracted, else the manifest is
+            not the first archive member and nothing has been extracted.
+        """
+        first = archive_fp.next()
+        if first is not None and first.name == ARCHIVE_INDEX_FILENAME:
+            first = archive_fp.next()
+
+        if first is None or first.name != self.MANIFEST_FILENAME:
+            return False
+
+        content = archive_fp.extractfile(first).read()
+        self.write_manifest(destination, content, callback=callback)
+        manifest = self.parse_manifest(content.decode("utf-8"))
+        is_selected = self.get_extraction_filter(
+            manifest,
+            with_data=with_data,
+            with_storages=with_storages,
+            data_exclusions=data_exclusions,
+        )
+
+        sections = manifest.get("sections")
+        if not sections:
+            self.extract_selected(
+                archive_fp,
+                destination,
+                is_selected,
+                callback=callback,
+            )
+            return True
+
+        names = []
+        if with_data and sections.get("data"):
+            names.append(sections["data"])
+        if with_storages and sections.get("storages"):
+            names.extend(sections["storages"].values())
+
+        for tarinfo in archive_fp:
+            if tarinfo.name not in names:
+                continue
+
+            self.logger.debug("Extracting archive section: {}".format(tarinfo.name))
+            with open_archive_reader(archive_fp.extractfile(tarinfo)) as section_fp:
+                self.extract_selected(
+                    section_fp,
+                    destination,
+                    is_selected,
+                    callback=callback,
+                )
+
+        return True
+
+    def extract_stream(self, fileobj, destination, checksum=None, with_data=True,
+                       with_storages=True, data_exclusions=None, callback=None):
+        """
+        Extract archive files required for a load from a stream, like the standard
+        input.
+
+        Archive is read once as a stream, see ``Loader.extract_members``, so its
+        manifest must be its first member. The stream is checksumed while it is read.
+
+        Arguments:
+            fileobj (object): Binary file object to read archive from.
+            destination (Path): Directory where to extract archive files.
+
+        Keyword Arguments:
+            checksum (object): Manage if archive is checksumed or not, see
+                ``Loader.open``.
+            with_data (boolean): Extract data dumps.
+            with_storages (boolean): Extract storages.
+            data_exclusions (list): List of dump filenames which are not extracted.
+            callback (function): Function called with the path of each extracted
+                file once it has been extracted, starting with the manifest.
+        """
+        stream = hashs.ChecksumStream(fileobj)
+
+        with open_archive_reader(stream) as archive_fp:
+            extracted = self.extract_members(
+                archive_fp,
+                destination,
+                with_data=with_data,
+                with_storages=with_storages,
+                data_exclusions=data_exclusions,
+                callback=callback,
+            )
+
+        if not extracted:
+            self.logger.critical(
+                "Archive read from a stream must start with its manifest file "
+                "'manifest.json'"
+            )
+
+        if checksum is not False:
+            # Checksum the remaining end of stream after the archive end
+            stream.drain()
+            self.archive_checksum = stream.hexdigest()
+            self.check_checksum(self.archive_checksum, checksum)
+
     def get_manifest(self, path):
         """
         Search for manifest file in given path, validate it and return it.
@@ -168,8 +1201,57 @@ class Loader(StorageMixin, LoaddataSerializerAbstract):
                 "'manifest.json'"
             )
 
+        return self.parse_manifest(manifest_path.read_text())
+
+    def get_archive_manifest(self, archive):
+        """
+        Read manifest file from an archive without extracting it, validate it and
+        return it.
+
+        With an archive from the ``indexed`` layout, only the index and the manifest
+        are read. Else archive members are read until the manifest is found.
+
+        Arguments:
+            archive (Path): Path object to the archive file.
+
+        Returns:
+            dict: The manifest data.
+        """
+        content = None
+
+        index = ArchiveIndex.read(archive)
+        if index is not None and self.MANIFEST_FILENAME in index:
+            content = index.read_member(self.MANIFEST_FILENAME)
+        else:
+            with open_archive_reader(archive) as archive_fp:
+                for tarinfo in archive_fp:
+                    if tarinfo.name == self.MANIFEST_FILENAME:
+                        content = archive_fp.extractfile(tarinfo).read()
+                        break
+
+        if content is None:
+            self.logger.critical(
+                "Dump archive is invalid, it does not include manifest file "
+                "'manifest.json'"
+            )
+
+        return self.parse_manifest(content.decode("utf-8"))
+
+    def parse_manifest(self, content):
+        """
+        Parse manifest content and validate it.
+
+        This raises an exception if manifest is invalid, the used exception class will
+        depends from used logger.
+
+        Arguments:
+            content (string): Manifest JSON content.
+
+        Returns:
+            dict: The manifest data.
+        """
         try:
-            manifest = json.loads(manifest_path.read_text())
+            manifest = json.loads(content)
         except json.JSONDecodeError as e:
             self.logger.critical(
                 "Dump archive is invalid, included manifest file has invalid JSON "
@@ -223,7 +1305,8 @@ class Loader(StorageMixin, LoaddataSerializerAbstract):
         self.validate_datas()
         self.validate_storages()
 
-    def deploy_storages(self, archive_dir, manifest, destination):
+    def deploy_storages(self, archive_dir, manifest, destination, ledger=None,
+                        copy=False):
         """
         Deploy storages directories in given destination.
 
@@ -236,6 +1319,13 @@ class Loader(StorageMixin, LoaddataSerializerAbstract):
             manifest (dict): The manifest data.
             destination (Path): Path to directory where to deploy storages.
 
+        Keyword Arguments:
+            ledger (LoadLedger): If given, a storage is not deployed when it has
+                already been deployed from the same content and its destination has
+                not changed since. Deployed storages are recorded into the ledger.
+            copy (boolean): If enabled, storages are copied instead of being moved
+                so the extracted archive is left untouched.
+
         Returns:
             list: List of tuples for deployed storage with respectively source and
                 destination paths.
@@ -246,6 +1336,21 @@ class Loader(StorageMixin, LoaddataSerializerAbstract):
             storage_source = archive_dir / dump_path
             storage_destination = destination / dump_path
 
+            fingerprint = None
+            if ledger:
+                fingerprint = hashs.directory_fingerprint(storage_source)
+                if (
+                    ledger.is_storage_loaded(str(dump_path), fingerprint) and
+                    storage_destination.exists() and
+                    hashs.directory_fingerprint(storage_destination) == fingerprint
+                ):
+                    self.logger.info(
+                        "Ignored storage '{}' because it has not changed".format(
+                            dump_path
+                        )
+                    )
+                    continue
+
             # Create complete destination path structure if needed
             if not storage_destination.parent.exists():
                 self.logger.debug(
@@ -264,26 +1369,41 @@ class Loader(StorageMixin, LoaddataSerializerAbstract):
                 )
                 shutil.rmtree(storage_destination)
 
-            # Move storage dump to destination
+            # Move or copy storage dump to destination
             self.logger.info(
                 "Restoring storage directory ({}): {}".format(
                     filesizeformat(directory_size(storage_source)),
                     dump_path
                 )
             )
-            shutil.move(storage_source, storage_destination)
+            if copy:
+                shutil.copytree(storage_source, storage_destination)
+            else:
+                shutil.move(storage_source, storage_destination)
+
+            if ledger:
+                ledger.record_storage(str(dump_path), fingerprint)
 
             deployed.append((storage_source, storage_destination))
 
         return deployed
 
-    def check_data_dump(self, dump, excludes):
+    def check_data_dump(self, dump, excludes, ledger=None):
         """
         Check if data dump is to be loaded or not.
 
         When dump is not to be loaded, a INFO log message will be output.
 
-        This check dump file against filename exclusions and minimal file size.
+        This check dump file against filename exclusions, minimal file size and
+        the ledger if any.
+
+        Arguments:
+            dump (Path): The dump file path.
+            excludes (list): List of dump filenames to exclude from loading.
+
+        Keyword Arguments:
+            ledger (LoadLedger): If given, a dump which has already been loaded with
+                the same checksum is not loaded.
 
         Returns:
             boolean: True if dump is to be loaded, else False.
@@ -303,10 +1423,159 @@ class Loader(StorageMixin, LoaddataSerializerAbstract):
             ))
             return False
 
+        if ledger and ledger.is_data_loaded(dump):
+            self.logger.info(
+                "Ignored dump '{}' because it has not changed".format(dump.name)
+            )
+            return False
+
         return True
 
+    def get_data_dependencies(self, archive_dir, dumps):
+        """
+        Build the dependency graph of data dumps.
+
+        A dump depends on a previous dump from the list if one of its models has a
+        relation to a model from the previous dump. Only previous dumps are
+        considered so the dump order stays the fallback and there can not be any
+        cycle. A dump which models can not be determined (because of its format)
+        depends on every previous dump and every next dump depends on it.
+
+        Arguments:
+            archive_dir (Path): Path to directory where archive has been exracted.
+            dumps (list): List of dump paths relative to ``archive_dir``.
+
+        Returns:
+            list: A set of dump indexes for each dump, the dumps it depends on.
+        """
+        models = [get_fixture_models(archive_dir / dump) for dump in dumps]
+        relations = [
+            set().union(*[get_related_models(model) for model in items])
+            if items is not None else None
+            for items in models
+        ]
+
+        return [
+            {
+                previous
+                for previous in range(index)
+                if (
+                    models[index] is None or
+                    models[previous] is None or
+                    relations[index] & models[previous]
+                )
+            }
+            for index in range(len(dumps))
+        ]
+
+    def can_load_parallel(self):
+        """
+        Check if database allows to load data dumps concurrently.
+
+        SQLite only allows a single writer at once and an in memory database can not
+        be shared between processes.
+
+        Returns:
+            boolean: True if database allows concurrent loading.
+        """
+        return connections[DEFAULT_DB_ALIAS].vendor != "sqlite"
+
+    def deploy_datas_parallel(self, jobs, archive_dir, dumps, ignorenonexistent=False,
+                              engine=None, batch_size=None, ledger=None):
+        """
+        Load data dumps from a pool of worker processes.
+
+        Each worker opens its own database connection. A dump is loaded as soon as
+        every dump it depends on has been loaded, see ``get_data_dependencies``.
+        Messages from workers are output in the same order than dumps once all loads
+        are done.
+
+        Arguments:
+            jobs (integer): Maximum number of worker processes.
+            archive_dir (Path): Path to directory where archive has been exracted.
+            dumps (list): List of dump paths relative to ``archive_dir`` to load.
+
+        Keyword Arguments:
+            ignorenonexistent (boolean): If true, fields and models that does not
+                exists in current models will be ignored instead of raising an error.
+            engine (string): Load engine name.
+            batch_size (integer): Number of objects to insert at once with the
+                ``bulk`` engine.
+            ledger (LoadLedger): If given, each loaded dump is recorded into the
+                ledger.
+
+        Raises:
+            LoaderError: When a load has failed in a worker.
+
+        Returns:
+            list: List of tuples for deployed dumps with respectively source and
+                loaddata output.
+        """
+        if not dumps:
+            return []
+
+        dependencies = self.get_data_dependencies(archive_dir, dumps)
+        jobs = min(jobs, len(dumps))
+        self.logger.info(
+            "Loading data with {} worker processes".format(jobs)
+        )
+
+        results = {}
+        running = {}
+        executor = get_process_pool(
+            jobs,
+            initializer=_load_worker_initializer,
+            initargs=(self,),
+        )
+        try:
+            while len(results) < len(dumps):
+                # Submit every dump which dependencies have been loaded
+                for index, dump in enumerate(dumps):
+                    if (
+                        index not in results and
+                        index not in running.values() and
+                        dependencies[index].issubset(results)
+                    ):
+                        future = executor.submit(
+                            _load_worker,
+                            archive_dir / dump,
+                            ignorenonexistent=ignorenonexistent,
+                            engine=engine,
+                            batch_size=batch_size,
+                        )
+                        running[future] = index
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    index = running.pop(future)
+                    try:
+                        results[index] = future.result()
+                        if ledger:
+                            ledger.record_data(archive_dir / dumps[index])
+                    except Exception as e:
+                        raise LoaderError(
+                            "Data dump '{name}' loading has failed: {error}".format(
+                                name=dumps[index].name,
+                                error=e,
+                            )
+                        ) from e
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+        deployed = []
+        for index, dump in enumerate(dumps):
+            content, records = results[index]
+
+            for level, msg in records:
+                getattr(self.logger, level)(msg)
+
+            deployed.append((dump.name, content))
+
+        return deployed
+
     def deploy_datas(self, archive_dir, manifest, excludes=None,
-                     ignorenonexistent=False):
+                     ignorenonexistent=False, engine=None, batch_size=None, jobs=None,
+                     ledger=None):
         """
         Deploy storages directories in given destination
 
@@ -321,32 +1590,295 @@ class Loader(StorageMixin, LoaddataSerializerAbstract):
             ignorenonexistent (boolean): If true, fields and models that does not
                 exists in current models will be ignored instead of raising an error.
                 This is false on default
+            engine (string): Load engine name, either ``loaddata`` to save objects
+                one by one with Django ``loaddata`` or ``bulk`` to insert them in
+                batches. Default to ``loaddata``.
+            batch_size (integer): Number of objects to insert at once with the
+                ``bulk`` engine.
+            jobs (integer): Number of worker processes to load dumps concurrently
+                following their dependencies. If empty or lower than 2, dumps are
+                loaded sequentially. This is ignored if database does not support
+                it, see ``can_load_parallel``.
+            ledger (LoadLedger): If given, dumps which have already been loaded with
+                the same checksum are not loaded and loaded dumps are recorded into
+                the ledger.
 
         Returns:
             list: List of tuples for deployed dumps with respectively source and
                 loaddata output.
         """
         excludes = excludes or []
+        parallel = jobs and jobs > 1
 
-        return [
-            (
-                dump.name,
-                self.call(archive_dir / dump, ignorenonexistent=ignorenonexistent)
+        if parallel and not self.can_load_parallel():
+            self.logger.warning(
+                "Database does not support concurrent loading, data dumps are loaded "
+                "sequentially."
             )
-            for dump in manifest["datas"]
-            if self.check_data_dump(archive_dir / dump, excludes)
-        ]
+            parallel = False
+
+        if parallel:
+            return self.deploy_datas_parallel(
+                jobs,
+                archive_dir,
+                [
+                    dump
+                    for dump in manifest["datas"]
+                    if self.check_data_dump(archive_dir / dump, excludes, ledger=ledger)
+                ],
+                ignorenonexistent=ignorenonexistent,
+                engine=engine,
+                batch_size=batch_size,
+                ledger=ledger,
+            )
+
+        deployed = []
+        for dump in manifest["datas"]:
+            if self.check_data_dump(archive_dir / dump, excludes, ledger=ledger):
+                deployed.append((
+                    dump.name,
+                    self.call(
+                        archive_dir / dump,
+                        ignorenonexistent=ignorenonexistent,
+                        engine=engine,
+                        batch_size=batch_size,
+                    )
+                ))
+
+                if ledger:
+                    ledger.record_data(archive_dir / dump)
+
+        return deployed
+
+    def deploy_pipelined(self, archive, storages_destination, data_exclusions=None,
+                         with_data=True, with_storages=True,
+                         ignorenonexistent_data=False, engine=None, batch_size=None,
+                         ledger=None, **options):
+        """
+        Load archive and deploy its content while archive is extracted.
+
+        Archive is extracted from a background thread which hands every extracted
+        file over to the loading stage through a bounded queue. Each data dump is
+        loaded as soon as it has been extracted, in the manifest order, while the
+        next archive members (like the storages) are still extracted. Storages are
+        deployed once the extraction is over. So the restoration time is close to
+        the longest of extraction and data loading instead of their sum.
+
+        Arguments:
+            archive (Path or string or object): The tarball archive to open and
+                extract dumps, see ``Loader.deploy``.
+            storages_destination (Path): Destination where to deploy all storage
+                directories.
+
+        Keyword Arguments:
+            data_exclusions (list): List of dump filenames to exclude from loading.
+            with_data (boolean): Enable application datas loading.
+            with_storages (boolean): Enabled media storages loading.
+            ignorenonexistent_data (boolean): If true, fields and models that does not
+                exists in current models will be ignored instead of raising an error.
+            engine (string): Load engine name for datas, see ``deploy_datas``.
+            batch_size (integer): Number of objects to insert at once with the
+                ``bulk`` engine.
+            ledger (LoadLedger): If given, unchanged dumps and storages are not
+                loaded, see ``deploy_datas`` and ``deploy_storages``.
+            **options: Other keyword arguments are given to ``Loader.open``.
+
+        Raises:
+            LoaderError: When a data dump from manifest has not been extracted.
+
+        Returns:
+            dict: Statistics of deployed storages and datas.
+        """
+        excludes = data_exclusions or []
+        tmpdir = Path(tempfile.mkdtemp(prefix=self.TEMPDIR_PREFIX))
+        manifest_path = tmpdir / self.MANIFEST_FILENAME
+
+        extracted = queue.Queue(maxsize=DEFAULT_PIPELINE_QUEUE_SIZE)
+        aborted = threading.Event()
+        errors = []
+
+        def handover(path):
+            if aborted.is_set():
+                raise LoaderError("Archive extraction has been aborted")
+
+            extracted.put(path)
+
+        def extract():
+            try:
+                self.open(
+                    archive,
+                    destination=tmpdir,
+                    with_data=with_data,
+                    with_storages=with_storages,
+                    data_exclusions=data_exclusions,
+                    callback=handover,
+                    **options
+                )
+            except BaseException as e:
+                errors.append(e)
+            finally:
+                # Always mark the end of extraction
+                extracted.put(None)
+
+        worker = threading.Thread(target=extract, name="diskette-extract")
+        worker.start()
+
+        # Extracted files are kept until the manifest is known, then only the
+        # expected data dumps are kept
+        state = {"finished": False, "ready": set(), "expected": None}
+
+        def wait_for(path):
+            while path not in state["ready"] and not state["finished"]:
+                item = extracted.get()
+                if item is None:
+                    state["finished"] = True
+                elif state["expected"] is None or item in state["expected"]:
+                    state["ready"].add(item)
+
+            return path in state["ready"]
+
+        stats = {}
+        try:
+            if wait_for(manifest_path):
+                manifest = self.get_manifest(tmpdir)
+
+                dumps = []
+                for dump in manifest["datas"] if with_data else []:
+                    if dump.name in excludes:
+                        # Only output exclusion, excluded dumps are not extracted
+                        self.check_data_dump(tmpdir / dump, excludes)
+                    else:
+                        dumps.append(dump)
+
+                state["expected"] = {tmpdir / dump for dump in dumps}
+                state["ready"] &= state["expected"]
+
+                if with_data:
+                    stats["datas"] = []
+
+                for dump in dumps:
+                    if not wait_for(tmpdir / dump):
+                        break
+
+                    if self.check_data_dump(tmpdir / dump, excludes, ledger=ledger):
+                        stats["datas"].append((
+                            dump.name,
+                            self.call(
+                                tmpdir / dump,
+                                ignorenonexistent=ignorenonexistent_data,
+                                engine=engine,
+                                batch_size=batch_size,
+                            )
+                        ))
+
+                        if ledger:
+                            ledger.record_data(tmpdir / dump)
+
+            # Wait for the end of extraction
+            wait_for(None)
+            worker.join()
+
+            if errors:
+                raise errors[0]
+
+            # Manifest is always read once extraction is over since it may be
+            # missing from archive
+            manifest = self.get_manifest(tmpdir)
+
+            missing = (state["expected"] or set()) - state["ready"]
+            if missing:
+                raise LoaderError(
+                    "Data dump '{}' has not been extracted from archive.".format(
+                        sorted(missing)[0].name
+                    )
+                )
+
+            if with_storages:
+                stats["storages"] = self.deploy_storages(
+                    tmpdir,
+                    manifest,
+                    storages_destination,
+                    ledger=ledger,
+                )
+        except BaseException:
+            aborted.set()
+            raise
+        finally:
+            # Let extraction end if it is still running
+            state["expected"] = set()
+            wait_for(None)
+            worker.join()
+
+            if tmpdir.exists():
+                shutil.rmtree(tmpdir)
+
+        return stats
+
+    def get_database_identity(self):
+        """
+        Get a value which identifies the default database and changes when it is
+        recreated, even under the same name.
+
+        Identity is made of the database name and the date of its earliest applied
+        migration, which is reset when database is dropped then migrated again.
+
+        Returns:
+            string: The database identity.
+        """
+        connection = connections[DEFAULT_DB_ALIAS]
+        recorder = MigrationRecorder(connection)
+
+        created = None
+        if recorder.has_table():
+            created = recorder.migration_qs.order_by("applied").values_list(
+                "applied", flat=True
+            ).first()
+
+        return "{name}@{created}".format(
+            name=connection.settings_dict["NAME"],
+            created=created.isoformat() if created else "",
+        )
+
+    def get_load_ledger(self, storages_destination):
+        """
+        Get the ledger of what has been loaded into the default database.
+
+        Ledger is bound to the database identity (see
+        ``Loader.get_database_identity``) so a recreated database is loaded again.
+
+        Ledger file path is the one from setting ``DISKETTE_LOAD_LEDGER_PATH`` else
+        ``.diskette_ledger.json`` into the storages destination.
+
+        Arguments:
+            storages_destination (Path): Destination where storages are deployed.
+
+        Returns:
+            LoadLedger: The ledger.
+        """
+        path = settings.DISKETTE_LOAD_LEDGER_PATH
+        if not path:
+            path = Path(storages_destination) / ".diskette_ledger.json"
+
+        return LoadLedger(Path(path), database=self.get_database_identity())
 
     def deploy(self, archive, storages_destination, data_exclusions=None,
                with_data=True, with_storages=True, download_destination=None,
-               keep=False, checksum=None, ignorenonexistent_data=False):
+               keep=False, checksum=None, ignorenonexistent_data=False,
+               engine=None, batch_size=None, jobs=None, pipeline=False,
+               if_changed=False):
         """
         Load archive and deploy its content.
 
+        When the extraction cache is enabled (see ``Loader.get_extraction_cache``),
+        a local or downloaded archive is extracted once into the cache then the next
+        loads of the same archive are deployed from the cached directory, see
+        ``Loader.open_cached``. Pipelined deploy is not available in this case.
+
         Arguments:
-            archive (Path or string): The tarball archive to open and extract dumps. It
-                may be either a Path to a local archive file or a string for an URL
-                to download the archive.
+            archive (Path or string or object): The tarball archive to open and
+                extract dumps. It may be either a Path to a local archive file, a
+                string for an URL to download the archive or a binary file object to
+                read the archive as a stream.
             storages_destination (Path): Destination where to deploy all storage
                 directories.
 
@@ -371,37 +1903,203 @@ class Loader(StorageMixin, LoaddataSerializerAbstract):
             ignorenonexistent_data (boolean): If true, fields and models that does not
                 exists in current models will be ignored instead of raising an error.
                 This is false on default
+            engine (string): Load engine name for datas, see ``deploy_datas``.
+            batch_size (integer): Number of objects to insert at once with the
+                ``bulk`` engine.
+            jobs (integer): Number of worker processes to load data dumps
+                concurrently, see ``deploy_datas``. This is ignored with a pipelined
+                deploy.
+            pipeline (boolean): If enabled, data dumps are loaded while archive is
+                extracted, see ``Loader.deploy_pipelined``.
+            if_changed (boolean): If enabled, only the archive contents which have
+                changed since the previous load are loaded, see ``LoadLedger``. The
+                whole load is skipped when the same archive has already been loaded
+                with at least the same contents. Archive checksum is required to
+                record the archive so it can not be disabled with a stream.
+
+        Returns:
+            dict: Statistics of deployed storages and datas. It is empty if the load
+            has been skipped.
+        """
+        ledger = None
+        extraction_cache = None
+        is_stream = hasattr(archive, "read")
+        scope = {
+            "with_data": with_data,
+            "with_storages": with_storages,
+            "data_exclusions": data_exclusions,
+        }
+        self.archive_checksum = None
+
+        if if_changed:
+            ledger = self.get_load_ledger(storages_destination)
+
+        # A stream is checksumed while it is extracted so it can not be found from
+        # extraction cache and only its contents can be skipped
+        if not is_stream:
+            extraction_cache = self.get_extraction_cache()
+        elif ledger and checksum is False:
+            self.logger.warning(
+                "Checksum can not be disabled when loading only changed contents "
+                "from a stream."
+            )
+            checksum = None
+
+        # Archive checksum is required before extraction to find archive from
+        # ledger or extraction cache
+        if (ledger and not is_stream) or extraction_cache:
+            archive, archive_checksum, is_cached = self.get_archive(
+                archive,
+                download_destination=download_destination,
+            )
+            self.archive_checksum = archive_checksum or hashs.file_checksum(archive)
+            self.check_checksum(self.archive_checksum, checksum)
+            # Archive has already been checksumed
+            checksum = False
+            keep = keep or is_cached
+
+            if ledger and ledger.is_archive_loaded(self.archive_checksum, **scope):
+                self.logger.info("Archive has already been loaded, nothing to do")
+                if not keep:
+                    archive.unlink()
+
+                return {}
+
+        if ledger:
+            ledger.start_archive()
+
+        if pipeline and extraction_cache:
+            self.logger.warning(
+                "Pipelined deploy is not available with the extraction cache, option "
+                "'pipeline' is ignored."
+            )
+            pipeline = False
+
+        if pipeline:
+            if jobs and jobs > 1:
+                self.logger.warning(
+                    "Pipelined deploy loads data dumps sequentially, option 'jobs' "
+                    "is ignored."
+                )
+
+            stats = self.deploy_pipelined(
+                archive,
+                storages_destination,
+                data_exclusions=data_exclusions,
+                with_data=with_data,
+                with_storages=with_storages,
+                ignorenonexistent_data=ignorenonexistent_data,
+                engine=engine,
+                batch_size=batch_size,
+                ledger=ledger,
+                download_destination=download_destination,
+                keep=keep,
+                checksum=checksum,
+            )
+        else:
+            stats = self.deploy_extracted(
+                archive,
+                storages_destination,
+                data_exclusions=data_exclusions,
+                with_data=with_data,
+                with_storages=with_storages,
+                download_destination=download_destination,
+                keep=keep,
+                checksum=checksum,
+                ignorenonexistent_data=ignorenonexistent_data,
+                engine=engine,
+                batch_size=batch_size,
+                jobs=jobs,
+                ledger=ledger,
+                extraction_cache=extraction_cache,
+            )
+
+        if ledger:
+            ledger.record_archive(self.archive_checksum, **scope)
+
+        return stats
+
+    def deploy_extracted(self, archive, storages_destination, data_exclusions=None,
+                         with_data=True, with_storages=True, download_destination=None,
+                         keep=False, checksum=None, ignorenonexistent_data=False,
+                         engine=None, batch_size=None, jobs=None, ledger=None,
+                         extraction_cache=None):
+        """
+        Extract archive then deploy its content.
+
+        Arguments:
+            archive (Path or string or object): The tarball archive to open and
+                extract dumps, see ``Loader.deploy``.
+            storages_destination (Path): Destination where to deploy all storage
+                directories.
+
+        Keyword Arguments:
+            data_exclusions (list): List of dump filenames to exclude from loading.
+            with_data (boolean): Enable application datas loading.
+            with_storages (boolean): Enabled media storages loading.
+            download_destination (Path): A path where to write downloaded archive
+                file, see ``Loader.open``.
+            keep (boolean): Archive won't be removed from filesystem if True.
+            checksum (object): Manage if archive is checksumed or not, see
+                ``Loader.open``.
+            ignorenonexistent_data (boolean): If true, fields and models that does not
+                exists in current models will be ignored instead of raising an error.
+            engine (string): Load engine name for datas, see ``deploy_datas``.
+            batch_size (integer): Number of objects to insert at once with the
+                ``bulk`` engine.
+            jobs (integer): Number of worker processes to load data dumps
+                concurrently, see ``deploy_datas``.
+            ledger (LoadLedger): If given, unchanged dumps and storages are not
+                loaded, see ``deploy_datas`` and ``deploy_storages``.
+            extraction_cache (diskette.utils.cache.ExtractionCache): If given, the
+                archive is extracted into this cache or found from it, see
+                ``Loader.open_cached``. Archive must be a local file which has
+                already been checksumed.
 
         Returns:
             dict: Statistics of deployed storages and datas.
         """
-        tmpdir = self.open(
-            archive,
-            download_destination=download_destination,
-            keep=keep,
-            checksum=checksum,
-        )
+        if extraction_cache:
+            extracted = self.open_cached(archive, extraction_cache, keep=keep)
+        else:
+            extracted = nullcontext(self.open(
+                archive,
+                download_destination=download_destination,
+                keep=keep,
+                checksum=checksum,
+                with_data=with_data,
+                with_storages=with_storages,
+                data_exclusions=data_exclusions,
+            ))
 
         stats = {}
-        try:
-            manifest = self.get_manifest(tmpdir)
-
-            if with_storages:
-                stats["storages"] = self.deploy_storages(
-                    tmpdir,
-                    manifest,
-                    storages_destination,
-                )
+        with extracted as tmpdir:
+            try:
+                manifest = self.get_manifest(tmpdir)
+
+                if with_storages:
+                    stats["storages"] = self.deploy_storages(
+                        tmpdir,
+                        manifest,
+                        storages_destination,
+                        ledger=ledger,
+                        copy=extraction_cache is not None,
+                    )
 
-            if with_data:
-                stats["datas"] = self.deploy_datas(
-                    tmpdir,
-                    manifest,
-                    excludes=data_exclusions,
-                    ignorenonexistent=ignorenonexistent_data,
-                )
-        finally:
-            if tmpdir.exists():
-                shutil.rmtree(tmpdir)
+                if with_data:
+                    stats["datas"] = self.deploy_datas(
+                        tmpdir,
+                        manifest,
+                        excludes=data_exclusions,
+                        ignorenonexistent=ignorenonexistent_data,
+                        engine=engine,
+                        batch_size=batch_size,
+                        jobs=jobs,
+                        ledger=ledger,
+                    )
+            finally:
+                # Cached directory is kept for the next loads
+                if not extraction_cache and tmpdir.exists():
+                    shutil.rmtree(tmpdir)
 
         return stats
@@ -8,7 +8,6 @@ from django.utils import timezone
 from ..choices import STATUS_CREATED, STATUS_PROCESSED
 from ..core.handlers import DumpCommandHandler
 from ..models import DumpFile
-from ..utils import hashs
 
 
 def post_dump_save_process(obj):
@@ -62,14 +61,11 @@ def post_dump_save_process(obj):
             check=False,
         )
 
-        # Get the created dump checksum
-        archive_checksum = hashs.file_checksum(archive_file)
-
         # Update object to fill data related to processed dump
         obj.path = str(archive_file.relative_to(archive_destination))
         obj.size = archive_file.stat().st_size
         obj.processed = dump_processed
-        obj.checksum = archive_checksum
+        obj.checksum = dumper.checksum
         obj.status = STATUS_PROCESSED
         obj.logs = dummystream.getvalue()
         obj.save(update_fields=[
@@ -0,0 +1,350 @@
+from contextlib import contextmanager
+
+from django.core import serializers
+from django.core.management.color import no_style
+from django.db import DEFAULT_DB_ALIAS, connections, router, transaction
+
+from ..defaults import DEFAULT_LOAD_BATCH_SIZE
+from . import jsonstream
+
+
+@contextmanager
+def raw_field_values(model):
+    """
+    Temporarily disable automatic date values of model fields.
+
+    Bulk inserts are not performed in raw mode like ``Model.save_base`` from
+    ``loaddata``, so fields with ``auto_now`` or ``auto_now_add`` would override the
+    values from fixture.
+
+    Arguments:
+        model (django.db.models.Model): Model class.
+    """
+    fields = [
+        (field, field.auto_now, field.auto_now_add)
+        for field in model._meta.local_concrete_fields
+        if getattr(field, "auto_now", False) or getattr(field, "auto_now_add", False)
+    ]
+
+    for field, auto_now, auto_now_add in fields:
+        field.auto_now = field.auto_now_add = False
+
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in fields:
+            field.auto_now = auto_now
+            field.auto_now_add = auto_now_add
+
+
+class BulkInserter:
+    """
+    Load engine which inserts fixture objects in batches instead of saving them one
+    by one like Django ``loaddata``.
+
+    Deserialized objects are grouped by model and inserted with ``bulk_create``
+    for each batch. An object which already exists with the same primary key is
+    updated alike ``loaddata``, within the bulk insert when database supports
+    conflict updates else it is saved on its own. Many to many relations of a batch
+    are collected and inserted in batches once the batch objects have been inserted,
+    then database sequences are reset once for all loaded models.
+
+    JSON fixtures are read with a streaming deserializer which yields objects while
+    reading the file, so memory usage depends on batch size and not on fixture size.
+
+    Loading is done in a single transaction with constraint checks disabled, they are
+    checked once everything has been inserted.
+
+    .. Note::
+        Models with multi-table inheritance and objects without primary key (from
+        natural primary keys) are still saved one by one. Since bulk inserts do not
+        send model signals, ``pre_save``, ``post_save`` and ``m2m_changed`` signals
+        are not sent.
+
+    Keyword Arguments:
+        batch_size (integer): Number of objects to insert at once. Default to
+            ``DEFAULT_LOAD_BATCH_SIZE``.
+        database (string): Database alias where to load objects.
+        ignorenonexistent (boolean): If true, fields and models that does not exists
+            in current models will be ignored instead of raising an error.
+        app (string): Application label. If given, only objects from this
+            application will be loaded.
+        excludes (list): A list of application or FQM labels to ignore from loaded
+            data.
+    """
+    def __init__(self, batch_size=None, database=None, ignorenonexistent=False,
+                 app=None, excludes=None):
+        self.batch_size = batch_size or DEFAULT_LOAD_BATCH_SIZE
+        self.database = database or DEFAULT_DB_ALIAS
+        self.ignorenonexistent = ignorenonexistent
+        self.app = app
+        self.excludes = [item.lower() for item in excludes or []]
+
+        self.connection = connections[self.database]
+        self.batch = []
+        self.m2m = {}
+        self.deferred = []
+        self.models = set()
+        self.loaded = 0
+        self.found = 0
+
+    def get_format(self, path):
+        """
+        Get serialization format from fixture file extension.
+
+        Arguments:
+            path (Path): Fixture file path.
+
+        Returns:
+            string: Format name.
+
+        Raises:
+            ValueError: If format is not a known serialization format.
+        """
+        format = path.suffix[1:]
+
+        if format not in serializers.get_public_serializer_formats():
+            raise ValueError(
+                "{} is not a known serialization format.".format(format)
+            )
+
+        return format
+
+    def is_allowed(self, model):
+        """
+        Check if objects from a model are to be loaded.
+
+        Arguments:
+            model (django.db.models.Model): Model class.
+
+        Returns:
+            boolean: True if model is allowed by database router and not filtered out
+            from application or exclusions.
+        """
+        if self.app and model._meta.app_label != self.app:
+            return False
+
+        if (
+            model._meta.app_label.lower() in self.excludes or
+            model._meta.label_lower in self.excludes
+        ):
+            return False
+
+        return router.allow_migrate_model(self.database, model)
+
+    def get_conflict_options(self, model):
+        """
+        Get ``bulk_create`` options to update objects which already exist.
+
+        Arguments:
+            model (django.db.models.Model): Model class.
+
+        Returns:
+            dict: Options depending on database features, it is empty if database
+            (or Django before 4.1) does not support conflict updates. Objects which
+            already exist are then saved one by one, see ``BulkInserter.flush``.
+        """
+        features = self.connection.features
+        update_fields = [
+            field.name
+            for field in model._meta.local_concrete_fields
+            if not field.primary_key
+        ]
+
+        if not getattr(features, "supports_update_conflicts", False):
+            return {}
+
+        if not update_fields:
+            return {"ignore_conflicts": True}
+
+        options = {
+            "update_conflicts": True,
+            "update_fields": update_fields,
+        }
+        if features.supports_update_conflicts_with_target:
+            options["unique_fields"] = [model._meta.pk.name]
+
+        return options
+
+    def get_existing_pks(self, model, pks):
+        """
+        Get the primary keys which already exist in database.
+
+        Arguments:
+            model (django.db.models.Model): Model class.
+            pks (list): Primary keys to look for.
+
+        Returns:
+            set: Primary keys from given ones which exist in database.
+        """
+        return set(model._base_manager.using(self.database).in_bulk(pks))
+
+    def flush(self):
+        """
+        Insert objects from current batch.
+        """
+        if not self.batch:
+            return
+
+        model = self.batch[0].object.__class__
+        self.models.add(model)
+
+        conflict_options = self.get_conflict_options(model)
+
+        if model._meta.parents:
+            singles, bulk = self.batch, []
+        else:
+            singles = [item for item in self.batch if item.object.pk is None]
+            bulk = [item for item in self.batch if item.object.pk is not None]
+
+        # Without conflict updates, objects which already exist are updated one by
+        # one alike loaddata
+        if bulk and not conflict_options:
+            existing = self.get_existing_pks(model, [item.object.pk for item in bulk])
+            singles += [item for item in bulk if item.object.pk in existing]
+            bulk = [item for item in bulk if item.object.pk not in existing]
+
+        if bulk:
+            with raw_field_values(model):
+                model._base_manager.using(self.database).bulk_create(
+                    [item.object for item in bulk],
+                    batch_size=self.batch_size,
+                    **conflict_options
+                )
+
+        for item in singles:
+            item.save(save_m2m=False, using=self.database)
+
+        self.batch = []
+        self.insert_m2m()
+
+    def add(self, deserialized):
+        """
+        Add a deserialized object to the current batch.
+
+        Batch is inserted when it is full or when object model is different from the
+        batch one.
+
+        Arguments:
+            deserialized (django.core.serializers.base.DeserializedObject): Object to
+                load.
+        """
+        model = deserialized.object.__class__
+
+        if self.batch and (
+            len(self.batch) >= self.batch_size or
+            self.batch[0].object.__class__ is not model
+        ):
+            self.flush()
+
+        self.batch.append(deserialized)
+        self.loaded += 1
+
+        for name, values in (deserialized.m2m_data or {}).items():
+            self.m2m.setdefault((model, name), []).append(
+                (deserialized.object, values)
+            )
+
+        if deserialized.deferred_fields:
+            self.deferred.append(deserialized)
+
+    def insert_m2m(self):
+        """
+        Insert collected many to many relations of the current batch.
+
+        Alike related manager ``set`` method used by ``loaddata``, previous relations
+        of loaded objects are removed before.
+        """
+        for (model, name), items in self.m2m.items():
+            field = model._meta.get_field(name)
+            through = field.remote_field.through
+            source = through._meta.get_field(field.m2m_field_name())
+            target = through._meta.get_field(field.m2m_reverse_field_name())
+            manager = through._base_manager.using(self.database)
+
+            pks = [obj.pk for obj, values in items]
+            for i in range(0, len(pks), self.batch_size):
+                manager.filter(**{
+                    source.name + "__in": pks[i:i + self.batch_size]
+                }).delete()
+
+            manager.bulk_create(
+                [
+                    through(**{source.attname: obj.pk, target.attname: value})
+                    for obj, values in items
+                    for value in values
+                ],
+                batch_size=self.batch_size,
+            )
+
+        self.m2m = {}
+
+    def reset_sequences(self):
+        """
+        Reset database sequences for all loaded models.
+        """
+        statements = self.connection.ops.sequence_reset_sql(
+            no_style(),
+            list(self.models)
+        )
+
+        if statements:
+            with self.connection.cursor() as cursor:
+                for line in statements:
+                    cursor.execute(line)
+
+    def load_fixture(self, path):
+        """
+        Deserialize a fixture file and add its objects to batches.
+
+        Arguments:
+            path (Path): Fixture file path.
+        """
+        format = self.get_format(path)
+        options = {
+            "using": self.database,
+            "ignorenonexistent": self.ignorenonexistent,
+            "handle_forward_references": True,
+        }
+
+        with path.open("r") as fp:
+            if format == "json":
+                objects = jsonstream.Deserializer(fp, **options)
+            else:
+                objects = serializers.deserialize(format, fp, **options)
+
+            for deserialized in objects:
+                self.found += 1
+
+                if self.is_allowed(deserialized.object.__class__):
+                    self.add(deserialized)
+
+        self.flush()
+
+    def load(self, paths):
+        """
+        Load fixture files in database.
+
+        Arguments:
+            paths (list): Fixture file paths to load in this order.
+
+        Returns:
+            tuple: Respectively the number of loaded objects and the number of found
+            objects from fixtures.
+        """
+        with transaction.atomic(using=self.database):
+            with self.connection.constraint_checks_disabled():
+                for path in paths:
+                    self.load_fixture(path)
+
+                for deserialized in self.deferred:
+                    deserialized.save_deferred_fields(using=self.database)
+
+            self.connection.check_constraints(
+                table_names=[model._meta.db_table for model in self.models]
+            )
+
+            if self.loaded:
+                self.reset_sequences()
+
+        return self.loaded, self.found
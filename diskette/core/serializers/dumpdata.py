@@ -2,10 +2,12 @@ import json
 from pathlib import Path
 from io import StringIO
 
+from django.conf import settings
 from django.core import management
 from django.template.defaultfilters import filesizeformat
 
 from ...utils.loggers import NoOperationLogger
+from ...utils.streams import ChunkedWriter
 
 
 class DumpdataSerializerAbstract:
@@ -22,8 +24,9 @@ class DumpdataSerializerAbstract:
         """
         Return effective command name to use.
 
-        Either the application defines a custom command or this will be the default one
-        from ``DumpdataSerializerAbstract.COMMAND_NAME``.
+        Either the application defines a custom command, or it defines dump tuning
+        options and it will be the Diskette dump command, else this will be the default
+        one from ``DumpdataSerializerAbstract.COMMAND_NAME``.
 
         Arguments:
             application (ApplicationConfig): Application object.
@@ -31,12 +34,18 @@ class DumpdataSerializerAbstract:
         Returns:
             string: Command name.
         """
-        return getattr(application, "dump_command", None) or self.COMMAND_NAME
+        return (
+            getattr(application, "effective_dump_command", None) or
+            self.COMMAND_NAME
+        )
 
     def command(self, application, destination=None, indent=None):
         """
         Build a command line to use ``dumpdata``.
 
+        Application partitions are ignored here since their primary key ranges can
+        only be computed when dumping, the command dumps the whole model table.
+
         Arguments:
             application (ApplicationConfig): Application object.
 
@@ -70,6 +79,15 @@ class DumpdataSerializerAbstract:
                 for item in application.excludes
             ]))
 
+        if application.chunk_size:
+            options.append("--chunk-size={}".format(application.chunk_size))
+
+        if application.pagination:
+            options.append("--pagination={}".format(application.pagination))
+
+        if application.serializer:
+            options.append("--serializer={}".format(application.serializer))
+
         if destination:
             options.append("--output={}".format(
                 str(Path(destination) / application.filename)
@@ -85,7 +103,7 @@ class DumpdataSerializerAbstract:
         )
 
     def call(self, application, destination=None, indent=None, traceback=False,
-             check=False):
+             check=False, stream=None, shard=None):
         """
         Programmatically use the Django ``dumpdata`` command to dump application.
 
@@ -99,12 +117,23 @@ class DumpdataSerializerAbstract:
                 a dump raise an error. On default this is disabled and Django will
                 silently hide exception tracebacks.
             check (boolean): Perform operations without writing or querying anything.
+            stream (object): A text file object where to directly write dumped data.
+                Serialized records are written in chunks of the size from setting
+                ``DISKETTE_DUMP_CHUNK`` so the dump is never buffered entirely in
+                memory. This has no effect if ``destination`` is given.
+            shard (tuple): To dump only a partition of application model. This is a
+                tuple of the shard position (starting from ``1``), the first primary
+                key of shard (included) and the last one (excluded). Both primary keys
+                may be ``None`` to leave a range unbounded. Dump is written with the
+                shard filename.
 
         Returns:
             string: A JSON payload of call results. On default, this is the JSON
                 output from dumpdata. However if destination has been given, dumpdata
                 has written output to a file and so the returned JSON will just be a
-                dictionnary with an item ``destination`` with written file path.
+                dictionnary with an item ``destination`` with written file path. And
+                if a stream has been given, the returned JSON is a dictionnary with an
+                item ``stream`` with the dump filename.
         """
         options = application.as_options()
 
@@ -131,7 +160,34 @@ class DumpdataSerializerAbstract:
         if traceback:
             options["traceback"] = True
 
+        # Dump tuning options are only passed when defined since they are not
+        # supported by Django dumpdata
+        if application.chunk_size:
+            options["chunk_size"] = application.chunk_size
+
+        if application.pagination:
+            options["pagination"] = application.pagination
+
+        if application.serializer:
+            options["serializer"] = application.serializer
+
+        if shard:
+            index, pk_from, pk_to = shard
+            filename = application.get_shard_filename(index)
+            if destination:
+                options["output"] = destination / filename
+            if pk_from is not None:
+                options["pk_from"] = pk_from
+            if pk_to is not None:
+                options["pk_to"] = pk_to
+
         self.logger.info("Dumping data for application '{}'".format(application.name))
+        if shard:
+            self.logger.debug("- Shard {index}/{total}: {filename}".format(
+                index=shard[0],
+                total=application.partitions,
+                filename=filename,
+            ))
         if models:
             self.logger.debug("- Including: {}".format(", ".join(models)))
         if excludes:
@@ -140,8 +196,12 @@ class DumpdataSerializerAbstract:
         if check:
             return {"models": models, "options": options}
 
-        # Execute command without output guided to string buffer
-        out = StringIO()
+        # Output is guided to the given stream if any, else to a string buffer
+        if stream is not None and not destination:
+            out = ChunkedWriter(stream, chunk_size=settings.DISKETTE_DUMP_CHUNK)
+        else:
+            out = StringIO()
+
         management.call_command(
             self.get_command_name(application),
             models,
@@ -160,6 +220,11 @@ class DumpdataSerializerAbstract:
             ))
             return json.dumps({"destination": str(application._written)})
 
+        # Dump has been written into the given stream
+        if isinstance(out, ChunkedWriter):
+            out.flush()
+            return json.dumps({"stream": filename})
+
         # No destination to write just write it into the string buffer
         content = out.getvalue()
         out.close()
@@ -0,0 +1,85 @@
+"""
+JSON serializer with a streaming deserializer.
+
+Serializer is the Django JSON one and the deserializer yields objects while reading
+the fixture instead of decoding it entirely in memory like the Django one. This module
+can be registered as the JSON serialization module of a project so ``loaddata`` uses
+it: ::
+
+    SERIALIZATION_MODULES = {
+        "json": "diskette.core.serializers.jsonstream",
+    }
+
+Diskette already registers it during its own ``loaddata`` calls, see
+``as_json_module``.
+"""
+import io
+from contextlib import contextmanager
+
+from django.core import serializers
+from django.core.serializers.base import DeserializationError
+from django.core.serializers.json import Serializer  # noqa: F401
+from django.core.serializers.python import Deserializer as PythonDeserializer
+
+from ...utils.streams import JSONArrayReader
+
+
+def Deserializer(stream_or_string, **options):
+    """
+    Deserialize a stream or string of JSON data one object at a time.
+
+    Arguments:
+        stream_or_string (object): Either a text or binary file object or a string.
+
+    Keyword Arguments:
+        **options: Options given to Django Python deserializer.
+
+    Returns:
+        generator: Deserialized objects.
+    """
+    if isinstance(stream_or_string, bytes):
+        stream_or_string = stream_or_string.decode()
+
+    if isinstance(stream_or_string, str):
+        stream = io.StringIO(stream_or_string)
+    elif isinstance(stream_or_string.read(0), bytes):
+        stream = io.TextIOWrapper(stream_or_string, encoding="utf-8")
+    else:
+        stream = stream_or_string
+
+    try:
+        yield from PythonDeserializer(JSONArrayReader(stream), **options)
+    except (GeneratorExit, DeserializationError):
+        raise
+    except Exception as exc:
+        raise DeserializationError() from exc
+
+
+@contextmanager
+def as_json_module():
+    """
+    Register this module as the JSON serialization module for the context duration,
+    so Django ``loaddata`` deserializes JSON fixtures with the streaming
+    deserializer.
+
+    Django serializer registry is looked up at each deserialization, the previous
+    registration is restored once the context is left. A JSON module from project
+    setting ``SERIALIZATION_MODULES`` is left untouched since it may have its own
+    behaviors.
+    """
+    # Ensure the registry is filled with modules from Django and settings
+    serializers.get_serializer_formats()
+    previous = serializers._serializers.get("json")
+
+    if previous is not None and previous.__name__ != "django.core.serializers.json":
+        yield
+        return
+
+    serializers.register_serializer("json", __name__)
+    try:
+        yield
+    finally:
+        if previous is None:
+            serializers.unregister_serializer("json")
+        else:
+            serializers._serializers["json"] = previous
@@ -1,9 +1,12 @@
+from contextlib import nullcontext
 from io import StringIO
 
 from django.core import management
 from django.template.defaultfilters import filesizeformat
 
 from ...utils.loggers import NoOperationLogger
+from ..defaults import LOAD_ENGINE_COMMAND
+from . import jsonstream
 
 
 class LoaddataSerializerAbstract:
@@ -14,9 +17,27 @@ class LoaddataSerializerAbstract:
     For now, this is JSON format only, 'format' option may be implemented later.
     """
     COMMAND_NAME = "loaddata"
-    COMMAND_TEMPLATE = "{executable}loaddata {options}"
+    COMMAND_TEMPLATE = "{executable}{cmd} {options}"
 
-    def command(self, dump, app=None, excludes=None, ignorenonexistent=False):
+    def get_command_name(self, engine=None):
+        """
+        Return effective command name to use.
+
+        Keyword Arguments:
+            engine (string): Load engine name. The ``bulk`` engine uses the Diskette
+                load command, any other value uses the default one from
+                ``LoaddataSerializerAbstract.COMMAND_NAME``.
+
+        Returns:
+            string: Command name.
+        """
+        if engine == "bulk":
+            return LOAD_ENGINE_COMMAND
+
+        return self.COMMAND_NAME
+
+    def command(self, dump, app=None, excludes=None, ignorenonexistent=False,
+                engine=None, batch_size=None):
         """
         Build command line to use ``loaddata``.
 
@@ -30,6 +51,10 @@ class LoaddataSerializerAbstract:
                 loaded data.
             ignorenonexistent (boolean): If enabled, fields and models that does not
                 exists in current models will be ignored instead of raising an error.
+            engine (string): Load engine name, either ``loaddata`` or ``bulk``.
+                Default to ``loaddata``.
+            batch_size (integer): Number of objects to insert at once with the
+                ``bulk`` engine. It is ignored by ``loaddata`` engine.
 
         Returns:
             string: Command line to run a loaddata job.
@@ -48,16 +73,25 @@ class LoaddataSerializerAbstract:
                 for item in excludes
             ]))
 
+        if engine == "bulk" and batch_size:
+            options.append("--batch-size={}".format(batch_size))
+
         return self.COMMAND_TEMPLATE.format(
             executable=self.executable,
+            cmd=self.get_command_name(engine),
             dump=dump,
             options=" ".join(options),
         )
 
-    def call(self, dump, app=None, excludes=None, ignorenonexistent=False):
+    def call(self, dump, app=None, excludes=None, ignorenonexistent=False,
+             engine=None, batch_size=None):
         """
         Programmatically use the Django ``loaddata`` command to dump application.
 
+        JSON fixtures are read with the streaming deserializer from
+        ``diskette.core.serializers.jsonstream`` with both engines, so memory usage
+        does not depend on fixture size.
+
         Arguments:
             dump (Path): Path to the dump file to load.
 
@@ -69,6 +103,10 @@ class LoaddataSerializerAbstract:
             ignorenonexistent (boolean): If true, fields and models that does not
                 exists in current models will be ignored instead of raising an error.
                 This is false on default
+            engine (string): Load engine name, either ``loaddata`` or ``bulk``.
+                Default to ``loaddata``.
+            batch_size (integer): Number of objects to insert at once with the
+                ``bulk`` engine. It is ignored by ``loaddata`` engine.
 
         Returns:
             string: Output from command.
@@ -79,12 +117,24 @@ class LoaddataSerializerAbstract:
             "exclude": excludes or [],
         }
 
+        if engine == "bulk" and batch_size:
+            options["batch_size"] = batch_size
+
         self.logger.info("Loading data from dump '{path}' ({size})".format(
             path=dump.name,
             size=filesizeformat(dump.stat().st_size)))
 
+        # The bulk engine always uses the streaming deserializer
+        streaming = jsonstream.as_json_module() if engine != "bulk" else nullcontext()
+
         out = StringIO()
-        management.call_command(self.COMMAND_NAME, dump, stdout=out, **options)
+        with streaming:
+            management.call_command(
+                self.get_command_name(engine),
+                dump,
+                stdout=out,
+                **options
+            )
 
         content = out.getvalue()
         out.close()
@@ -0,0 +1,229 @@
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.encoding import is_protected_type
+
+from ...utils.querysets import get_m2m_fields, iterate_chunks
+
+
+class AttributeSetter:
+    """
+    Minimal object with a single attribute, this is used to give a raw value to field
+    methods which expect a model object.
+
+    Arguments:
+        name (string): Attribute name.
+        value (object): Attribute value.
+    """
+    def __init__(self, name, value):
+        setattr(self, name, value)
+
+
+class ValuesSerializer:
+    """
+    Fast serializer which writes model objects as fixtures without to instanciate
+    them.
+
+    Rows are read from querysets with ``values_list`` and encoded straight into the
+    same JSON structure and layout than Django ``json`` and ``jsonl`` serializers, so
+    the output can be loaded with ``loaddata``. Many to many relations are read with
+    a single query for each chunk of rows.
+
+    Natural keys are not supported since they require model objects.
+
+    Keyword Arguments:
+        format (string): Output format, either ``json`` or ``jsonl``. Default is
+            ``json``.
+        indent (integer): Indentation level for ``json`` format.
+        chunk_size (integer): Number of rows to fetch at once from database.
+        pagination (string): Pagination mode to iterate over rows, see
+            ``diskette.utils.querysets.iterate_queryset``.
+
+    Attributes:
+        FORMATS (tuple): Supported output formats.
+    """
+    FORMATS = ("json", "jsonl")
+
+    def __init__(self, format="json", indent=None, chunk_size=None,
+                 pagination=None):
+        if format not in self.FORMATS:
+            raise ValueError(
+                "Values serializer does not support format: {}".format(format)
+            )
+
+        self.format = format
+        self.indent = indent if format == "json" else None
+        self.chunk_size = chunk_size
+        self.pagination = pagination
+
+        # Same encoding options than Django JSON serializers
+        self.json_kwargs = {
+            "cls": DjangoJSONEncoder,
+            "ensure_ascii": False,
+        }
+        if self.indent:
+            self.json_kwargs["indent"] = self.indent
+        if self.indent or self.format == "jsonl":
+            self.json_kwargs["separators"] = (",", ": ")
+
+    def get_value(self, field, value):
+        """
+        Convert a raw value for a field alike Django Python serializer.
+
+        Arguments:
+            field (django.db.models.Field): Field object.
+            value (object): Raw value from database.
+
+        Returns:
+            object: Protected types (like None, numbers, dates and Decimals) are
+            returned as is, all other values are converted to string.
+        """
+        if is_protected_type(value):
+            return value
+
+        return field.value_to_string(AttributeSetter(field.attname, value))
+
+    def get_fields(self, model):
+        """
+        Returns serializable fields for a model.
+
+        Arguments:
+            model (django.db.models.Model): Model class.
+
+        Returns:
+            tuple: A list of local fields and a list of many to many fields. Many to
+            many fields with a custom through model are ignored, alike Django
+            serializers.
+        """
+        fields = [
+            field
+            for field in model._meta.concrete_model._meta.local_fields
+            if field.serialize
+        ]
+
+        return fields, get_m2m_fields(model)
+
+    def get_m2m_values(self, field, pks, database=None):
+        """
+        Get related primary keys of a many to many field for some objects.
+
+        Related primary keys are ordered like the related model ordering, alike
+        related managers.
+
+        Arguments:
+            field (django.db.models.ManyToManyField): Many to many field.
+            pks (list): Primary keys of objects to get related values.
+
+        Keyword Arguments:
+            database (string): Database alias to query.
+
+        Returns:
+            dict: Lists of related primary keys indexed on object primary key.
+        """
+        through = field.remote_field.through
+        source = field.m2m_field_name()
+        target = field.m2m_reverse_field_name()
+        target_pk = field.remote_field.model._meta.pk
+
+        ordering = [
+            "{}{}__{}".format(
+                "-" if item.startswith("-") else "",
+                target,
+                item.lstrip("-"),
+            )
+            for item in field.remote_field.model._meta.ordering
+            if isinstance(item, str) and item != "?"
+        ]
+
+        rows = through._base_manager.db_manager(database).filter(
+            **{source + "__in": pks}
+        ).order_by(
+            *ordering + ["pk"]
+        ).values_list(source, target)
+
+        values = {pk: [] for pk in pks}
+        for pk, related_pk in rows:
+            values[pk].append(self.get_value(target_pk, related_pk))
+
+        return values
+
+    def iterate_objects(self, queryset):
+        """
+        Iterate over queryset rows to build dump objects.
+
+        Arguments:
+            queryset (django.db.models.QuerySet): Queryset to dump.
+
+        Returns:
+            generator: Dump object dictionnaries alike the ones from Django Python
+            serializer.
+        """
+        model = queryset.model
+        label = str(model._meta)
+        pk_field = model._meta.pk
+        fields, m2m_fields = self.get_fields(model)
+
+        rows = queryset.values_list("pk", *[field.attname for field in fields])
+
+        for chunk in iterate_chunks(
+            rows,
+            chunk_size=self.chunk_size,
+            pagination=self.pagination,
+            pk_index=0
+        ):
+            pks = [row[0] for row in chunk]
+            m2m_values = [
+                (field, self.get_m2m_values(field, pks, database=queryset.db))
+                for field in m2m_fields
+            ]
+
+            for row in chunk:
+                data = {
+                    field.name: self.get_value(field, value)
+                    for field, value in zip(fields, row[1:])
+                }
+                for field, values in m2m_values:
+                    data[field.name] = values[row[0]]
+
+                yield {
+                    "model": label,
+                    "pk": self.get_value(pk_field, row[0]),
+                    "fields": data,
+                }
+
+    def serialize(self, querysets, stream):
+        """
+        Serialize querysets to a stream.
+
+        Arguments:
+            querysets (list): Querysets to serialize, each one is dumped in order.
+            stream (object): Text file object where to write output.
+        """
+        first = True
+
+        if self.format == "json":
+            stream.write("[")
+
+        for queryset in querysets:
+            for data in self.iterate_objects(queryset):
+                if self.format == "json":
+                    if not first:
+                        stream.write(",")
+                        if not self.indent:
+                            stream.write(" ")
+                    if self.indent:
+                        stream.write("\n")
+
+                json.dump(data, stream, **self.json_kwargs)
+
+                if self.format == "jsonl":
+                    stream.write("\n")
+
+                first = False
+
+        if self.format == "json":
+            if self.indent:
+                stream.write("\n")
+            stream.write("]")
+            if self.indent:
+                stream.write("\n")
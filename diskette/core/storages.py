@@ -86,18 +86,19 @@ class StorageMixin:
 
         return True
 
-    def iter_storages_files(self, allow_excludes=True):
+    def iter_storages_files(self, allow_excludes=True, storages=None):
         """
         Iterate over all storages files.
 
         Keyword Arguments:
             allow_excludes (boolean): To enable storage content exclusion using
                 defined exclusion patterns. Default value enables it.
+            storages (list): Storage paths to iterate instead of all storages.
 
         Returns:
             iterator: Iterator for all storages files.
         """
-        for storage in self.storages:
+        for storage in self.storages if storages is None else storages:
             # Recursively walk through storage path
             for root, dirs, files in os.walk(storage):
                 base = Path(root)
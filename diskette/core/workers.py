@@ -0,0 +1,72 @@
+"""
+Helpers to run jobs in a pool of worker processes.
+
+Workers are forked from the current process so they inherit the Django setup and
+every object from parent (like a dumper or loader instance) without to pickle them.
+"""
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from django.db import connections
+
+
+# Keep references of inherited database connections from forked workers. They must
+# never be closed or garbage collected from a worker since it would terminate the
+# session of parent process which share the same socket.
+_INHERITED_CONNECTIONS = []
+
+
+def reset_worker_connections():
+    """
+    Detach database connections inherited from parent process so a worker will open
+    its own connections on its first query.
+
+    Connections to an in-memory SQLite database are kept as is since such a database
+    can not be opened again, the forked connection is the only way to reach it.
+    """
+    for connection in connections.all():
+        if connection.connection is None:
+            continue
+
+        if connection.vendor == "sqlite" and connection.is_in_memory_db():
+            continue
+
+        _INHERITED_CONNECTIONS.append(connection.connection)
+        connection.connection = None
+
+
+def _worker_initializer(initializer, initargs):
+    """
+    Initialize a worker process.
+
+    Arguments:
+        initializer (callable): Custom initializer to call after connections reset.
+        initargs (tuple): Arguments to give to custom initializer.
+    """
+    reset_worker_connections()
+
+    if initializer is not None:
+        initializer(*initargs)
+
+
+def get_process_pool(jobs, initializer=None, initargs=()):
+    """
+    Build a process pool executor with forked workers.
+
+    Arguments:
+        jobs (integer): Maximum number of worker processes.
+
+    Keyword Arguments:
+        initializer (callable): A callable to execute in each worker once started.
+        initargs (tuple): Arguments to give to initializer. Since workers are forked,
+            these arguments are not pickled.
+
+    Returns:
+        concurrent.futures.ProcessPoolExecutor: The pool executor.
+    """
+    return ProcessPoolExecutor(
+        max_workers=jobs,
+        mp_context=multiprocessing.get_context("fork"),
+        initializer=_worker_initializer,
+        initargs=(initializer, initargs),
+    )
@@ -58,6 +58,13 @@ class DumperError(DisketteBaseException):
     pass
 
 
+class LoaderError(DisketteBaseException):
+    """
+    For an error from load manager.
+    """
+    pass
+
+
 class ApplicationRegistryError(DisketteBaseException):
     """
     For an error during validation of application model objects.
@@ -6,9 +6,9 @@ from django.core.management.base import BaseCommand
 
 from ...exceptions import ApplicationRegistryError
 from ...choices import STATUS_PROCESSED
+from ...core.defaults import AVAILABLE_LAYOUTS
 from ...core.handlers import DumpCommandHandler
 from ...models import DumpFile
-from ...utils import hashs
 from ...utils.loggers import DjangoCommandOutput
 
 
@@ -38,10 +38,70 @@ class Command(BaseCommand, DumpCommandHandler):
             default=None,
             help=(
                 "Custom archive filename to use for this dump. This is only the "
-                "filename, don't include directory path here. Your filename must ends "
-                "with 'tar.gz'."
+                "filename, don't include directory path here. Its archive extension "
+                "is replaced with the one from compression codec."
             )
         )
+        parser.add_argument(
+            "--output",
+            type=str,
+            metavar="PATH",
+            default=None,
+            help=(
+                "Stream the archive to this file path as it is produced, without any "
+                "temporary archive. Use '-' to stream it to the standard output, "
+                "command messages are then written to the standard error. Options "
+                "'--destination', '--filename' and '--jobs' are ignored and layout "
+                "'indexed' is not allowed."
+            )
+        )
+        parser.add_argument(
+            "--compression",
+            type=str,
+            metavar="CODEC",
+            default=None,
+            help=(
+                "Compression codec for the archive, either 'gzip', 'bz2', 'xz', 'zstd' "
+                "or 'none'. Codec may be followed by a compression level like "
+                "'gzip:6'. Codec 'zstd' requires the package 'zstandard'. Default to "
+                "the value from setting 'DISKETTE_DUMP_COMPRESSION'."
+            )
+        )
+        parser.add_argument(
+            "--compression-threads",
+            type=int,
+            metavar="N",
+            default=None,
+            help=(
+                "Number of threads to compress a 'gzip' archive as blocks of a "
+                "multi-member gzip file. Use 1 to compress in a single stream. "
+                "Default to the value from setting 'DISKETTE_DUMP_COMPRESSION_THREADS' "
+                "or the number of available CPUs."
+            )
+        )
+        parser.add_argument(
+            "--store-incompressible",
+            action="store_true",
+            default=None,
+            help=(
+                "Store storage files that are not compressible (like images, videos or "
+                "zip files) without compression in a 'gzip' archive. Default to the "
+                "value from setting 'DISKETTE_DUMP_STORE_INCOMPRESSIBLE'."
+            ),
+        )
+        parser.add_argument(
+            "--layout",
+            choices=AVAILABLE_LAYOUTS,
+            default=None,
+            help=(
+                "Archive layout. With 'sections', data and each storage are compressed "
+                "on their own in an uncompressed '.tar' archive so they can be loaded "
+                "separately. With 'indexed', every member is compressed on its own "
+                "and an index of their positions is at the front of the archive, it "
+                "requires the 'gzip' compression. Default to the value from setting "
+                "'DISKETTE_DUMP_LAYOUT'."
+            ),
+        )
         parser.add_argument(
             "--appconf",
             type=Path,
@@ -85,6 +145,26 @@ class Command(BaseCommand, DumpCommandHandler):
             type=int,
             help="Specifies the indent level to use when pretty-printing output.",
         )
+        parser.add_argument(
+            "--jobs",
+            type=int,
+            metavar="N",
+            default=None,
+            help=(
+                "Number of worker processes to dump application data concurrently. "
+                "Each worker uses its own database connection. On default "
+                "applications are dumped sequentially."
+            ),
+        )
+        parser.add_argument(
+            "--streaming",
+            action="store_true",
+            help=(
+                "Stream application data dumps straight into the archive through "
+                "spooled buffers instead of writing them into a temporary directory. "
+                "This is incompatible with option '--jobs'."
+            ),
+        )
         parser.add_argument(
             "--no-data",
             action="store_true",
@@ -138,6 +218,10 @@ class Command(BaseCommand, DumpCommandHandler):
         )
 
     def handle(self, *args, **options):
+        # Keep the standard output for the archive only
+        if options["output"] == "-":
+            self.stdout = self.stderr
+
         with StringIO() as msg_buffer:
             self.logger = DjangoCommandOutput(
                 command=self,
@@ -149,11 +233,12 @@ class Command(BaseCommand, DumpCommandHandler):
                 if (
                     options["check"] or
                     options["no_archive"] or
+                    options["output"] or
                     not settings.DISKETTE_ADMIN_ENABLED
                 ):
                     self.logger.critical(
                         "The option '--save' is incompatible with options '--check', "
-                        "'--no-archive' and disabled admin from setting "
+                        "'--no-archive', '--output' and disabled admin from setting "
                         "'DISKETTE_ADMIN_ENABLED'."
                     )
 
@@ -172,6 +257,13 @@ class Command(BaseCommand, DumpCommandHandler):
                         no_storages_excludes=options["no_storages_excludes"],
                         indent=options["indent"],
                         check=options["check"],
+                        jobs=options["jobs"],
+                        streaming=options["streaming"],
+                        compression=options["compression"],
+                        compression_threads=options["compression_threads"],
+                        store_incompressible=options["store_incompressible"],
+                        layout=options["layout"],
+                        output=options["output"],
                     )
                 else:
                     self.stdout.write(
@@ -203,7 +295,7 @@ class Command(BaseCommand, DumpCommandHandler):
                         deprecated=False,
                         path=str(archive_file.relative_to(destination)),
                         size=archive_file.stat().st_size,
-                        checksum=hashs.file_checksum(archive_file),
+                        checksum=self.checksum,
                         status=STATUS_PROCESSED,
                         logs=self.logger.msg_buffer.getvalue(),
                     )
@@ -0,0 +1,423 @@
+from pathlib import Path
+
+from django.conf import settings
+from django.core import serializers
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, router
+
+from ...core.applications.store import get_appstore
+from ...core.defaults import AVAILABLE_PAGINATIONS, AVAILABLE_SERIALIZERS
+from ...core.serializers.values import ValuesSerializer
+from ...utils.naturalkeys import NaturalKeyCache
+from ...utils.querysets import iterate_chunks, prefetch_m2m_chunks
+from ...utils.streams import ChunkedWriter
+
+
+class Command(BaseCommand):
+    """
+    A command alike Django's dumpdata with options to tune the way model objects are
+    fetched from database.
+
+    Model objects are iterated either with a queryset iterator where the number of
+    rows fetched at once can be defined (with PostgreSQL this is a named server side
+    cursor) or with a keyset pagination which walks over primary key ranges with
+    short queries so no cursor is kept opened during the whole dump.
+
+    Attributes:
+        NOT_IMPLEMENTED (tuple): Option destination names that are not supported by
+            command. They are still present but will raise a NotImplementedError when
+            used.
+        FORMATS (tuple): Supported serialization formats. If empty, every format
+            registered in Django serializers is supported.
+    """
+    NOT_IMPLEMENTED = tuple()
+    FORMATS = tuple()
+
+    help = (
+        "Output the contents of the database as a fixture of the given format. This "
+        "is an alternative to Django command 'dumpdata' with options to tune the "
+        "iteration over model objects. The argument signatures are identical but not "
+        "all legacy options are implemented here."
+    )
+
+    def get_help(self, text, dest):
+        """
+        Append a notice to argument help if it is not implemented.
+        """
+        if dest in self.NOT_IMPLEMENTED:
+            return text + " NOT IMPLEMENTED."
+
+        return text
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "args",
+            metavar="app_label[.ModelName]",
+            nargs="*",
+            help=(
+                "Restricts dumped data to the specified app_label or "
+                "app_label.ModelName."
+            ),
+        )
+        parser.add_argument(
+            "--format",
+            default="json",
+            help=(
+                "Specifies the output serialization format for fixtures. Only '{}' "
+                "format is implemented.".format("', '".join(self.FORMATS))
+                if self.FORMATS else
+                "Specifies the output serialization format for fixtures."
+            ),
+        )
+        parser.add_argument(
+            "--indent",
+            type=int,
+            help="Specifies the indent level to use when pretty-printing output.",
+        )
+        parser.add_argument(
+            "--database",
+            default=DEFAULT_DB_ALIAS,
+            help=self.get_help(
+                "Nominates a specific database to dump fixtures from. "
+                'Defaults to the "default" database.',
+                "database"
+            ),
+        )
+        parser.add_argument(
+            "-e",
+            "--exclude",
+            action="append",
+            default=[],
+            help="An app_label or app_label.ModelName to exclude "
+            "(use multiple --exclude to exclude multiple apps/models).",
+        )
+        parser.add_argument(
+            "--natural-foreign",
+            action="store_true",
+            dest="use_natural_foreign_keys",
+            help="Use natural foreign keys if they are available.",
+        )
+        parser.add_argument(
+            "--natural-primary",
+            action="store_true",
+            dest="use_natural_primary_keys",
+            help="Use natural primary keys if they are available.",
+        )
+        parser.add_argument(
+            "-a",
+            "--all",
+            action="store_true",
+            dest="use_base_manager",
+            help=(
+                "Use Django's base manager to dump all models stored in the database, "
+                "including those that would otherwise be filtered or modified by a "
+                "custom manager."
+            ),
+        )
+        parser.add_argument(
+            "--pks",
+            dest="primary_keys",
+            help=self.get_help(
+                "Only dump objects with given primary keys. Accepts a comma-separated "
+                "list of keys. This option only works when you specify one model.",
+                "primary_keys"
+            ),
+        )
+        parser.add_argument(
+            "-o",
+            "--output",
+            type=Path,
+            help="Specifies file to which the output is written."
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            help=(
+                "Number of objects to fetch at once from database. Default to 2000."
+            ),
+        )
+        parser.add_argument(
+            "--pagination",
+            choices=AVAILABLE_PAGINATIONS,
+            default="cursor",
+            help=(
+                "Define how model objects are iterated. 'cursor' uses a queryset "
+                "iterator which is a server side cursor with PostgreSQL and 'keyset' "
+                "walks over primary key ranges with a query for each chunk."
+            ),
+        )
+        parser.add_argument(
+            "--serializer",
+            choices=AVAILABLE_SERIALIZERS,
+            default="django",
+            help=(
+                "Define the serializer to use. 'django' uses the Django serializer "
+                "of given format and 'values' uses a faster serializer which reads "
+                "raw row values without to instanciate model objects, it only "
+                "supports 'json' and 'jsonl' formats and no natural keys."
+            ),
+        )
+        parser.add_argument(
+            "--pk-from",
+            help=(
+                "Only dump objects with a primary key greater than or equal to the "
+                "given one. This option only works when you specify one model."
+            ),
+        )
+        parser.add_argument(
+            "--pk-to",
+            help=(
+                "Only dump objects with a primary key lower than the given one. This "
+                "option only works when you specify one model."
+            ),
+        )
+
+    def get_queryset(self, model, use_base_manager=False, database=None):
+        """
+        Returns the queryset to dump objects for a model.
+
+        Alike Django dumpdata, objects are ordered on primary key.
+
+        Arguments:
+            model (django.db.models.Model): Model to get queryset for.
+
+        Keyword Arguments:
+            use_base_manager (boolean): Use the builtin base model manager instead of
+                a possible custom one.
+            database (string): Database alias to use.
+
+        Returns:
+            django.db.models.QuerySet: The queryset.
+        """
+        if use_base_manager:
+            objects = model._base_manager
+        else:
+            objects = model._default_manager
+
+        return objects.using(database or DEFAULT_DB_ALIAS).order_by(
+            model._meta.pk.name
+        )
+
+    def get_models(self, labels, excludes=None, use_natural_foreign_keys=False,
+                   database=None):
+        """
+        Resolve model labels to the model list to dump.
+
+        Arguments:
+            labels (list): List of application or model labels to include. If empty,
+                every model is included except the ones created automatically.
+
+        Keyword Arguments:
+            excludes (list): List of application or model labels to exclude.
+            use_natural_foreign_keys (boolean): If enabled, models are ordered on
+                their dependencies.
+            database (string): Database alias used to check router allows models.
+
+        Returns:
+            list: List of model objects.
+        """
+        # Use diskette appstore to resolve labels
+        appstore = get_appstore()
+        exclusions = appstore.get_models_inclusions(excludes or [])
+        inclusions = appstore.get_models_inclusions(
+            labels or appstore.get_all_model_labels(),
+            excludes=[item.label for item in exclusions]
+        )
+
+        inclusions = [
+            item
+            for item in inclusions
+            if (
+                not item.object._meta.proxy and
+                (labels or not item.object._meta.auto_created) and
+                router.allow_migrate_model(database or DEFAULT_DB_ALIAS, item.object)
+            )
+        ]
+
+        if use_natural_foreign_keys:
+            # Alike legacy Django dumpdata, we sort models on dependencies when natural
+            # foreign key option is enabled
+            # 'sort_dependencies' requires a list of tuple '(AppConfig, model object)'
+            # so we need to pack model list
+            return serializers.sort_dependencies([
+                (appstore.get_app(item.app), [item.object])
+                for item in inclusions
+            ], allow_cycles=True)
+
+        # This is a list of nodes, we need to turn them to model objects
+        return [item.object for item in inclusions]
+
+    def export_models(self, inclusions, output, format="json", indent=None,
+                      use_natural_foreign_keys=False, use_natural_primary_keys=False,
+                      use_base_manager=False, database=None, primary_keys=None,
+                      chunk_size=None, pagination=None, pk_from=None, pk_to=None,
+                      serializer="django"):
+        """
+        Exports serialized model contents to output.
+
+        Records are serialized one by one from model querysets and written to
+        output in chunks of the size from setting ``DISKETTE_DUMP_CHUNK``. Objects
+        are fetched by chunks and their many to many relations are fetched once for
+        each chunk. With natural foreign keys, related objects are fetched once for
+        each chunk and memorized for the whole run.
+        """
+        def get_querysets():
+            for model in inclusions:
+                queryset = self.get_queryset(
+                    model,
+                    use_base_manager=use_base_manager,
+                    database=database,
+                )
+
+                if primary_keys:
+                    queryset = queryset.filter(pk__in=primary_keys)
+
+                if pk_from is not None:
+                    queryset = queryset.filter(pk__gte=pk_from)
+
+                if pk_to is not None:
+                    queryset = queryset.filter(pk__lt=pk_to)
+
+                yield queryset
+
+        def get_objects():
+            # Related objects for natural foreign keys are memorized for the whole run
+            natural_keys = NaturalKeyCache() if use_natural_foreign_keys else None
+
+            for queryset in get_querysets():
+                chunks = iterate_chunks(
+                    queryset,
+                    chunk_size=chunk_size,
+                    pagination=pagination,
+                )
+
+                if natural_keys is not None:
+                    chunks = natural_keys.iterate(chunks, database=queryset.db)
+
+                # Many to many relations are prefetched for each chunk of objects
+                yield from prefetch_m2m_chunks(
+                    chunks,
+                    natural_foreign=use_natural_foreign_keys,
+                )
+
+        stream = ChunkedWriter(output, chunk_size=settings.DISKETTE_DUMP_CHUNK)
+
+        if serializer == "values":
+            ValuesSerializer(
+                format=format,
+                indent=indent,
+                chunk_size=chunk_size,
+                pagination=pagination,
+            ).serialize(get_querysets(), stream)
+        else:
+            serializers.serialize(
+                format,
+                get_objects(),
+                indent=indent,
+                use_natural_foreign_keys=use_natural_foreign_keys,
+                use_natural_primary_keys=use_natural_primary_keys,
+                stream=stream,
+            )
+
+        stream.flush()
+
+    def check_options(self, options):
+        """
+        Validate option values.
+
+        Raises:
+            NotImplementedError: If an option not implemented is used.
+            CommandError: For an invalid option value.
+        """
+        if "primary_keys" in self.NOT_IMPLEMENTED and options["primary_keys"]:
+            raise NotImplementedError("Option '--pks' is not implemented.")
+        if "traceback" in self.NOT_IMPLEMENTED and options["traceback"]:
+            raise NotImplementedError("Option '--traceback' is not implemented.")
+        if (
+            "database" in self.NOT_IMPLEMENTED and
+            options["database"] != DEFAULT_DB_ALIAS
+        ):
+            raise NotImplementedError("Option '--using' is not implemented.")
+
+        if self.FORMATS and options["format"] not in self.FORMATS:
+            raise NotImplementedError(
+                "This command only support the '{}' format.".format(
+                    "', '".join(self.FORMATS)
+                )
+            )
+        elif options["format"] not in serializers.get_public_serializer_formats():
+            raise CommandError(
+                "Unknown serialization format: {}".format(options["format"])
+            )
+
+        single_model = len(options["args"]) == 1 and "." in options["args"][0]
+
+        if options["primary_keys"] and not single_model:
+            raise CommandError("You can only use --pks option with one model")
+
+        if (
+            options["pk_from"] is not None or options["pk_to"] is not None
+        ) and not single_model:
+            raise CommandError(
+                "You can only use --pk-from and --pk-to options with one model"
+            )
+
+        if options["serializer"] == "values":
+            if options["format"] not in ValuesSerializer.FORMATS:
+                raise CommandError(
+                    "Values serializer only support these formats: {}".format(
+                        ", ".join(ValuesSerializer.FORMATS)
+                    )
+                )
+
+            if (
+                options["use_natural_foreign_keys"] or
+                options["use_natural_primary_keys"]
+            ):
+                raise CommandError(
+                    "Values serializer does not support natural keys."
+                )
+
+        if options["chunk_size"] is not None and options["chunk_size"] < 1:
+            raise CommandError("Option '--chunk-size' must be a positive integer.")
+
+    def handle(self, *args, **options):
+        options["args"] = args
+        self.check_options(options)
+
+        output = options["output"]
+        database = options["database"]
+        use_natural_foreign_keys = options["use_natural_foreign_keys"]
+
+        model_list = self.get_models(
+            args,
+            excludes=options["exclude"],
+            use_natural_foreign_keys=use_natural_foreign_keys,
+            database=database,
+        )
+
+        export_options = {
+            "format": options["format"],
+            "indent": options["indent"],
+            "use_natural_foreign_keys": use_natural_foreign_keys,
+            "use_natural_primary_keys": options["use_natural_primary_keys"],
+            "use_base_manager": options["use_base_manager"],
+            "database": database,
+            "primary_keys": (
+                options["primary_keys"].split(",")
+                if options["primary_keys"] else None
+            ),
+            "chunk_size": options["chunk_size"],
+            "pagination": options["pagination"],
+            "pk_from": options["pk_from"],
+            "pk_to": options["pk_to"],
+            "serializer": options["serializer"],
+        }
+
+        # Either write content to file path if given else write it to standard output
+        if output:
+            with output.open("w") as fp:
+                self.export_models(model_list, fp, **export_options)
+        else:
+            self.stdout.ending = None
+            self.export_models(model_list, self.stdout, **export_options)
@@ -2,6 +2,7 @@ from pathlib import Path
 
 from django.core.management.base import BaseCommand
 
+from ...core.defaults import AVAILABLE_LOAD_ENGINES
 from ...core.handlers import LoadCommandHandler
 from ...utils.loggers import DjangoCommandOutput
 
@@ -20,7 +21,9 @@ class Command(BaseCommand, LoadCommandHandler):
             "archive",
             default=None,
             help=(
-                "Archive file path or URL to restore its content."
+                "Archive file path or URL to restore its content. Use '-' to read "
+                "the archive as a stream from the standard input, its manifest must "
+                "be its first file."
             )
         )
         parser.add_argument(
@@ -68,6 +71,56 @@ class Command(BaseCommand, LoadCommandHandler):
                 "will be ignored instead of raising an error. This is false on default."
             ),
         )
+        parser.add_argument(
+            "--engine",
+            choices=AVAILABLE_LOAD_ENGINES,
+            default="loaddata",
+            help=(
+                "Engine used to load data dumps. 'loaddata' uses the Django command "
+                "which saves objects one by one and 'bulk' inserts objects in batches "
+                "with bulk inserts."
+            ),
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=None,
+            help=(
+                "Number of objects to insert at once with the 'bulk' engine. Default "
+                "to 1000."
+            ),
+        )
+        parser.add_argument(
+            "--jobs",
+            type=int,
+            metavar="N",
+            default=None,
+            help=(
+                "Number of worker processes to load data dumps concurrently. Each "
+                "worker uses its own database connection and a dump is loaded once "
+                "the dumps it depends on have been loaded. On default dumps are "
+                "loaded sequentially."
+            ),
+        )
+        parser.add_argument(
+            "--pipeline",
+            action="store_true",
+            help=(
+                "Load data dumps as soon as they are extracted while the archive "
+                "extraction continues in background, storages are restored once "
+                "extraction is over. Data dumps are then loaded sequentially."
+            ),
+        )
+        parser.add_argument(
+            "--if-changed",
+            action="store_true",
+            help=(
+                "Only load the data dumps and storages which have changed since the "
+                "previous load, the whole load is skipped if the same archive has "
+                "already been loaded. Loaded contents are recorded in a ledger file "
+                "from setting 'DISKETTE_LOAD_LEDGER_PATH'."
+            ),
+        )
         parser.add_argument(
             "--keep",
             action="store_true",
@@ -96,4 +149,9 @@ class Command(BaseCommand, LoadCommandHandler):
             keep=options["keep"],
             checksum=options["checksum"],
             ignorenonexistent_data=options["ignorenonexistent_data"],
+            engine=options["engine"],
+            batch_size=options["batch_size"],
+            jobs=options["jobs"],
+            pipeline=options["pipeline"],
+            if_changed=options["if_changed"],
         )
@@ -0,0 +1,108 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+
+from ...core.serializers.bulkinsert import BulkInserter
+
+
+class Command(BaseCommand):
+    """
+    A command alike Django's loaddata which inserts objects in batches.
+
+    Objects are grouped by model and inserted with ``bulk_create``, many to many
+    relations are inserted once all objects have been inserted and database sequences
+    are reset once at the end. See ``diskette.core.serializers.bulkinsert`` for
+    details.
+    """
+    help = (
+        "Installs the named fixture files in the database with bulk inserts. This is "
+        "an alternative to Django command 'loaddata' which only accepts fixture file "
+        "paths and does not send model signals."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "args",
+            metavar="fixture",
+            nargs="+",
+            type=Path,
+            help="Fixture file paths.",
+        )
+        parser.add_argument(
+            "--database",
+            default=DEFAULT_DB_ALIAS,
+            help=(
+                "Nominates a specific database to load fixtures into. Defaults to the "
+                '"default" database.'
+            ),
+        )
+        parser.add_argument(
+            "--app",
+            dest="app_label",
+            help="Only load objects from the specified application.",
+        )
+        parser.add_argument(
+            "--ignorenonexistent",
+            "-i",
+            action="store_true",
+            dest="ignore",
+            help=(
+                "Ignores entries in the serialized data for fields that do not "
+                "currently exist on the model."
+            ),
+        )
+        parser.add_argument(
+            "-e",
+            "--exclude",
+            action="append",
+            default=[],
+            help=(
+                "An app_label or app_label.ModelName to exclude. Can be used multiple "
+                "times."
+            ),
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            help="Number of objects to insert at once. Default to 1000.",
+        )
+
+    def handle(self, *args, **options):
+        if options["batch_size"] is not None and options["batch_size"] < 1:
+            raise CommandError("Option '--batch-size' must be a positive integer.")
+
+        inserter = BulkInserter(
+            batch_size=options["batch_size"],
+            database=options["database"],
+            ignorenonexistent=options["ignore"],
+            app=options["app_label"],
+            excludes=options["exclude"],
+        )
+
+        for path in args:
+            if not path.exists():
+                raise CommandError("No fixture named '{}' found.".format(path))
+
+            try:
+                inserter.get_format(path)
+            except ValueError as e:
+                raise CommandError(
+                    "Problem installing fixture '{}': {}".format(path, e)
+                )
+
+        loaded, found = inserter.load(args)
+
+        if options["verbosity"] >= 1:
+            if loaded == found:
+                self.stdout.write(
+                    "Installed {} object(s) from {} fixture(s)".format(
+                        loaded, len(args)
+                    )
+                )
+            else:
+                self.stdout.write(
+                    "Installed {} object(s) (of {}) from {} fixture(s)".format(
+                        loaded, found, len(args)
+                    )
+                )
@@ -54,13 +54,64 @@ If value is empty Diskette will use ``0o755``.
 
 DISKETTE_DUMP_FILENAME = "diskette{features}.tar.gz"
 """
-Filename for dump tarball file. It must ends with ``.tar.gz``. The pattern
+Filename for dump tarball file. Its archive extension is replaced with the one from
+compression codec (see ``DISKETTE_DUMP_COMPRESSION``). The pattern
 ``{features}`` is required if you want different filename depending enabled dump option
 set (data, storages, everything) else every dump kind will overwrite each other.
 
 For a dump with data and storages it would be ``diskette_data_storages.tar.gz``.
 """
 
+DISKETTE_DUMP_COMPRESSION = "gzip"
+"""
+Compression codec for dump archives, either ``gzip``, ``bz2``, ``xz``, ``zstd`` or
+``none`` for a plain tarball. Codec name may be followed by a compression level like
+``gzip:6`` (from 0 to 9 for ``gzip`` and ``xz``, from 1 to 9 for ``bz2`` and from 1 to
+22 for ``zstd``), else the codec default level is used.
+
+The codec is recorded in the archive manifest and the archive filename extension from
+``DISKETTE_DUMP_FILENAME`` is replaced with the codec one (like ``.tar.xz``).
+
+.. Note::
+    Codec ``zstd`` requires the package ``zstandard`` to be installed.
+"""
+
+DISKETTE_DUMP_COMPRESSION_THREADS = None
+"""
+Number of threads to compress ``gzip`` archives. Archive is cut into blocks that are
+compressed at the same time as independent members of a standard multi-member gzip
+file. If empty, the number of available CPUs is used. With ``1`` the archive is
+compressed in a single gzip stream. This is ignored for other compression codecs.
+"""
+
+DISKETTE_DUMP_STORE_INCOMPRESSIBLE = False
+"""
+When enabled, storage files that would not shrink (like images, videos or zip files)
+are stored without compression in ``gzip`` archives, this saves a lot of compression
+time with almost no change in archive size. Files are classified from their extension
+else from the compression of a small sample. They are appended after the other
+storage files and they are listed in archive manifest.
+
+Archive is still a standard gzip file. This is ignored for other compression codecs.
+"""
+
+DISKETTE_DUMP_LAYOUT = "single"
+"""
+Dump archive layout, either ``single``, ``sections`` or ``indexed``.
+
+With ``single`` layout, data dumps, storage files and manifest are all in the same
+compressed archive. With ``sections`` layout, data dumps and each storage are
+compressed in their own archive (a section) and sections are appended with the
+manifest in an uncompressed archive with extension ``.tar``, so a load without
+storages or without data does not have to read the other sections.
+
+With ``indexed`` layout, every archive member is compressed in its own gzip member and
+an index of their compressed positions is the first archive member so a single member
+like the manifest can be read without decompressing the whole archive. It is still a
+standard gzip archive but it is a bit bigger since members do not share compression
+history. This layout requires the ``gzip`` compression.
+"""
+
 DISKETTE_DUMP_AUTO_PURGE = True
 """
 When this setting is true, a routine is executed to purge all deprecated dumps that
@@ -76,6 +127,20 @@ dump files.
     correctly purge files so it can be a workaround.
 """
 
+DISKETTE_DUMP_SPOOL_SIZE = 10 * 1024 * 1024
+"""
+Maximum size in bytes of an application data dump to keep in memory when an archive
+is built in streaming mode. A bigger dump is spilled into a temporary file created in
+the archive destination directory instead of the system temporary directory.
+"""
+
+DISKETTE_DUMP_CHUNK = 64 * 1024
+"""
+Size in characters of chunks written by data dumps into their file or stream. The
+serialized records are buffered until they fill a chunk so the memory usage stays the
+same whatever the size of dumped tables.
+"""
+
 DISKETTE_LOAD_STORAGES_PATH = None
 """
 A ``pathlib.Path`` object for where to extract archive content from a dump.
@@ -96,6 +161,30 @@ A data dump file size must be greater than this value to be loaded else it is ig
 This limit value is defined in bytes.
 """
 
+DISKETTE_LOAD_LEDGER_PATH = None
+"""
+A ``pathlib.Path`` object for the ledger file where a load with option ``if_changed``
+records what has been loaded.
+
+If value is empty, the ledger file will be ``.diskette_ledger.json`` into the storages
+destination directory.
+"""
+
+DISKETTE_EXTRACTION_CACHE_PATH = None
+"""
+Directory where to keep extracted archives, keyed by their checksum, so the next
+loads of the same archive do not extract it again. Storages are then copied from the
+cache instead of being moved. On default this is ``None`` and archives are extracted
+into a temporary directory removed once loaded.
+"""
+
+DISKETTE_EXTRACTION_CACHE_SIZE = 10 * 1024 * 1024 * 1024
+"""
+Maximum size in bytes of all extracted archives from extraction cache, the least
+recently used ones which are not in use by a load are removed once it is over. An
+empty value means there is no limit.
+"""
+
 DISKETTE_DOWNLOAD_ALLOWED_PROTOCOLS = ("http://", "https://")
 """
 A tuple or list of network protocols allowed to be used for downloading dump to load.
@@ -118,3 +207,37 @@ DISKETTE_DOWNLOAD_CHUNK = 8192
 Size in bytes of download chunk. You should not change this without to know exactly
 what you are doing.
 """
+
+DISKETTE_DOWNLOAD_SEGMENTS = 4
+"""
+Number of byte ranges an archive is split into to be downloaded concurrently, each
+one from its own connection. Archives are downloaded in a single stream when this is
+``1``, when server does not support byte ranges or when archive is too small to be
+worth it.
+"""
+
+DISKETTE_DOWNLOAD_CACHE_PATH = None
+"""
+Directory where to cache downloaded archives. A cached archive is only downloaded
+again if server responds it has been modified to a conditional request. On default
+this is ``None`` and downloaded archives are not cached.
+"""
+
+DISKETTE_DOWNLOAD_CACHE_SIZE = 5 * 1024 * 1024 * 1024
+"""
+Maximum size in bytes of all archives from download cache, the least recently used
+archives are removed once it is over. An empty value means there is no limit.
+"""
+
+DISKETTE_DOWNLOAD_RETRIES = 3
+"""
+Number of times a failed download is retried. A download is retried on connection
+errors, timeouts and server errors, it resumes from the already downloaded part of
+archive when server supports byte ranges.
+"""
+
+DISKETTE_DOWNLOAD_RETRY_DELAY = 1
+"""
+Time in seconds to wait before the first download retry, this delay is doubled for
+each following retry.
+"""
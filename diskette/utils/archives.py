@@ -0,0 +1,821 @@
+"""
+Helpers to write and read archives with a selectable compression codec.
+
+Codec ``zstd`` requires the optional package ``zstandard``.
+"""
+import bz2
+import gzip
+import json
+import lzma
+import os
+import shutil
+import tarfile
+import tempfile
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+from ..core.defaults import (
+    ARCHIVE_INDEX_FILENAME, ARCHIVE_INDEX_VERSION, AVAILABLE_COMPRESSIONS,
+    COMPRESSIBILITY_MINIMUM_SIZE, COMPRESSIBILITY_RATIO, COMPRESSIBILITY_SAMPLE_SIZE,
+    DEFAULT_GZIP_BLOCK_SIZE, INCOMPRESSIBLE_EXTENSIONS
+)
+
+
+ARCHIVE_EXTENSIONS = {
+    "gzip": ".tar.gz",
+    "bz2": ".tar.bz2",
+    "xz": ".tar.xz",
+    "zstd": ".tar.zst",
+    "none": ".tar",
+}
+"""
+Archive filename extension for each compression codec.
+"""
+
+KNOWN_EXTENSIONS = sorted(
+    list(ARCHIVE_EXTENSIONS.values()) + [".tgz", ".tbz2", ".txz", ".tzst"],
+    key=len,
+    reverse=True,
+)
+"""
+Archive filename extensions which are replaced by the codec one, longest first.
+"""
+
+COMPRESSION_LEVELS = {
+    "gzip": (0, 9),
+    "bz2": (1, 9),
+    "xz": (0, 9),
+    "zstd": (1, 22),
+}
+"""
+Allowed range of levels for each compression codec.
+"""
+
+MAGIC_NUMBERS = (
+    (b"\x1f\x8b", "gzip"),
+    (b"BZh", "bz2"),
+    (b"\xfd7zXZ\x00", "xz"),
+    (b"\x28\xb5\x2f\xfd", "zstd"),
+)
+"""
+Leading bytes of compressed files for each compression codec.
+"""
+
+
+class ParallelGzipWriter:
+    """
+    A writable file object which compresses data with gzip from a pool of threads.
+
+    Written data is cut into blocks of the same size and each block is compressed as
+    an independent gzip member in a thread, since ``zlib`` releases the GIL during
+    compression every thread can use its own CPU core. Compressed members are written
+    to the output file object in the same order than blocks so the result is a
+    standard multi-member gzip file that can be read with ``tar -xzf`` or ``gzip``
+    module.
+
+    The number of blocks waiting to be written is limited to twice the number of
+    threads, so memory usage does not depend on the written data size.
+
+    Compression level can be changed while writing, the buffered data is compressed
+    with the previous level as a shorter block. A level ``0`` makes blocks to be
+    stored without compression, see ``ParallelGzipWriter.uncompressed``.
+
+    Arguments:
+        fileobj (object): Binary file object where to write compressed data, it is
+            not closed with the writer.
+
+    Keyword Arguments:
+        compresslevel (integer): Compression level from 0 to 9. Default to 9 like
+            ``tarfile``.
+        threads (integer): Number of compression threads. Default to the number of
+            available CPUs.
+        block_size (integer): Size in bytes of compressed blocks. Default to
+            ``DEFAULT_GZIP_BLOCK_SIZE``.
+    """
+    def __init__(self, fileobj, compresslevel=None, threads=None, block_size=None):
+        self.fileobj = fileobj
+        self.compresslevel = 9 if compresslevel is None else compresslevel
+        self.threads = threads or os.cpu_count() or 1
+        self.block_size = block_size or DEFAULT_GZIP_BLOCK_SIZE
+        self.executor = ThreadPoolExecutor(max_workers=self.threads)
+        self.pending = deque()
+        self.buffer = bytearray()
+        self.members = 0
+        self.offset = 0
+        self.marks = []
+        self.member_sizes = []
+        self.closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    @staticmethod
+    def compress_block(data, compresslevel):
+        """
+        Compress a block as a complete gzip member.
+
+        Arguments:
+            data (bytes): Block data.
+            compresslevel (integer): Compression level.
+
+        Returns:
+            bytes: Gzip member with its header and trailer.
+        """
+        # A window size of 16 + 15 makes zlib to write a gzip header and trailer
+        compressor = zlib.compressobj(compresslevel, zlib.DEFLATED, 31)
+        return compressor.compress(data) + compressor.flush()
+
+    def write_pending(self, limit=0):
+        """
+        Write compressed members until there is no more than the given number of
+        pending blocks.
+
+        Keyword Arguments:
+            limit (integer): Number of pending blocks to keep.
+        """
+        while len(self.pending) > limit:
+            member = self.pending.popleft().result()
+            self.fileobj.write(member)
+            self.member_sizes.append(len(member))
+
+    def submit(self, data):
+        """
+        Submit a block to compress.
+
+        Arguments:
+            data (bytes): Block data.
+        """
+        self.pending.append(
+            self.executor.submit(self.compress_block, data, self.compresslevel)
+        )
+        self.members += 1
+        self.write_pending(limit=self.threads * 2)
+
+    def write(self, data):
+        """
+        Buffer data and submit every complete block.
+
+        Arguments:
+            data (bytes): Data to write.
+
+        Returns:
+            integer: Size of written data.
+        """
+        if self.closed:
+            raise ValueError("I/O operation on closed file.")
+
+        self.buffer += data
+        self.offset += len(data)
+
+        while len(self.buffer) >= self.block_size:
+            self.submit(bytes(self.buffer[:self.block_size]))
+            del self.buffer[:self.block_size]
+
+        return len(data)
+
+    def tell(self):
+        """
+        Returns:
+            integer: Size of uncompressed written data, this is required by
+            ``tarfile`` to use the writer as an archive file object.
+        """
+        return self.offset
+
+    def set_compresslevel(self, compresslevel):
+        """
+        Change compression level of next written data.
+
+        Arguments:
+            compresslevel (integer): Compression level from 0 to 9.
+        """
+        if compresslevel == self.compresslevel:
+            return
+
+        if self.buffer:
+            self.submit(bytes(self.buffer))
+            self.buffer = bytearray()
+
+        self.compresslevel = compresslevel
+
+    def mark(self, name):
+        """
+        Start a new gzip member for the next written data and record its position.
+
+        Arguments:
+            name (string): Name to record for the position.
+        """
+        if self.buffer:
+            self.submit(bytes(self.buffer))
+            self.buffer = bytearray()
+
+        self.marks.append((name, self.members))
+
+    def get_marks_index(self):
+        """
+        Get compressed position of every recorded mark, it can only be used once
+        writer is closed.
+
+        Returns:
+            dict: Position of marks where each key is a mark name and value is a list
+            of the compressed offset of its first gzip member and the compressed size
+            until the next mark or the end of file.
+        """
+        offsets = [0]
+        for size in self.member_sizes:
+            offsets.append(offsets[-1] + size)
+
+        ends = [member for name, member in self.marks[1:]] + [len(self.member_sizes)]
+
+        return {
+            name: [offsets[start], offsets[end] - offsets[start]]
+            for (name, start), end in zip(self.marks, ends)
+        }
+
+    @contextmanager
+    def uncompressed(self):
+        """
+        Context manager to store written data without compression.
+        """
+        compresslevel = self.compresslevel
+        self.set_compresslevel(0)
+
+        try:
+            yield
+        finally:
+            self.set_compresslevel(compresslevel)
+
+    def flush(self):
+        """
+        Does nothing since only complete blocks can be compressed, remaining data is
+        compressed when writer is closed.
+        """
+        pass
+
+    def close(self):
+        """
+        Compress remaining data and write every pending members.
+
+        An empty gzip member is written if nothing has been written so the result is
+        always a valid gzip file.
+        """
+        if self.closed:
+            return
+
+        try:
+            if self.buffer or not self.members:
+                self.submit(bytes(self.buffer))
+                self.buffer = bytearray()
+
+            self.write_pending()
+        finally:
+            self.executor.shutdown()
+            self.closed = True
+
+
+class IndexedTarFile(tarfile.TarFile):
+    """
+    A tarball archive which starts a new gzip member for every added member.
+
+    It must be opened in writing mode on a ``ParallelGzipWriter`` which records the
+    position of every member so each one can be decompressed on its own.
+    """
+    def addfile(self, tarinfo, fileobj=None):
+        self.fileobj.mark(tarinfo.name)
+        super().addfile(tarinfo, fileobj)
+
+
+class ArchiveIndex:
+    """
+    Index of an archive with the ``indexed`` layout.
+
+    The index is the content of the first archive member, compressed in its own gzip
+    member at the front of archive. It gives the compressed offset and size of every
+    archive member from the end of the index gzip member. Since every archive member
+    starts its own gzip member, it can be read by seeking straight to its offset.
+
+    Use ``ArchiveIndex.read`` to get an index from an archive file.
+
+    Arguments:
+        path (Path): Archive file path.
+        start (integer): Offset in archive file where members start.
+        members (dict): Compressed offset and size of each member.
+    """
+    def __init__(self, path, start, members):
+        self.path = path
+        self.start = start
+        self.members = members
+
+    def __contains__(self, name):
+        return name in self.members
+
+    @classmethod
+    def read(cls, path, chunk_size=65536):
+        """
+        Read index from the front of an archive.
+
+        Only the index gzip member is read and decompressed, as soon as the first
+        archive member is known to not be an index the read is stopped.
+
+        Arguments:
+            path (Path): Archive file path.
+
+        Keyword Arguments:
+            chunk_size (integer): Size of chunks to read.
+
+        Returns:
+            ArchiveIndex: The index object or ``None`` if archive has no index.
+        """
+        if detect_compression(path) != "gzip":
+            return None
+
+        decompressor = zlib.decompressobj(31)
+        content = b""
+        consumed = 0
+        tarinfo = None
+
+        try:
+            with path.open("rb") as fp:
+                while not decompressor.eof:
+                    chunk = fp.read(chunk_size)
+                    if not chunk:
+                        return None
+
+                    consumed += len(chunk)
+                    content += decompressor.decompress(chunk)
+
+                    if tarinfo is None and len(content) >= tarfile.BLOCKSIZE:
+                        tarinfo = tarfile.TarInfo.frombuf(
+                            content[:tarfile.BLOCKSIZE],
+                            tarfile.ENCODING,
+                            "surrogateescape",
+                        )
+                        if tarinfo.name != ARCHIVE_INDEX_FILENAME:
+                            return None
+
+            data = json.loads(
+                content[tarfile.BLOCKSIZE:tarfile.BLOCKSIZE + tarinfo.size]
+            )
+        except (zlib.error, tarfile.TarError, ValueError, AttributeError):
+            return None
+
+        if not isinstance(data, dict) or data.get("version") != ARCHIVE_INDEX_VERSION:
+            return None
+
+        return cls(
+            path,
+            consumed - len(decompressor.unused_data),
+            data["members"],
+        )
+
+    @contextmanager
+    def open_member(self, name):
+        """
+        Open an archive member without reading the other ones.
+
+        Arguments:
+            name (string): Member name.
+
+        Raises:
+            KeyError: If member is not in index.
+
+        Returns:
+            tuple: The archive object opened as a stream from the member position and
+            the member ``tarfile.TarInfo`` object.
+        """
+        offset, size = self.members[name]
+
+        with self.path.open("rb") as fp:
+            fp.seek(self.start + offset)
+            with gzip.GzipFile(fileobj=fp, mode="rb") as stream:
+                with tarfile.open(fileobj=stream, mode="r|") as tar:
+                    yield tar, tar.next()
+
+    def read_member(self, name):
+        """
+        Read content of an archive member.
+
+        Arguments:
+            name (string): Member name.
+
+        Returns:
+            bytes: Member content.
+        """
+        with self.open_member(name) as (tar, tarinfo):
+            return tar.extractfile(tarinfo).read()
+
+    def extract_member(self, name, destination):
+        """
+        Extract an archive member.
+
+        Arguments:
+            name (string): Member name.
+            destination (Path): Directory where to extract member.
+        """
+        with self.open_member(name) as (tar, tarinfo):
+            tar.extract(tarinfo, destination)
+
+
+def write_archive_index(fp, body, members, compresslevel=None):
+    """
+    Write an archive with an index at its front.
+
+    Arguments:
+        fp (object): Binary file object where to write archive.
+        body (Path): File of the archive members compressed as a multi-member gzip.
+        members (dict): Compressed offset and size of each member from body start,
+            as returned by ``ParallelGzipWriter.get_marks_index``.
+
+    Keyword Arguments:
+        compresslevel (integer): Compression level for the index member.
+    """
+    content = json.dumps({
+        "version": ARCHIVE_INDEX_VERSION,
+        "members": members,
+    }).encode("utf-8")
+
+    tarinfo = tarfile.TarInfo(name=ARCHIVE_INDEX_FILENAME)
+    tarinfo.size = len(content)
+    tarinfo.mtime = int(os.path.getmtime(body))
+
+    padding = -len(content) % tarfile.BLOCKSIZE
+    fp.write(ParallelGzipWriter.compress_block(
+        tarinfo.tobuf() + content + tarfile.NUL * padding,
+        9 if compresslevel is None else compresslevel,
+    ))
+
+    with body.open("rb") as body_fp:
+        shutil.copyfileobj(body_fp, fp)
+
+
+def is_compressible(path, sample_size=None, ratio=None):
+    """
+    Check if a file is worth to be compressed.
+
+    A file with an extension from ``INCOMPRESSIBLE_EXTENSIONS`` is never compressible,
+    else a sample from the start of file is compressed with the fastest level and the
+    file is compressible if the sample shrinks enough. Files smaller than
+    ``COMPRESSIBILITY_MINIMUM_SIZE`` are always compressible since compression
+    overhead would make them look incompressible and storing them would not save
+    anything.
+
+    Arguments:
+        path (Path): File path.
+
+    Keyword Arguments:
+        sample_size (integer): Size in bytes of sample. Default to
+            ``COMPRESSIBILITY_SAMPLE_SIZE``.
+        ratio (float): Maximum ratio of compressed sample size for a compressible
+            file. Default to ``COMPRESSIBILITY_RATIO``.
+
+    Returns:
+        boolean: True if file is compressible.
+    """
+    if path.suffix.lower() in INCOMPRESSIBLE_EXTENSIONS:
+        return False
+
+    with path.open("rb") as fp:
+        sample = fp.read(sample_size or COMPRESSIBILITY_SAMPLE_SIZE)
+
+    if len(sample) < COMPRESSIBILITY_MINIMUM_SIZE:
+        return True
+
+    compressed = zlib.compress(sample, 1)
+
+    return len(compressed) <= len(sample) * (ratio or COMPRESSIBILITY_RATIO)
+
+
+def get_gzip_writer(tar):
+    """
+    Get the parallel gzip writer used by an archive.
+
+    Arguments:
+        tar (tarfile.TarFile): The archive object opened in a writing mode.
+
+    Returns:
+        ParallelGzipWriter: The writer object or ``None`` if archive is not written
+        through a parallel gzip writer.
+    """
+    if isinstance(tar.fileobj, ParallelGzipWriter):
+        return tar.fileobj
+
+    return None
+
+
+def parse_compression(value):
+    """
+    Parse a compression value.
+
+    Arguments:
+        value (string): Compression codec name, optionally followed by a colon and a
+            level like ``gzip:6``. An empty value means ``gzip`` with its default
+            level.
+
+    Raises:
+        ValueError: For an unknown codec, an unavailable codec or an invalid level.
+
+    Returns:
+        tuple: Codec name and level. Level is ``None`` when not given.
+    """
+    codec, _, level = (value or "gzip").partition(":")
+
+    if codec not in AVAILABLE_COMPRESSIONS:
+        raise ValueError(
+            "Given compression '{}' is not allowed, it must be one of: {}".format(
+                codec,
+                ", ".join(AVAILABLE_COMPRESSIONS),
+            )
+        )
+
+    if codec == "zstd" and zstandard is None:
+        raise ValueError(
+            "Compression 'zstd' requires the package 'zstandard' to be installed."
+        )
+
+    if not level:
+        return codec, None
+
+    if codec not in COMPRESSION_LEVELS:
+        raise ValueError(
+            "Compression '{}' does not accept a level.".format(codec)
+        )
+
+    minimum, maximum = COMPRESSION_LEVELS[codec]
+    if not level.isdigit() or not (minimum <= int(level) <= maximum):
+        raise ValueError(
+            "Compression level for '{}' must be an integer from {} to {}.".format(
+                codec, minimum, maximum
+            )
+        )
+
+    return codec, int(level)
+
+
+def format_compression(codec, level=None):
+    """
+    Format a compression value.
+
+    Arguments:
+        codec (string): Compression codec name.
+
+    Keyword Arguments:
+        level (integer): Compression level.
+
+    Returns:
+        string: Compression value like ``gzip:6`` or ``xz``.
+    """
+    if level is None:
+        return codec
+
+    return "{}:{}".format(codec, level)
+
+
+def replace_archive_extension(filename, codec):
+    """
+    Replace archive extension from a filename with the one from a codec.
+
+    Arguments:
+        filename (string): Archive filename. If it does not end with a known archive
+            extension, the codec extension is just appended.
+        codec (string): Compression codec name.
+
+    Returns:
+        string: Filename with codec extension.
+    """
+    for extension in KNOWN_EXTENSIONS:
+        if filename.endswith(extension):
+            filename = filename[:-len(extension)]
+            break
+
+    return filename + ARCHIVE_EXTENSIONS[codec]
+
+
+def detect_compression(source):
+    """
+    Detect compression codec of a file from its leading bytes.
+
+    Arguments:
+        source (Path or object): File path or a binary file object. A seekable file
+            object is read from its current position which is restored after, else
+            its leading bytes are peeked without to consume them.
+
+    Returns:
+        string: Compression codec name, ``none`` if no compression is detected.
+    """
+    if hasattr(source, "read") and is_seekable(source):
+        position = source.tell()
+        head = source.read(6)
+        source.seek(position)
+    elif hasattr(source, "read"):
+        head = source.peek(6)[:6]
+    else:
+        with source.open("rb") as fp:
+            head = fp.read(6)
+
+    for magic, codec in MAGIC_NUMBERS:
+        if head.startswith(magic):
+            return codec
+
+    return "none"
+
+
+def is_seekable(fileobj):
+    """
+    Check if a file object can be seeked.
+
+    Arguments:
+        fileobj (object): A file object.
+
+    Returns:
+        boolean: True if file object can be seeked. Archive members read from an
+        archive opened as a stream are not seekable.
+    """
+    try:
+        return fileobj.seekable()
+    except AttributeError:
+        return False
+
+
+@contextmanager
+def open_archive_writer(path, compression=None, threads=None,
+                        store_incompressible=False, indexed=False, spool_dir=None):
+    """
+    Open a tarball archive to write with the given compression.
+
+    Arguments:
+        path (Path or object): Archive file path or a binary file object. A file
+            object is never seeked so it can be a pipe or the standard output, it is
+            not closed once archive is written.
+
+    Keyword Arguments:
+        compression (string): Compression value, see ``parse_compression``.
+        threads (integer): Number of threads to compress ``gzip`` archive with
+            ``ParallelGzipWriter``. If ``None``, the number of available CPUs is
+            used. If ``1`` the archive is compressed in a single gzip stream by
+            ``tarfile``. This is ignored for other codecs.
+        store_incompressible (boolean): If enabled, a ``gzip`` archive is always
+            written through ``ParallelGzipWriter`` so some members can be stored
+            without compression. This is ignored for other codecs.
+        indexed (boolean): If enabled, every archive member is compressed in its
+            own gzip member and an index of their positions is written at the front
+            of archive, see ``ArchiveIndex``. Archive members are written in a
+            temporary file next to the archive (or in ``spool_dir`` for a file
+            object) until the archive is complete. This requires the ``gzip`` codec.
+        spool_dir (Path): Directory where to write the temporary file of an indexed
+            archive written to a file object. If not given, the system temporary
+            directory is used.
+
+    Raises:
+        ValueError: If index is enabled with another codec than ``gzip``.
+
+    Returns:
+        tarfile.TarFile: Archive object opened in write mode.
+    """
+    codec, level = parse_compression(compression)
+    threads = threads or os.cpu_count() or 1
+    is_fileobj = hasattr(path, "write")
+
+    if indexed:
+        if codec != "gzip":
+            raise ValueError(
+                "Archive index requires the 'gzip' compression, not '{}'.".format(codec)
+            )
+
+        if is_fileobj:
+            fd, body = tempfile.mkstemp(suffix=".body", dir=spool_dir)
+            os.close(fd)
+            body = Path(body)
+        else:
+            body = path.with_name(path.name + ".body")
+
+        try:
+            with body.open("wb") as fp:
+                with ParallelGzipWriter(
+                    fp,
+                    compresslevel=level,
+                    threads=threads
+                ) as stream:
+                    with IndexedTarFile.open(fileobj=stream, mode="w") as tar:
+                        yield tar
+
+            with nullcontext(path) if is_fileobj else path.open("wb") as fp:
+                write_archive_index(
+                    fp,
+                    body,
+                    stream.get_marks_index(),
+                    compresslevel=level,
+                )
+        finally:
+            if body.exists():
+                body.unlink()
+        return
+
+    if codec == "gzip" and (threads > 1 or store_incompressible):
+        with nullcontext(path) if is_fileobj else path.open("wb") as fp:
+            with ParallelGzipWriter(fp, compresslevel=level, threads=threads) as stream:
+                # Archive is written without seeking so it can be directly written
+                # on the writer
+                with tarfile.open(fileobj=stream, mode="w") as tar:
+                    yield tar
+        return
+
+    if codec == "zstd":
+        options = {} if level is None else {"level": level}
+        with nullcontext(path) if is_fileobj else path.open("wb") as fp:
+            compressor = zstandard.ZstdCompressor(**options)
+            with compressor.stream_writer(fp, closefd=False) as stream:
+                with tarfile.open(fileobj=stream, mode="w|") as tar:
+                    yield tar
+        return
+
+    if is_fileobj:
+        # Archive is written as a stream since file object may not be seekable
+        if codec == "gzip":
+            stream = gzip.GzipFile(
+                filename="",
+                mode="wb",
+                fileobj=path,
+                compresslevel=9 if level is None else level,
+            )
+        elif codec == "bz2":
+            stream = bz2.BZ2File(
+                path,
+                mode="wb",
+                compresslevel=9 if level is None else level,
+            )
+        elif codec == "xz":
+            stream = lzma.LZMAFile(path, mode="wb", preset=level)
+        else:
+            stream = nullcontext(path)
+
+        with stream as fp:
+            with tarfile.open(fileobj=fp, mode="w|") as tar:
+                yield tar
+        return
+
+    if codec == "none":
+        with tarfile.open(path, "w") as tar:
+            yield tar
+        return
+
+    options = {}
+    if level is not None:
+        options["preset" if codec == "xz" else "compresslevel"] = level
+
+    mode = "w:gz" if codec == "gzip" else "w:{}".format(codec)
+    with tarfile.open(path, mode, **options) as tar:
+        yield tar
+
+
+@contextmanager
+def open_archive_reader(source):
+    """
+    Open a tarball archive to read, its compression is detected automatically.
+
+    Arguments:
+        source (Path or object): Archive file path or a binary file object. A file
+            object which is not seekable (like the standard input) must be able to
+            peek its leading bytes.
+
+    Raises:
+        ValueError: When archive is compressed with ``zstd`` and package
+            ``zstandard`` is not installed.
+
+    Returns:
+        tarfile.TarFile: Archive object opened in read mode. A ``zstd`` archive or a
+        file object which is not seekable is opened as a stream so its members can
+        only be read in order.
+    """
+    is_fileobj = hasattr(source, "read")
+
+    if detect_compression(source) == "zstd":
+        if zstandard is None:
+            raise ValueError(
+                "Archive is compressed with 'zstd' which requires the package "
+                "'zstandard' to be installed."
+            )
+
+        with nullcontext(source) if is_fileobj else source.open("rb") as fp:
+            decompressor = zstandard.ZstdDecompressor()
+            with decompressor.stream_reader(fp, closefd=False) as stream:
+                with tarfile.open(fileobj=stream, mode="r|") as tar:
+                    yield tar
+        return
+
+    if is_fileobj:
+        mode = "r:*" if is_seekable(source) else "r|*"
+        with tarfile.open(fileobj=source, mode=mode) as tar:
+            yield tar
+    else:
+        with tarfile.open(source, "r:*") as tar:
+            yield tar
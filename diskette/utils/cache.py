@@ -0,0 +1,483 @@
+import abc
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+from .filesystem import directory_size
+
+
+class SizeCappedCache(abc.ABC):
+    """
+    Base for caches which remove their least recently used entries once their size
+    is over a limit.
+
+    Arguments:
+        directory (Path): Directory where to store cached entries. It is created if
+            it does not exist yet.
+
+    Keyword Arguments:
+        max_size (integer): Maximum size in bytes of all cached entries. If empty,
+            cache size is not limited.
+    """
+    METADATA_SUFFIX = ".json"
+
+    def __init__(self, directory, max_size=None):
+        self.directory = directory
+        self.max_size = max_size
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    @abc.abstractmethod
+    def entries(self):
+        """
+        List the complete cache entries.
+
+        Returns:
+            list: Tuples of entry key, entry size and last usage time, ordered
+            from the least recently used entry.
+        """
+        pass
+
+    @abc.abstractmethod
+    def remove(self, key):
+        """
+        Remove an entry.
+
+        Arguments:
+            key (string): The entry key.
+
+        Returns:
+            boolean: True if entry has been removed, False if it is in use and has
+            been kept.
+        """
+        pass
+
+    def evict(self, keep=None):
+        """
+        Remove the least recently used entries until the cache size is under its
+        limit.
+
+        Keyword Arguments:
+            keep (string): Key of an entry to never remove.
+
+        Returns:
+            list: Keys of removed entries.
+        """
+        if not self.max_size:
+            return []
+
+        entries = self.entries()
+        size = sum([item[1] for item in entries])
+        removed = []
+
+        for key, entry_size, used in entries:
+            if size <= self.max_size:
+                break
+
+            if key == keep or not self.remove(key):
+                continue
+
+            size -= entry_size
+            removed.append(key)
+
+        return removed
+
+
+class DownloadCache(SizeCappedCache):
+    """
+    Cache of downloaded archives, keyed by their URL.
+
+    Each entry is an archive file with a JSON file of its metadata aside, like the
+    entity tag and last modification date sent by server so a next download can be a
+    conditional request. Entries are evicted from the least recently used one once
+    the cache size is over its limit.
+
+    Arguments:
+        directory (Path): Directory where to store cached archives. It is created if
+            it does not exist yet.
+
+    Keyword Arguments:
+        max_size (integer): Maximum size in bytes of all cached archives. If empty,
+            cache size is not limited.
+    """
+    ARCHIVE_SUFFIX = ".archive"
+
+    def get_key(self, url):
+        """
+        Get the entry key of an URL.
+
+        Arguments:
+            url (string): The archive URL.
+
+        Returns:
+            string: The entry key.
+        """
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def get_archive_path(self, url):
+        """
+        Get the path of the cached archive for an URL.
+
+        Arguments:
+            url (string): The archive URL.
+
+        Returns:
+            Path: The archive path, it may not exist yet.
+        """
+        return self.directory / (self.get_key(url) + self.ARCHIVE_SUFFIX)
+
+    def get_metadata_path(self, url):
+        """
+        Get the path of the entry metadata file for an URL.
+
+        Arguments:
+            url (string): The archive URL.
+
+        Returns:
+            Path: The metadata file path, it may not exist yet.
+        """
+        return self.directory / (self.get_key(url) + self.METADATA_SUFFIX)
+
+    def get(self, url):
+        """
+        Get the entry of an URL.
+
+        Arguments:
+            url (string): The archive URL.
+
+        Returns:
+            dict: The entry metadata with items ``url``, ``etag``,
+            ``last_modified`` and ``checksum``. This is ``None`` if there is no
+            complete entry for this URL.
+        """
+        metadata_path = self.get_metadata_path(url)
+        if not metadata_path.exists() or not self.get_archive_path(url).exists():
+            return None
+
+        metadata = json.loads(metadata_path.read_text())
+        if metadata.get("url") != url:
+            return None
+
+        return metadata
+
+    def get_conditions(self, url):
+        """
+        Get the request headers to download an URL only if it has changed since it
+        has been cached.
+
+        Arguments:
+            url (string): The archive URL.
+
+        Returns:
+            dict: Conditional request headers, empty if there is no entry for this
+            URL or if server did not send any validator.
+        """
+        entry = self.get(url)
+        if entry is None:
+            return {}
+
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+        return headers
+
+    def touch(self, url):
+        """
+        Mark the entry of an URL as the most recently used one.
+
+        Arguments:
+            url (string): The archive URL.
+        """
+        os.utime(self.get_metadata_path(url))
+
+    def store(self, url, etag=None, last_modified=None, checksum=None):
+        """
+        Store the metadata of an URL entry once its archive has been written to
+        its cached archive path, then evict the entries over the size limit.
+
+        Arguments:
+            url (string): The archive URL.
+
+        Keyword Arguments:
+            etag (string): The archive entity tag sent by server.
+            last_modified (string): The archive last modification date sent by
+                server.
+            checksum (string): The archive checksum.
+        """
+        self.get_metadata_path(url).write_text(json.dumps({
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "checksum": checksum,
+        }))
+
+        self.evict(keep=self.get_key(url))
+
+    def entries(self):
+        """
+        List the complete cache entries.
+
+        Returns:
+            list: Tuples of entry key, archive size and last usage time, ordered
+            from the least recently used entry.
+        """
+        entries = []
+        for metadata_path in self.directory.glob("*" + self.METADATA_SUFFIX):
+            key = metadata_path.name[:-len(self.METADATA_SUFFIX)]
+            archive_path = self.directory / (key + self.ARCHIVE_SUFFIX)
+            if archive_path.exists():
+                entries.append((
+                    key,
+                    archive_path.stat().st_size,
+                    metadata_path.stat().st_mtime,
+                ))
+
+        return sorted(entries, key=lambda item: item[2])
+
+    def remove(self, key):
+        """
+        Remove an entry archive and metadata.
+
+        Arguments:
+            key (string): The entry key.
+
+        Returns:
+            boolean: Always True.
+        """
+        (self.directory / (key + self.ARCHIVE_SUFFIX)).unlink()
+        (self.directory / (key + self.METADATA_SUFFIX)).unlink()
+
+        return True
+
+
+class ExtractionCache(SizeCappedCache):
+    """
+    Cache of extracted archives, keyed by their checksum.
+
+    Each entry is a directory of all extracted archive files with a JSON file of its
+    metadata aside. An archive is extracted into a temporary directory of the cache
+    which is renamed to its entry directory once extraction is over, so concurrent
+    processes never read an incomplete entry. Entries are evicted from the least
+    recently used one once the cache size is over its limit.
+
+    An entry is used under a shared lock on its metadata file, see
+    ``ExtractionCache.lock``, and is only evicted if an exclusive lock can be
+    acquired, so an entry in use from another process is never removed. Locks
+    require the ``fcntl`` module, they are ignored on platforms without it.
+
+    .. Warning::
+        Entries must be used as read only since they are shared between loads.
+
+    Arguments:
+        directory (Path): Directory where to store extracted archives. It is created
+            if it does not exist yet.
+
+    Keyword Arguments:
+        max_size (integer): Maximum size in bytes of all extracted archives. If
+            empty, cache size is not limited.
+    """
+    TMPDIR_PREFIX = ".tmp_"
+
+    def get_path(self, key):
+        """
+        Get the directory of an entry.
+
+        Arguments:
+            key (string): The archive checksum.
+
+        Returns:
+            Path: The entry directory, it may not exist yet.
+        """
+        return self.directory / key
+
+    def get_metadata_path(self, key):
+        """
+        Get the path of an entry metadata file.
+
+        Arguments:
+            key (string): The archive checksum.
+
+        Returns:
+            Path: The metadata file path, it may not exist yet.
+        """
+        return self.directory / (key + self.METADATA_SUFFIX)
+
+    def get(self, key):
+        """
+        Get the directory of an entry.
+
+        Arguments:
+            key (string): The archive checksum.
+
+        Returns:
+            Path: The entry directory. This is ``None`` if there is no complete entry
+            for this key.
+        """
+        path = self.get_path(key)
+        if not self.get_metadata_path(key).exists() or not path.exists():
+            return None
+
+        return path
+
+    @contextmanager
+    def lock(self, key):
+        """
+        Use an entry under a shared lock so it can not be evicted meanwhile.
+
+        Arguments:
+            key (string): The archive checksum.
+
+        Yields:
+            Path: The entry directory. This is ``None`` if there is no complete entry
+            for this key.
+        """
+        try:
+            fp = self.get_metadata_path(key).open("rb")
+        except FileNotFoundError:
+            yield None
+            return
+
+        with fp:
+            if fcntl:
+                fcntl.flock(fp.fileno(), fcntl.LOCK_SH)
+
+            # Entry may have been evicted while waiting for the lock
+            if os.fstat(fp.fileno()).st_nlink == 0 or not self.get_path(key).exists():
+                yield None
+                return
+
+            # Mark entry as the most recently used one
+            os.utime(self.get_metadata_path(key))
+            yield self.get_path(key)
+
+    def make_tmpdir(self):
+        """
+        Create a temporary directory where to extract an archive before to store it.
+
+        Returns:
+            Path: The temporary directory.
+        """
+        return Path(tempfile.mkdtemp(prefix=self.TMPDIR_PREFIX, dir=self.directory))
+
+    @contextmanager
+    def store(self, key, tmpdir):
+        """
+        Store an extracted archive as an entry and use it under a shared lock.
+
+        If another process has stored the same entry meanwhile, the given directory
+        is removed and the existing entry is used.
+
+        Metadata file is written aside then linked to its final path while it is
+        already locked, so the new entry can not be evicted before it is used.
+
+        Arguments:
+            key (string): The archive checksum.
+            tmpdir (Path): Directory where archive has been extracted, from
+                ``ExtractionCache.make_tmpdir``.
+
+        Yields:
+            Path: The entry directory. This is ``None`` if the entry from another
+            process has been evicted meanwhile.
+        """
+        path = self.get_path(key)
+
+        try:
+            tmpdir.rename(path)
+        except OSError:
+            if not path.exists():
+                raise
+            shutil.rmtree(tmpdir)
+
+        fd, metadata_tmp = tempfile.mkstemp(
+            prefix=self.TMPDIR_PREFIX,
+            dir=self.directory,
+        )
+        with os.fdopen(fd, "w") as fp:
+            fp.write(json.dumps({
+                "checksum": key,
+                "size": directory_size(path),
+            }))
+            fp.flush()
+
+            if fcntl:
+                fcntl.flock(fp.fileno(), fcntl.LOCK_SH)
+
+            try:
+                os.link(metadata_tmp, self.get_metadata_path(key))
+            except FileExistsError:
+                linked = False
+            else:
+                linked = True
+            finally:
+                os.unlink(metadata_tmp)
+
+            if linked:
+                yield path
+                return
+
+        with self.lock(key) as directory:
+            yield directory
+
+    def entries(self):
+        """
+        List the complete cache entries.
+
+        Returns:
+            list: Tuples of entry key, extracted size and last usage time, ordered
+            from the least recently used entry.
+        """
+        entries = []
+        for metadata_path in self.directory.glob("*" + self.METADATA_SUFFIX):
+            key = metadata_path.name[:-len(self.METADATA_SUFFIX)]
+            if self.get_path(key).exists():
+                entries.append((
+                    key,
+                    json.loads(metadata_path.read_text())["size"],
+                    metadata_path.stat().st_mtime,
+                ))
+
+        return sorted(entries, key=lambda item: item[2])
+
+    def remove(self, key):
+        """
+        Remove an entry metadata then its directory, unless the entry is in use.
+
+        Arguments:
+            key (string): The archive checksum.
+
+        Returns:
+            boolean: True if entry has been removed, False if it is locked from a
+            load.
+        """
+        try:
+            fp = self.get_metadata_path(key).open("rb")
+        except FileNotFoundError:
+            return False
+
+        with fp:
+            if fcntl:
+                try:
+                    fcntl.flock(fp.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    return False
+
+            # Entry may have been evicted from another process meanwhile
+            if os.fstat(fp.fileno()).st_nlink == 0:
+                return False
+
+            self.get_metadata_path(key).unlink()
+            shutil.rmtree(self.get_path(key))
+
+        return True
@@ -0,0 +1,95 @@
+import re
+
+from django.apps import apps
+
+
+FIXTURE_MODEL_PATTERN = re.compile(r'\{\s*"model":\s*"([^"\\]+)"')
+"""
+Pattern to find model labels from JSON fixture objects. Quotes inside JSON strings
+are always escaped so this only matches object structures.
+"""
+
+FIXTURE_SCAN_FORMATS = (".json", ".jsonl")
+"""
+Fixture file extensions that can be scanned for their model labels.
+"""
+
+
+def get_fixture_labels(path, chunk_size=1048576):
+    """
+    Scan a fixture file to find the model labels of its objects.
+
+    File is read by chunks and content is not decoded as JSON, so this is fast and
+    memory usage is constant whatever the fixture size is.
+
+    Arguments:
+        path (Path): Fixture file path.
+
+    Keyword Arguments:
+        chunk_size (integer): Size of chunks to read.
+
+    Returns:
+        set: Model labels as written in fixture. This is ``None`` if fixture format
+        can not be scanned.
+    """
+    if path.suffix not in FIXTURE_SCAN_FORMATS:
+        return None
+
+    labels = set()
+    tail = ""
+
+    with path.open("r") as fp:
+        while True:
+            chunk = fp.read(chunk_size)
+            if not chunk:
+                break
+
+            # Keep the end of previous chunk to catch a label across two chunks
+            content = tail + chunk
+            labels.update(FIXTURE_MODEL_PATTERN.findall(content))
+            tail = content[-512:]
+
+    return labels
+
+
+def get_fixture_models(path):
+    """
+    Get models from objects of a fixture file.
+
+    Arguments:
+        path (Path): Fixture file path.
+
+    Returns:
+        set: Concrete model classes. Labels of models which are not installed are
+        ignored. This is ``None`` if fixture format can not be scanned.
+    """
+    labels = get_fixture_labels(path)
+    if labels is None:
+        return None
+
+    models = set()
+    for label in labels:
+        try:
+            models.add(apps.get_model(label)._meta.concrete_model)
+        except (LookupError, ValueError):
+            continue
+
+    return models
+
+
+def get_related_models(model):
+    """
+    Get models that a model relates to with its foreign keys, one to one and many to
+    many fields.
+
+    Arguments:
+        model (django.db.models.Model): Model class.
+
+    Returns:
+        set: Concrete model classes.
+    """
+    return {
+        field.related_model._meta.concrete_model
+        for field in model._meta.fields + model._meta.many_to_many
+        if field.is_relation and field.related_model is not None
+    }
@@ -22,3 +22,83 @@ def file_checksum(filepath):
             h.update(mv[:n])
 
     return h.hexdigest()
+
+
+class ChecksumStream:
+    """
+    File object wrapper which checksums the content read from or written to a file
+    object with blake2b, so a stream can be checksumed while it is processed.
+
+    Checksum is the same than the one from ``file_checksum`` for the whole content,
+    so a stream must be read until its end before getting its checksum.
+
+    Arguments:
+        fileobj (object): Binary file object to wrap.
+    """
+    def __init__(self, fileobj):
+        self.fileobj = fileobj
+        self.hash = hashlib.blake2b()
+
+    def read(self, size=-1):
+        data = self.fileobj.read(size)
+        self.hash.update(data)
+        return data
+
+    def peek(self, size=0):
+        return self.fileobj.peek(size)
+
+    def write(self, data):
+        self.hash.update(data)
+        return self.fileobj.write(data)
+
+    def flush(self):
+        self.fileobj.flush()
+
+    def seekable(self):
+        return False
+
+    def drain(self, chunk_size=128 * 1024):
+        """
+        Read the remaining content until the end of the stream.
+
+        Keyword Arguments:
+            chunk_size (integer): Size of chunks to read.
+        """
+        while self.read(chunk_size):
+            pass
+
+    def hexdigest(self):
+        """
+        Get the checksum of the content read or written so far.
+
+        Returns:
+            string: The checksum with exactly 128 characters.
+        """
+        return self.hash.hexdigest()
+
+
+def directory_fingerprint(path):
+    """
+    Fingerprint a directory from the path, size and modification time of its files.
+
+    This is cheaper than checksuming all file contents and still changes when a file
+    is added, removed or modified.
+
+    Arguments:
+        path (pathlib.Path): Directory path to fingerprint.
+
+    Returns:
+        string: The directory fingerprint with exactly 128 characters.
+    """
+    h = hashlib.blake2b()
+
+    for item in sorted(path.rglob("*")):
+        if item.is_file():
+            stat = item.stat()
+            h.update("{}\0{}\0{}\n".format(
+                item.relative_to(path).as_posix(),
+                stat.st_size,
+                int(stat.st_mtime),
+            ).encode("utf-8"))
+
+    return h.hexdigest()
@@ -1,6 +1,14 @@
+import re
+
 from django.conf import settings
 
 
+CONTENT_RANGE_PATTERN = re.compile(r"^bytes\s+(\d+)-(\d+)/(\d+|\*)$")
+"""
+Pattern to parse the byte range of a ``Content-Range`` response header.
+"""
+
+
 def is_url(path):
     """
     Determine if given path is an elligible URL or not.
@@ -20,3 +28,23 @@ def is_url(path):
         isinstance(path, str) and
         path.startswith(settings.DISKETTE_DOWNLOAD_ALLOWED_PROTOCOLS)
     )
+
+
+def parse_content_range(value):
+    """
+    Parse a ``Content-Range`` response header value.
+
+    Arguments:
+        value (string): Header value like ``bytes 100-199/200``.
+
+    Returns:
+        tuple: The first byte position and the complete length, the latter is
+        ``None`` if it is unknown. This is ``None`` if value is empty or invalid.
+    """
+    match = CONTENT_RANGE_PATTERN.match((value or "").strip())
+    if not match:
+        return None
+
+    start, end, total = match.groups()
+
+    return int(start), None if total == "*" else int(total)
@@ -58,6 +58,37 @@ class LoggingOutput:
         raise DisketteError(msg)
 
 
+class RecordingOutput:
+    """
+    Output interface which records messages so they can be replayed later on another
+    logger. This is commonly used to bring back messages from a worker process.
+
+    Attributes:
+        records (list): List of recorded messages, each item is a tuple with the
+            logging method name and the message.
+    """
+    def __init__(self, *args, **kwargs):
+        self.records = []
+
+    def debug(self, msg):
+        self.records.append(("debug", str(msg)))
+
+    def info(self, msg):
+        self.records.append(("info", str(msg)))
+
+    def warning(self, msg):
+        self.records.append(("warning", str(msg)))
+
+    def error(self, msg):
+        self.records.append(("error", str(msg)))
+
+    def critical(self, msg):
+        """
+        Critical error is assumed to be a breaking event.
+        """
+        raise DisketteError(msg)
+
+
 class DjangoCommandOutput:
     """
     Output interface which use the Django stdout and style interface.
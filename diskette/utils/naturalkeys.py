@@ -0,0 +1,146 @@
+def has_natural_key(model):
+    """
+    Determine if a model implements natural keys.
+
+    Arguments:
+        model (django.db.models.Model): Model class.
+
+    Returns:
+        boolean: True if model has a ``natural_key`` method.
+    """
+    return hasattr(model, "natural_key")
+
+
+def get_natural_fk_fields(model):
+    """
+    Returns the serialized foreign key fields of a model which point to a model with
+    natural keys.
+
+    Arguments:
+        model (django.db.models.Model): Model class.
+
+    Returns:
+        list: Foreign key field objects.
+    """
+    return [
+        field
+        for field in model._meta.concrete_model._meta.local_fields
+        if (
+            field.serialize and
+            field.remote_field is not None and
+            has_natural_key(field.remote_field.model)
+        )
+    ]
+
+
+class NaturalKeyCache:
+    """
+    Memo of related objects used to serialize foreign keys with natural keys.
+
+    When foreign keys are serialized with natural keys, Django serializers get the
+    related object of each foreign key to call its ``natural_key`` method, which
+    performs a query for each object and foreign key. This cache fetches the missing
+    related objects of a chunk of objects with a single query for each related model
+    and keeps them for the whole run indexed on their model and key, so related
+    objects shared by a lot of objects (like content types, users or sites) are
+    fetched only once.
+
+    Related objects are fetched with their own foreign keys to natural key models
+    (with ``select_related``) since their natural key commonly includes them (like
+    ``auth.Permission`` with its content type).
+
+    Keyword Arguments:
+        max_size (integer): Maximum number of memorized related objects, the memo is
+            cleared once it is reached to keep memory usage bounded.
+    """
+    def __init__(self, max_size=10000):
+        self.max_size = max_size
+        self.objects = {}
+
+    def get_related_queryset(self, model, database=None):
+        """
+        Returns the queryset to fetch related objects for a model.
+
+        Arguments:
+            model (django.db.models.Model): Related model class.
+
+        Keyword Arguments:
+            database (string): Database alias to query.
+
+        Returns:
+            django.db.models.QuerySet: Queryset with related natural key models
+            selected.
+        """
+        queryset = model._base_manager.db_manager(database).all()
+        related = [field.name for field in get_natural_fk_fields(model)]
+
+        if related:
+            queryset = queryset.select_related(*related)
+
+        return queryset
+
+    def prime(self, objects, database=None):
+        """
+        Set related objects of foreign keys to natural key models for every given
+        objects, either from memo or fetched from database.
+
+        Arguments:
+            objects (list): List of model objects, they must all be of the same
+                model.
+
+        Keyword Arguments:
+            database (string): Database alias to query.
+        """
+        if not objects:
+            return
+
+        fields = get_natural_fk_fields(objects[0]._meta.model)
+        if not fields:
+            return
+
+        if len(self.objects) >= self.max_size:
+            self.objects = {}
+
+        # Collect keys of missing related objects
+        missings = {}
+        for obj in objects:
+            for field in fields:
+                value = getattr(obj, field.attname)
+                key = (field.remote_field.model, field.remote_field.field_name, value)
+                if value is not None and key not in self.objects:
+                    missings.setdefault(key[:2], set()).add(value)
+
+        # Fetch missing related objects with a query for each model
+        for (model, field_name), values in missings.items():
+            found = self.get_related_queryset(model, database=database).in_bulk(
+                list(values),
+                field_name=field_name
+            )
+            for value, related in found.items():
+                self.objects[(model, field_name, value)] = related
+
+        # Set related objects on objects so they are not fetched again
+        for obj in objects:
+            for field in fields:
+                value = getattr(obj, field.attname)
+                key = (field.remote_field.model, field.remote_field.field_name, value)
+                if key in self.objects:
+                    field.set_cached_value(obj, self.objects[key])
+
+    def iterate(self, chunks, database=None):
+        """
+        Prime each chunk of objects.
+
+        Arguments:
+            chunks (iterable): Iterable of model object lists, like the one returned
+                from ``diskette.utils.querysets.iterate_chunks``.
+
+        Keyword Arguments:
+            database (string): Database alias to query.
+
+        Returns:
+            generator: Lists of primed model objects.
+        """
+        for objects in chunks:
+            self.prime(objects, database=database)
+            yield objects
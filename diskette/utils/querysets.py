@@ -0,0 +1,229 @@
+import itertools
+
+from django.db.models import Prefetch, prefetch_related_objects
+
+from ..core.defaults import DEFAULT_CHUNK_SIZE
+from .naturalkeys import get_natural_fk_fields, has_natural_key
+
+
+def keyset_chunks(queryset, chunk_size=None, pk_index=None):
+    """
+    Iterate over queryset objects by chunks with keyset pagination on primary key.
+
+    Objects are fetched by pages ordered on primary key where each page starts after
+    the last primary key from previous page. Every page is a short query on its own,
+    there is no long running cursor kept opened on the database during iteration.
+
+    Arguments:
+        queryset (django.db.models.QuerySet): Queryset to iterate over. Its ordering
+            is replaced by the primary key ordering.
+
+    Keyword Arguments:
+        chunk_size (integer): Number of objects to fetch for each page. Default to
+            ``DEFAULT_CHUNK_SIZE``.
+        pk_index (integer): Position of primary key in items when queryset returns
+            tuples (like from ``values_list``). On default items are assumed to be
+            model objects.
+
+    Returns:
+        generator: List of objects for each page.
+    """
+    chunk_size = chunk_size or DEFAULT_CHUNK_SIZE
+    queryset = queryset.order_by("pk")
+    last_pk = None
+
+    while True:
+        page = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+        objects = list(page[:chunk_size])
+
+        if objects:
+            yield objects
+
+        if len(objects) < chunk_size:
+            break
+
+        last_pk = objects[-1].pk if pk_index is None else objects[-1][pk_index]
+
+
+def keyset_iterator(queryset, chunk_size=None):
+    """
+    Iterate over queryset objects with keyset pagination on primary key.
+
+    See ``keyset_chunks`` for details.
+
+    Arguments:
+        queryset (django.db.models.QuerySet): Queryset to iterate over.
+
+    Keyword Arguments:
+        chunk_size (integer): Number of objects to fetch for each page.
+
+    Returns:
+        generator: Model objects.
+    """
+    for objects in keyset_chunks(queryset, chunk_size=chunk_size):
+        yield from objects
+
+
+def iterate_chunks(queryset, chunk_size=None, pagination=None, pk_index=None):
+    """
+    Iterate over queryset objects by chunks with the given pagination mode.
+
+    This is useful to perform some batch operations for each chunk of objects.
+
+    Arguments:
+        queryset (django.db.models.QuerySet): Queryset to iterate over.
+
+    Keyword Arguments:
+        chunk_size (integer): Number of objects for each chunk. Default to
+            ``DEFAULT_CHUNK_SIZE``.
+        pagination (string): Pagination mode, see ``iterate_queryset``.
+        pk_index (integer): Position of primary key in items when queryset returns
+            tuples (like from ``values_list``). This is only used with keyset
+            pagination.
+
+    Returns:
+        generator: List of objects for each chunk.
+    """
+    chunk_size = chunk_size or DEFAULT_CHUNK_SIZE
+
+    if pagination == "keyset":
+        yield from keyset_chunks(queryset, chunk_size=chunk_size, pk_index=pk_index)
+        return
+
+    iterator = queryset.iterator(chunk_size=chunk_size)
+    while True:
+        objects = list(itertools.islice(iterator, chunk_size))
+        if not objects:
+            break
+
+        yield objects
+
+
+def iterate_queryset(queryset, chunk_size=None, pagination=None):
+    """
+    Iterate over queryset objects with the given pagination mode.
+
+    Arguments:
+        queryset (django.db.models.QuerySet): Queryset to iterate over.
+
+    Keyword Arguments:
+        chunk_size (integer): Number of objects to fetch at once. Default to
+            ``DEFAULT_CHUNK_SIZE``.
+        pagination (string): Pagination mode, either ``keyset`` to walk over primary
+            key ranges (see ``keyset_iterator``) or ``cursor`` to use the queryset
+            iterator which is a named server side cursor with PostgreSQL where
+            ``chunk_size`` is the number of rows fetched at each round trip. Default
+            is ``cursor``.
+
+    Returns:
+        generator: Model objects.
+    """
+    if pagination == "keyset":
+        return keyset_iterator(queryset, chunk_size=chunk_size)
+
+    return queryset.iterator(chunk_size=chunk_size or DEFAULT_CHUNK_SIZE)
+
+
+def get_m2m_fields(model):
+    """
+    Returns the many to many fields of a model which are serialized with its objects.
+
+    Alike Django serializers, many to many fields with a custom through model are
+    ignored since the through model is serialized on its own.
+
+    Arguments:
+        model (django.db.models.Model): Model class.
+
+    Returns:
+        list: Many to many field objects.
+    """
+    return [
+        field
+        for field in model._meta.concrete_model._meta.local_many_to_many
+        if field.serialize and field.remote_field.through._meta.auto_created
+    ]
+
+
+def get_m2m_prefetch(field, natural_foreign=False):
+    """
+    Build the prefetch lookup for a many to many field.
+
+    Arguments:
+        field (django.db.models.ManyToManyField): Many to many field.
+
+    Keyword Arguments:
+        natural_foreign (boolean): If enabled and related model implements natural
+            keys, related objects are fetched with their own foreign keys to natural
+            key models since their natural key commonly includes them.
+
+    Returns:
+        object: Either the field name or a ``Prefetch`` object.
+    """
+    model = field.remote_field.model
+
+    if natural_foreign and has_natural_key(model):
+        related = [item.name for item in get_natural_fk_fields(model)]
+        if related:
+            return Prefetch(
+                field.name,
+                queryset=model._default_manager.select_related(*related)
+            )
+
+    return field.name
+
+
+def prefetch_m2m_chunks(chunks, natural_foreign=False):
+    """
+    Prefetch serialized many to many relations of each chunk of model objects.
+
+    Related objects are fetched with a single query for each many to many field and
+    chunk, so Django serializers use them instead of performing a query for each
+    object and field.
+
+    Arguments:
+        chunks (iterable): Iterable of model object lists, like the one returned
+            from ``iterate_chunks``.
+
+    Keyword Arguments:
+        natural_foreign (boolean): Enable it when objects are serialized with
+            natural foreign keys, see ``get_m2m_prefetch``.
+
+    Returns:
+        generator: Model objects.
+    """
+    for objects in chunks:
+        fields = get_m2m_fields(objects[0]._meta.model) if objects else []
+
+        if fields:
+            prefetch_related_objects(objects, *[
+                get_m2m_prefetch(field, natural_foreign=natural_foreign)
+                for field in fields
+            ])
+
+        yield from objects
+
+
+def get_pk_boundaries(queryset, partitions):
+    """
+    Compute primary key values which split queryset objects into partitions of
+    almost the same size.
+
+    Arguments:
+        queryset (django.db.models.QuerySet): Queryset to split.
+        partitions (integer): Number of partitions.
+
+    Returns:
+        list: Boundary primary key values, there is one less value than partitions
+        since each one is the start of a partition except for the first one. This is
+        an empty list if queryset does not have any object.
+    """
+    count = queryset.count()
+    if not count:
+        return []
+
+    pks = queryset.order_by("pk").values_list("pk", flat=True)
+
+    return [
+        pks[(count * i) // partitions]
+        for i in range(1, partitions)
+    ]
@@ -0,0 +1,221 @@
+import io
+import json
+
+
+class EncodedWriter:
+    """
+    Text writer interface which encodes given strings to write them into a binary
+    file object.
+
+    This is a minimal alternative to ``io.TextIOWrapper`` which works with any binary
+    file object implementing a ``write`` method (like
+    ``tempfile.SpooledTemporaryFile``).
+
+    Arguments:
+        fileobj (object): Binary file object to write into.
+
+    Keyword Arguments:
+        encoding (string): Encoding to use. Default to ``utf-8``.
+    """
+    def __init__(self, fileobj, encoding="utf-8"):
+        self.fileobj = fileobj
+        self.encoding = encoding
+
+    def write(self, content):
+        return self.fileobj.write(content.encode(self.encoding))
+
+    def flush(self):
+        self.fileobj.flush()
+
+    def isatty(self):
+        return False
+
+
+class ChunkedWriter(io.TextIOBase):
+    """
+    Text writer interface which buffers given strings and writes them to a file
+    object in chunks of a fixed size.
+
+    Serializers commonly write a lot of tiny strings for each record, this batches
+    them so the file object receives fewer and bigger writes while memory usage
+    stays bounded to the chunk size.
+
+    This is a ``io.TextIOBase`` so serializers which check for a text stream (like
+    the XML one) write strings to it.
+
+    Arguments:
+        fileobj (object): Text file object to write into.
+
+    Keyword Arguments:
+        chunk_size (integer): Size of chunks to write. Default to 64KiB.
+    """
+    def __init__(self, fileobj, chunk_size=65536):
+        self.fileobj = fileobj
+        self.chunk_size = chunk_size
+        self._buffer = []
+        self._length = 0
+
+    def writable(self):
+        return True
+
+    def write(self, content):
+        self._buffer.append(content)
+        self._length += len(content)
+
+        if self._length >= self.chunk_size:
+            data = "".join(self._buffer)
+            cursor = 0
+            while len(data) - cursor >= self.chunk_size:
+                self.fileobj.write(data[cursor:cursor + self.chunk_size])
+                cursor += self.chunk_size
+
+            remaining = data[cursor:]
+            self._buffer = [remaining] if remaining else []
+            self._length = len(remaining)
+
+        return len(content)
+
+    def flush(self):
+        """
+        Write remaining buffered content then flush file object if possible.
+
+        Nothing is done once the file object has been closed.
+        """
+        if getattr(self.fileobj, "closed", False):
+            return
+
+        if self._buffer:
+            self.fileobj.write("".join(self._buffer))
+            self._buffer = []
+            self._length = 0
+
+        if hasattr(self.fileobj, "flush"):
+            self.fileobj.flush()
+
+    def isatty(self):
+        return False
+
+
+class JSONArrayReader:
+    """
+    Incremental parser for a JSON array which yields its items one by one.
+
+    The stream is read by chunks and only the current item is decoded from a small
+    buffer, so memory usage depends on the size of items and chunks, not on the
+    whole array size.
+
+    Arguments:
+        stream (object): Text file object to read from.
+
+    Keyword Arguments:
+        chunk_size (integer): Size of chunks to read. Default to 64KiB.
+    """
+    WHITESPACES = " \t\n\r"
+
+    def __init__(self, stream, chunk_size=65536):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.position = 0
+
+    def fill(self):
+        """
+        Read the next chunk into buffer and drop the content already parsed.
+
+        Returns:
+            boolean: False if stream is exhausted, else True.
+        """
+        chunk = self.stream.read(self.chunk_size)
+        if not chunk:
+            return False
+
+        self.buffer = self.buffer[self.position:] + chunk
+        self.position = 0
+
+        return True
+
+    def next_character(self):
+        """
+        Move position to the next character which is not a whitespace.
+
+        Returns:
+            string: The found character or an empty string if stream is exhausted.
+        """
+        while True:
+            while (
+                self.position < len(self.buffer) and
+                self.buffer[self.position] in self.WHITESPACES
+            ):
+                self.position += 1
+
+            if self.position < len(self.buffer):
+                return self.buffer[self.position]
+
+            if not self.fill():
+                return ""
+
+    def expect(self, characters):
+        """
+        Check the next character is one of expected ones and move after it.
+
+        Arguments:
+            characters (string): Expected characters.
+
+        Raises:
+            ValueError: If next character is not an expected one.
+
+        Returns:
+            string: The found character.
+        """
+        character = self.next_character()
+
+        if not character or character not in characters:
+            raise ValueError(
+                "Invalid JSON array, expecting one of '{}' but got: {}".format(
+                    characters,
+                    repr(character) if character else "end of stream",
+                )
+            )
+
+        self.position += 1
+
+        return character
+
+    def decode(self):
+        """
+        Decode the item at current position, reading more chunks if needed.
+
+        Raises:
+            json.JSONDecodeError: If item is invalid.
+
+        Returns:
+            object: Decoded item.
+        """
+        while True:
+            try:
+                item, end = self.decoder.raw_decode(self.buffer, self.position)
+            except json.JSONDecodeError:
+                # Item may just be incomplete so read more before to give up
+                if not self.fill():
+                    raise
+                continue
+
+            # An item which reaches buffer end may be truncated (like a number)
+            if end < len(self.buffer) or not self.fill():
+                self.position = end
+                return item
+
+    def __iter__(self):
+        self.expect("[")
+
+        if self.next_character() == "]":
+            self.position += 1
+            return
+
+        while True:
+            self.next_character()
+            yield self.decode()
+
+            if self.expect(",]") == "]":
+                return
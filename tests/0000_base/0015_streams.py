@@ -0,0 +1,114 @@
+from io import BytesIO, StringIO
+
+import pytest
+
+from diskette.utils.hashs import ChecksumStream, file_checksum
+from diskette.utils.streams import ChunkedWriter, EncodedWriter, JSONArrayReader
+
+
+def test_encoded_writer():
+    """
+    Given strings should be encoded into the binary file object.
+    """
+    fileobj = BytesIO()
+    writer = EncodedWriter(fileobj)
+    writer.write("Hé")
+    writer.write("llo")
+
+    assert fileobj.getvalue() == "Héllo".encode("utf-8")
+
+
+@pytest.mark.parametrize("contents, expected", [
+    ([], []),
+    (["a"], ["a"]),
+    (["ab", "cd"], ["abcd"]),
+    (["abc", "de"], ["abcd", "e"]),
+    (["abcdefghij"], ["abcd", "efgh", "ij"]),
+    (["a", "bcdefgh", "i"], ["abcd", "efgh", "i"]),
+])
+def test_chunked_writer(contents, expected):
+    """
+    Writer should only write chunks of the fixed size until it is flushed.
+    """
+    writes = []
+
+    class RecordingStream(StringIO):
+        def write(self, content):
+            writes.append(content)
+            return super().write(content)
+
+    fileobj = RecordingStream()
+    writer = ChunkedWriter(fileobj, chunk_size=4)
+    for item in contents:
+        writer.write(item)
+
+    writer.flush()
+
+    assert writes == expected
+    assert fileobj.getvalue() == "".join(contents)
+
+
+@pytest.mark.parametrize("content, expected", [
+    ("[]", []),
+    (" [ ]\n", []),
+    ("[1, 2,3]", [1, 2, 3]),
+    ("[{\"a\": [1, 2]}, {\"b\": \"x], {\"}]", [{"a": [1, 2]}, {"b": "x], {"}]),
+    ("[\n    {\"a\": 1},\n    {\"a\": 12345}\n]\n", [{"a": 1}, {"a": 12345}]),
+])
+@pytest.mark.parametrize("chunk_size", [1, 3, 65536])
+def test_json_array_reader(content, expected, chunk_size):
+    """
+    Reader should yield every array items whatever the chunk size is.
+    """
+    reader = JSONArrayReader(StringIO(content), chunk_size=chunk_size)
+
+    assert list(reader) == expected
+
+
+def test_json_array_reader_incremental():
+    """
+    Reader should yield an item as soon as it has been read.
+    """
+    stream = StringIO("[" + ", ".join(["{\"a\": 1}"] * 1000) + "]")
+    reader = iter(JSONArrayReader(stream, chunk_size=16))
+
+    assert next(reader) == {"a": 1}
+    assert stream.tell() <= 32
+
+
+@pytest.mark.parametrize("content, expected", [
+    ("", "Invalid JSON array, expecting one of '[' but got: end of stream"),
+    ("{}", "Invalid JSON array, expecting one of '[' but got: '{'"),
+    ("[1 2]", "Invalid JSON array, expecting one of ',]' but got: '2'"),
+    ("[1,", "Expecting value"),
+])
+def test_json_array_reader_invalid(content, expected):
+    """
+    Reader should raise an error for invalid content.
+    """
+    with pytest.raises(ValueError) as excinfo:
+        list(JSONArrayReader(StringIO(content), chunk_size=2))
+
+    assert str(excinfo.value).startswith(expected)
+
+
+def test_checksum_stream(tmp_path):
+    """
+    Content read from or written to the stream should be checksumed alike the file
+    checksum.
+    """
+    content = b"Hello world" * 50000
+    source = tmp_path / "sample.bin"
+    source.write_bytes(content)
+
+    output = BytesIO()
+    writer = ChecksumStream(output)
+    writer.write(content[:10])
+    writer.write(content[10:])
+    assert output.getvalue() == content
+    assert writer.hexdigest() == file_checksum(source)
+
+    reader = ChecksumStream(BytesIO(content))
+    assert reader.read(10) == content[:10]
+    reader.drain(chunk_size=1000)
+    assert reader.hexdigest() == file_checksum(source)
@@ -0,0 +1,70 @@
+import pytest
+
+from django.contrib.auth import get_user_model
+
+from diskette.factories import UserFactory
+from diskette.utils.querysets import (
+    get_pk_boundaries, iterate_queryset, keyset_iterator
+)
+
+
+@pytest.mark.parametrize("chunk_size, queries", [
+    (2, 3),
+    (3, 2),
+    (10, 1),
+])
+def test_keyset_iterator(db, django_assert_num_queries, chunk_size, queries):
+    """
+    Keyset iterator should return every objects ordered on primary key with a query
+    for each page.
+    """
+    users = sorted([UserFactory() for i in range(5)], key=lambda item: item.pk)
+    queryset = get_user_model().objects.order_by("-username")
+
+    with django_assert_num_queries(queries):
+        objects = list(keyset_iterator(queryset, chunk_size=chunk_size))
+
+    assert [item.pk for item in objects] == [item.pk for item in users]
+
+
+def test_keyset_iterator_empty(db):
+    """
+    Keyset iterator should not fail on an empty queryset.
+    """
+    assert list(keyset_iterator(get_user_model().objects.all(), chunk_size=2)) == []
+
+
+@pytest.mark.parametrize("pagination", [None, "cursor", "keyset"])
+def test_iterate_queryset(db, pagination):
+    """
+    Every pagination modes should return all objects from queryset.
+    """
+    users = [UserFactory() for i in range(3)]
+    queryset = get_user_model().objects.filter(pk__in=[item.pk for item in users[1:]])
+
+    objects = iterate_queryset(queryset, chunk_size=1, pagination=pagination)
+
+    assert sorted([item.pk for item in objects]) == sorted(
+        [item.pk for item in users[1:]]
+    )
+
+
+@pytest.mark.parametrize("length, partitions, expected", [
+    (0, 3, []),
+    (1, 3, [0, 0]),
+    (6, 3, [2, 4]),
+    (7, 3, [2, 4]),
+    (8, 4, [2, 4, 6]),
+])
+def test_get_pk_boundaries(db, length, partitions, expected):
+    """
+    Boundaries should be the primary keys at evenly distributed positions.
+    """
+    users = sorted(
+        [UserFactory() for i in range(length)],
+        key=lambda item: item.pk
+    )
+
+    boundaries = get_pk_boundaries(get_user_model().objects.all(), partitions)
+
+    assert boundaries == [users[position].pk for position in expected]
@@ -0,0 +1,80 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Permission
+
+from sandbox.djangoapp_sample.factories import ArticleFactory
+from sandbox.djangoapp_sample.models import Article
+
+from diskette.factories import UserFactory
+from diskette.utils.naturalkeys import NaturalKeyCache, get_natural_fk_fields
+
+
+def test_get_natural_fk_fields():
+    """
+    Only foreign keys to models with natural keys should be returned.
+    """
+    assert [item.name for item in get_natural_fk_fields(Article)] == ["author"]
+    assert [item.name for item in get_natural_fk_fields(Permission)] == [
+        "content_type"
+    ]
+    assert get_natural_fk_fields(get_user_model()) == []
+
+
+def test_naturalkeycache_prime(db, django_assert_num_queries):
+    """
+    Related objects should be fetched once and then reused from memo.
+    """
+    authors = [UserFactory() for i in range(2)]
+    [ArticleFactory(author=authors[i % 2]) for i in range(4)]
+
+    cache = NaturalKeyCache()
+    articles = list(Article.objects.order_by("pk"))
+
+    with django_assert_num_queries(1):
+        cache.prime(articles[:2])
+        natural_keys = [item.author.natural_key() for item in articles[:2]]
+
+    assert natural_keys == [(authors[0].username,), (authors[1].username,)]
+
+    with django_assert_num_queries(0):
+        cache.prime(articles[2:])
+        natural_keys = [item.author.natural_key() for item in articles[2:]]
+
+    assert natural_keys == [(authors[0].username,), (authors[1].username,)]
+
+
+def test_naturalkeycache_related_natural_keys(db, django_assert_num_queries):
+    """
+    Related objects should be fetched with their own foreign keys to natural key
+    models.
+    """
+    permissions = list(Permission.objects.order_by("pk")[:3])
+    user = UserFactory()
+    user.user_permissions.set(permissions)
+
+    # Use a model with a foreign key to Permission through the M2M table
+    through = get_user_model().user_permissions.through
+    rows = list(through.objects.filter(user=user).order_by("pk"))
+
+    cache = NaturalKeyCache()
+    with django_assert_num_queries(2):
+        cache.prime(rows)
+        natural_keys = [item.permission.natural_key() for item in rows]
+
+    assert natural_keys == [item.natural_key() for item in permissions]
+
+
+def test_naturalkeycache_max_size(db):
+    """
+    Memo should be cleared when its maximum size is reached.
+    """
+    authors = [UserFactory() for i in range(3)]
+    [ArticleFactory(author=author) for author in authors]
+
+    cache = NaturalKeyCache(max_size=2)
+    articles = list(Article.objects.order_by("pk"))
+
+    cache.prime(articles[:2])
+    assert len(cache.objects) == 2
+
+    cache.prime(articles[2:])
+    assert len(cache.objects) == 1
@@ -0,0 +1,52 @@
+import json
+
+from django.contrib.auth import get_user_model
+from django.contrib.sites.models import Site
+
+from sandbox.djangoapp_sample.models import Article, Blog, Category
+
+from diskette.utils.fixtures import (
+    get_fixture_labels, get_fixture_models, get_related_models
+)
+
+
+def test_get_fixture_labels(tmp_path):
+    """
+    Model labels should be found from JSON fixtures, even across read chunks, and
+    not from object contents.
+    """
+    fixture = tmp_path / "fixture.json"
+    fixture.write_text(json.dumps([
+        {"model": "sites.site", "pk": 1, "fields": {"name": "{\"model\": \"a.b\""}},
+        {"model": "auth.user", "pk": 1, "fields": {}},
+    ], indent=4))
+
+    for chunk_size in (3, 50, 1048576):
+        assert get_fixture_labels(fixture, chunk_size=chunk_size) == {
+            "sites.site", "auth.user"
+        }
+
+    fixture = tmp_path / "fixture.xml"
+    fixture.write_text("<nope/>")
+    assert get_fixture_labels(fixture) is None
+
+
+def test_get_fixture_models(tmp_path):
+    """
+    Model labels from fixture should be resolved to models and unknown ones ignored.
+    """
+    fixture = tmp_path / "fixture.jsonl"
+    fixture.write_text("\n".join([
+        json.dumps({"model": "sites.site", "pk": 1, "fields": {}}),
+        json.dumps({"model": "nope.nope", "pk": 1, "fields": {}}),
+    ]))
+
+    assert get_fixture_models(fixture) == {Site}
+
+
+def test_get_related_models():
+    """
+    Foreign key and many to many fields should be returned.
+    """
+    assert get_related_models(Article) == {Blog, Category, get_user_model()}
+    assert get_related_models(Site) == set()
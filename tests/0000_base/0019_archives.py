@@ -0,0 +1,363 @@
+import gzip
+import io
+import os
+import shutil
+import subprocess
+import tarfile
+import zlib
+
+import pytest
+
+from diskette.utils import archives
+from diskette.utils.archives import (
+    ArchiveIndex, ParallelGzipWriter, detect_compression, is_compressible,
+    open_archive_reader, open_archive_writer, parse_compression,
+    replace_archive_extension
+)
+
+
+def count_gzip_members(content):
+    """
+    Count members of a gzip content.
+    """
+    members = 0
+    while content:
+        decompressor = zlib.decompressobj(31)
+        decompressor.decompress(content)
+        content = decompressor.unused_data
+        members += 1
+
+    return members
+
+
+@pytest.mark.parametrize("value, expected", [
+    (None, ("gzip", None)),
+    ("", ("gzip", None)),
+    ("gzip", ("gzip", None)),
+    ("gzip:0", ("gzip", 0)),
+    ("bz2:9", ("bz2", 9)),
+    ("xz:6", ("xz", 6)),
+    ("none", ("none", None)),
+])
+def test_parse_compression(value, expected):
+    """
+    Compression value should be parsed into a codec and a level.
+    """
+    assert parse_compression(value) == expected
+
+
+@pytest.mark.parametrize("value, expected", [
+    (
+        "zip",
+        "Given compression 'zip' is not allowed, it must be one of: gzip, bz2, xz, "
+        "zstd, none"
+    ),
+    ("none:1", "Compression 'none' does not accept a level."),
+    ("gzip:10", "Compression level for 'gzip' must be an integer from 0 to 9."),
+    ("bz2:0", "Compression level for 'bz2' must be an integer from 1 to 9."),
+    ("xz:fast", "Compression level for 'xz' must be an integer from 0 to 9."),
+])
+def test_parse_compression_invalid(value, expected):
+    """
+    Invalid compression values should raise an error.
+    """
+    with pytest.raises(ValueError) as excinfo:
+        parse_compression(value)
+
+    assert str(excinfo.value) == expected
+
+
+def test_parse_compression_zstd_unavailable(monkeypatch):
+    """
+    Codec 'zstd' should raise an error when package 'zstandard' is not installed.
+    """
+    monkeypatch.setattr(archives, "zstandard", None)
+
+    with pytest.raises(ValueError) as excinfo:
+        parse_compression("zstd")
+
+    assert str(excinfo.value) == (
+        "Compression 'zstd' requires the package 'zstandard' to be installed."
+    )
+
+
+@pytest.mark.parametrize("filename, codec, expected", [
+    ("foo.tar.gz", "gzip", "foo.tar.gz"),
+    ("foo.tar.gz", "xz", "foo.tar.xz"),
+    ("foo.tgz", "bz2", "foo.tar.bz2"),
+    ("foo.tar.zst", "none", "foo.tar"),
+    ("foo.tar", "zstd", "foo.tar.zst"),
+    ("foo", "gzip", "foo.tar.gz"),
+    ("foo.gz", "gzip", "foo.gz.tar.gz"),
+])
+def test_replace_archive_extension(filename, codec, expected):
+    """
+    Known archive extension should be replaced with the codec one.
+    """
+    assert replace_archive_extension(filename, codec) == expected
+
+
+@pytest.mark.parametrize("data, block_size, threads, members", [
+    (b"", 10, 2, 1),
+    (b"0123456789", 10, 2, 1),
+    (b"0123456789" * 25 + b"end", 10, 3, 26),
+    (b"0123456789" * 25, 100, 1, 3),
+])
+def test_parallel_gzip_writer(data, block_size, threads, members):
+    """
+    Writer should output a multi-member gzip with a member for each block, in the
+    same order than written data.
+    """
+    output = io.BytesIO()
+
+    with ParallelGzipWriter(output, threads=threads, block_size=block_size) as writer:
+        # Write with sizes that do not match block size
+        for i in range(0, len(data), 7):
+            writer.write(data[i:i + 7])
+
+    content = output.getvalue()
+    assert output.closed is False
+    assert count_gzip_members(content) == members
+    assert gzip.decompress(content) == data
+
+
+def test_parallel_gzip_writer_uncompressed():
+    """
+    Data written in uncompressed mode should be stored as is in its own members.
+    """
+    text = b"Hello world " * 50
+    stored = os.urandom(300)
+    output = io.BytesIO()
+
+    with ParallelGzipWriter(output, threads=2, block_size=1000) as writer:
+        writer.write(text)
+        with writer.uncompressed():
+            writer.write(stored)
+        writer.write(text)
+
+    content = output.getvalue()
+    assert writer.compresslevel == 9
+    assert writer.tell() == 1500
+    assert count_gzip_members(content) == 3
+    assert stored in content
+    assert text not in content
+    assert gzip.decompress(content) == text + stored + text
+
+
+def test_parallel_gzip_writer_closed():
+    """
+    Writing on a closed writer should raise an error.
+    """
+    writer = ParallelGzipWriter(io.BytesIO(), threads=2)
+    writer.close()
+
+    with pytest.raises(ValueError):
+        writer.write(b"foo")
+
+
+@pytest.mark.skipif(shutil.which("tar") is None, reason="Command 'tar' is missing")
+def test_parallel_gzip_archive_tar(tmp_path, monkeypatch):
+    """
+    Archive compressed from threads should be readable by the 'tar' command.
+    """
+    monkeypatch.setattr(archives, "DEFAULT_GZIP_BLOCK_SIZE", 1024)
+    source = tmp_path / "sample.txt"
+    source.write_text("Hello world\n" * 1000)
+    archive_path = tmp_path / "archive.tar.gz"
+
+    with open_archive_writer(archive_path, "gzip:6", threads=4) as tar:
+        tar.add(source, arcname="sample.txt")
+
+    assert count_gzip_members(archive_path.read_bytes()) > 1
+
+    destination = tmp_path / "extracted"
+    destination.mkdir()
+    subprocess.run(
+        ["tar", "-xzf", str(archive_path), "-C", str(destination)],
+        check=True,
+    )
+    assert (destination / "sample.txt").read_text() == source.read_text()
+
+
+def test_archive_index(tmp_path, monkeypatch):
+    """
+    Indexed archive should have an index at its front to read any member on its own
+    and still be a standard gzip archive.
+    """
+    monkeypatch.setattr(archives, "DEFAULT_GZIP_BLOCK_SIZE", 1024)
+    sources = {
+        "foo.txt": b"Hello world",
+        "bar/big.bin": os.urandom(5000),
+        "bar/ping.txt": b"Ping " * 1000,
+    }
+    for name, content in sources.items():
+        (tmp_path / "sources" / name).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / "sources" / name).write_bytes(content)
+
+    archive_path = tmp_path / "archive.tar.gz"
+    with open_archive_writer(archive_path, "gzip", threads=2, indexed=True) as tar:
+        for name in sources:
+            tar.add(tmp_path / "sources" / name, arcname=name)
+
+    assert sorted([item.name for item in tmp_path.iterdir()]) == [
+        "archive.tar.gz", "sources"
+    ]
+
+    index = ArchiveIndex.read(archive_path)
+    assert sorted(index.members) == sorted(sources)
+    for name, content in sources.items():
+        assert index.read_member(name) == content
+
+    index.extract_member("bar/ping.txt", tmp_path / "extracted")
+    assert (tmp_path / "extracted" / "bar" / "ping.txt").read_bytes() == (
+        sources["bar/ping.txt"]
+    )
+
+    with pytest.raises(KeyError):
+        index.read_member("nope")
+
+    with tarfile.open(archive_path, "r:gz") as tar:
+        assert tar.getnames() == ["index.json"] + list(sources)
+
+
+def test_archive_index_none(tmp_path):
+    """
+    Archives without index should be detected.
+    """
+    source = tmp_path / "index.json"
+    source.write_text("{}")
+
+    for compression in ("gzip", "xz"):
+        archive_path = tmp_path / "archive"
+        with open_archive_writer(archive_path, compression, threads=1) as tar:
+            tar.add(source, arcname="index.json")
+
+        assert ArchiveIndex.read(archive_path) is None
+
+    with pytest.raises(ValueError):
+        with open_archive_writer(archive_path, "xz", indexed=True):
+            pass
+
+
+def test_is_compressible(tmp_path):
+    """
+    Files should be classified from their extension else from a sample compression.
+    """
+    text = tmp_path / "sample.txt"
+    text.write_text("Hello world " * 100)
+    assert is_compressible(text) is True
+
+    image = tmp_path / "sample.JPG"
+    image.write_text("Hello world " * 100)
+    assert is_compressible(image) is False
+
+    random = tmp_path / "sample.bin"
+    random.write_bytes(os.urandom(1000))
+    assert is_compressible(random) is False
+
+    # Too small to be worth a check
+    small = tmp_path / "small.bin"
+    small.write_bytes(os.urandom(100))
+    assert is_compressible(small) is True
+
+
+@pytest.mark.parametrize("compression", [
+    "gzip",
+    "gzip:1",
+    "bz2",
+    "xz:0",
+    "none",
+    pytest.param("zstd:3", marks=pytest.mark.skipif(
+        archives.zstandard is None,
+        reason="Package 'zstandard' is not installed",
+    )),
+])
+def test_archive_roundtrip(tmp_path, compression):
+    """
+    Archive written with a codec should be detected and read back.
+    """
+    source = tmp_path / "sample.txt"
+    source.write_text("Hello world")
+    archive_path = tmp_path / "archive"
+
+    with open_archive_writer(archive_path, compression) as tar:
+        tar.add(source, arcname="sample.txt")
+
+    assert detect_compression(archive_path) == compression.split(":")[0]
+
+    with open_archive_reader(archive_path) as tar:
+        member = tar.next()
+        assert member.name == "sample.txt"
+        assert tar.extractfile(member).read() == b"Hello world"
+
+
+@pytest.mark.parametrize("compression", [
+    "gzip",
+    "gzip:1",
+    "bz2",
+    "xz:0",
+    "none",
+    pytest.param("zstd:3", marks=pytest.mark.skipif(
+        archives.zstandard is None,
+        reason="Package 'zstandard' is not installed",
+    )),
+])
+@pytest.mark.parametrize("threads", [1, 2])
+def test_archive_roundtrip_stream(tmp_path, pipe_stream, compression, threads):
+    """
+    Archive should be written to and read from file objects which can not be seeked.
+    """
+    source = tmp_path / "sample.txt"
+    source.write_text("Hello world")
+    output = pipe_stream()
+
+    with open_archive_writer(output, compression, threads=threads) as tar:
+        tar.add(source, arcname="sample.txt")
+
+    content = output.getvalue()
+    assert output.closed is False
+    assert detect_compression(io.BytesIO(content)) == compression.split(":")[0]
+
+    stream = pipe_stream(content)
+    assert detect_compression(stream) == compression.split(":")[0]
+
+    with open_archive_reader(stream) as tar:
+        member = tar.next()
+        assert member.name == "sample.txt"
+        assert tar.extractfile(member).read() == b"Hello world"
+
+
+def test_archive_index_stream(tmp_path, pipe_stream):
+    """
+    Indexed archive written to a file object should have the same index than the
+    one written to a file, its members are spooled until the index is written.
+    """
+    source = tmp_path / "sample.txt"
+    source.write_text("Hello world " * 100)
+    spool_dir = tmp_path / "spool"
+    spool_dir.mkdir()
+
+    archive_path = tmp_path / "archive.tar.gz"
+    with open_archive_writer(archive_path, "gzip", threads=2, indexed=True) as tar:
+        tar.add(source, arcname="sample.txt")
+
+    output = pipe_stream()
+    with open_archive_writer(
+        output,
+        "gzip",
+        threads=2,
+        indexed=True,
+        spool_dir=spool_dir,
+    ) as tar:
+        tar.add(source, arcname="sample.txt")
+
+    assert list(spool_dir.iterdir()) == []
+
+    streamed_path = tmp_path / "streamed.tar.gz"
+    streamed_path.write_bytes(output.getvalue())
+    assert ArchiveIndex.read(streamed_path).read_member("sample.txt") == (
+        source.read_bytes()
+    )
+    assert ArchiveIndex.read(streamed_path).members == (
+        ArchiveIndex.read(archive_path).members
+    )
@@ -0,0 +1,148 @@
+import os
+import sys
+
+import pytest
+
+from diskette.utils.cache import DownloadCache, ExtractionCache, SizeCappedCache
+
+
+def test_download_cache(tmp_path):
+    """
+    Cache should store archive entries with their validators.
+    """
+    cache = DownloadCache(tmp_path / "cache")
+    url = "http://foo/archive.tar.gz"
+
+    assert cache.get(url) is None
+    assert cache.get_conditions(url) == {}
+
+    cache.get_archive_path(url).write_text("archive")
+    cache.store(
+        url,
+        etag='"v1"',
+        last_modified="Wed, 21 Oct 2015 07:28:00 GMT",
+        checksum="foo",
+    )
+
+    assert cache.get(url) == {
+        "url": url,
+        "etag": '"v1"',
+        "last_modified": "Wed, 21 Oct 2015 07:28:00 GMT",
+        "checksum": "foo",
+    }
+    assert cache.get_conditions(url) == {
+        "If-None-Match": '"v1"',
+        "If-Modified-Since": "Wed, 21 Oct 2015 07:28:00 GMT",
+    }
+    assert cache.get("http://foo/other.tar.gz") is None
+
+
+def test_download_cache_evict(tmp_path):
+    """
+    Least recently used entries should be removed once cache is over its size limit,
+    never the one just stored.
+    """
+    cache = DownloadCache(tmp_path / "cache", max_size=25)
+    urls = ["http://foo/{}.tar.gz".format(i) for i in range(4)]
+
+    for i, url in enumerate(urls[:3]):
+        cache.get_archive_path(url).write_text("0123456789")
+        cache.store(url, etag=str(i))
+        # Ensure usage times are distinct
+        os.utime(cache.get_metadata_path(url), (i, i))
+
+    # First entry was the least recently used one
+    assert [cache.get(url) is not None for url in urls[:3]] == [False, True, True]
+
+    # Use the second entry so the third one is now the least recently used
+    cache.touch(urls[1])
+    cache.get_archive_path(urls[3]).write_text("0123456789")
+    cache.store(urls[3])
+    assert [cache.get(url) is not None for url in urls] == [False, True, False, True]
+
+    # A single entry bigger than limit is still kept
+    cache.get_archive_path(urls[0]).write_text("0" * 100)
+    cache.store(urls[0])
+    assert [cache.get(url) is not None for url in urls] == [True, False, False, False]
+    assert sorted([item.name for item in cache.directory.iterdir()]) == sorted([
+        cache.get_archive_path(urls[0]).name,
+        cache.get_metadata_path(urls[0]).name,
+    ])
+
+
+def test_size_capped_cache_abstract(tmp_path):
+    """
+    A cache class which does not implement entries listing and removal should not
+    be instanciable.
+    """
+    class IncompleteCache(SizeCappedCache):
+        def entries(self):
+            return []
+
+    with pytest.raises(TypeError):
+        IncompleteCache(tmp_path / "cache")
+
+
+def test_cache(tmp_path):
+    """
+    Extracted directories should be stored as entries keyed by checksum and evicted
+    from the least recently used one.
+    """
+    cache = ExtractionCache(tmp_path / "cache", max_size=25)
+    keys = ["ping", "pong", "pang"]
+
+    with cache.lock("ping") as directory:
+        assert directory is None
+
+    for i, key in enumerate(keys[:2]):
+        tmpdir = cache.make_tmpdir()
+        (tmpdir / "foo.txt").write_text("0123456789")
+        with cache.store(key, tmpdir) as directory:
+            assert directory == cache.get_path(key)
+        assert tmpdir.exists() is False
+        # Ensure usage times are distinct
+        os.utime(cache.get_metadata_path(key), (i, i))
+
+    with cache.lock("ping") as directory:
+        assert (directory / "foo.txt").read_text() == "0123456789"
+
+    # An entry stored meanwhile by another process is kept as is
+    tmpdir = cache.make_tmpdir()
+    (tmpdir / "foo.txt").write_text("Nope")
+    with cache.store("ping", tmpdir) as directory:
+        assert directory == cache.get_path("ping")
+    assert tmpdir.exists() is False
+    assert (cache.get("ping") / "foo.txt").read_text() == "0123456789"
+
+    # Entry usage has been recorded so the second entry is now the least recently
+    # used one
+    tmpdir = cache.make_tmpdir()
+    (tmpdir / "foo.txt").write_text("0123456789")
+    with cache.store("pang", tmpdir):
+        cache.evict(keep="pang")
+    assert [cache.get(key) is not None for key in keys] == [True, False, True]
+    assert sorted([item.name for item in cache.directory.iterdir()]) == [
+        "pang", "pang.json", "ping", "ping.json"
+    ]
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Locks require module 'fcntl'")
+def test_cache_locked(tmp_path):
+    """
+    An entry in use should not be evicted, even when cache stays over its size
+    limit.
+    """
+    cache = ExtractionCache(tmp_path / "cache", max_size=5)
+
+    for key in ["ping", "pong"]:
+        tmpdir = cache.make_tmpdir()
+        (tmpdir / "foo.txt").write_text("0123456789")
+        with cache.store(key, tmpdir):
+            pass
+
+    with cache.lock("ping") as directory:
+        assert cache.evict() == ["pong"]
+        assert (directory / "foo.txt").exists() is True
+
+    assert cache.evict() == ["ping"]
+    assert cache.entries() == []
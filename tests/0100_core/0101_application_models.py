@@ -123,6 +123,10 @@ def test_application_valid_basic():
         "natural_primary": False,
         "use_base_manager": False,
         "filename": "site-objects.json",
+        "chunk_size": None,
+        "pagination": None,
+        "partitions": None,
+        "serializer": None,
     }
 
     assert app_foo.as_options() == {
@@ -177,6 +181,10 @@ def test_application_valid_full():
         "natural_primary": True,
         "use_base_manager": True,
         "filename": "ping_pong.json",
+        "chunk_size": None,
+        "pagination": None,
+        "partitions": None,
+        "serializer": None,
     }
     assert app_ping.as_options() == {
         "models": [
@@ -223,6 +231,10 @@ def test_drain_payload():
         "natural_primary": False,
         "use_base_manager": False,
         "filename": "foobar.json",
+        "chunk_size": None,
+        "pagination": None,
+        "partitions": None,
+        "serializer": None,
     }
     assert app.as_options() == {
         "models": [],
@@ -232,3 +244,126 @@ def test_drain_payload():
         "use_base_manager": False,
         "filename": "foobar.json",
     }
+
+
+@pytest.mark.parametrize("options, expected", [
+    (
+        {"chunk_size": 0},
+        "<ApplicationConfig: foo>: 'chunk_size' must be a positive integer.",
+    ),
+    (
+        {"chunk_size": "42"},
+        "<ApplicationConfig: foo>: 'chunk_size' must be a positive integer.",
+    ),
+    (
+        {"pagination": "offset"},
+        (
+            "<ApplicationConfig: foo>: Given pagination 'offset' is not allowed, it "
+            "must be one of: cursor, keyset"
+        ),
+    ),
+    (
+        {"serializer": "nope"},
+        (
+            "<ApplicationConfig: foo>: Given serializer 'nope' is not allowed, it "
+            "must be one of: django, values"
+        ),
+    ),
+    (
+        {"serializer": "values", "filename": "foo.xml"},
+        (
+            "<ApplicationConfig: foo>: Serializer 'values' only supports these "
+            "formats: json, jsonl"
+        ),
+    ),
+    (
+        {"serializer": "values", "natural_foreign": True},
+        "<ApplicationConfig: foo>: Serializer 'values' does not support natural keys.",
+    ),
+    (
+        {"pagination": "keyset", "dump_command": "custom-dumpdata"},
+        (
+            "<ApplicationConfig: foo>: Dump tuning options can not be used with "
+            "custom dump command 'custom-dumpdata', only these ones support them: "
+            "diskette_dumpdata, polymorphic_dumpdata"
+        ),
+    ),
+])
+def test_application_invalid_tuning(options, expected):
+    """
+    Application should raise an error for invalid dump tuning options.
+    """
+    app = ApplicationConfig("foo", models=["auth"], **options)
+
+    with pytest.raises(ApplicationConfigError) as excinfo:
+        app.validate()
+
+    assert str(excinfo.value) == expected
+
+
+@pytest.mark.parametrize("options, expected", [
+    ({}, None),
+    ({"dump_command": "polymorphic_dumpdata"}, "polymorphic_dumpdata"),
+    ({"chunk_size": 500}, "diskette_dumpdata"),
+    ({"pagination": "keyset"}, "diskette_dumpdata"),
+    (
+        {"pagination": "keyset", "dump_command": "polymorphic_dumpdata"},
+        "polymorphic_dumpdata"
+    ),
+])
+def test_application_effective_dump_command(options, expected):
+    """
+    Application with tuning options should use the Diskette dump command except if
+    it defines its own one.
+    """
+    app = ApplicationConfig("foo", models=["auth"], **options)
+    app.validate()
+
+    assert app.effective_dump_command == expected
+
+
+@pytest.mark.parametrize("options, expected", [
+    (
+        {"models": ["auth.User"], "partitions": 1},
+        "<ApplicationConfig: foo>: 'partitions' must be an integer greater than 1.",
+    ),
+    (
+        {"models": ["auth"], "partitions": 2},
+        (
+            "<ApplicationConfig: foo>: 'partitions' can only be used with an "
+            "application that includes a single model."
+        ),
+    ),
+])
+def test_application_invalid_partitions(options, expected):
+    """
+    Application should raise an error for invalid partitions.
+    """
+    app = ApplicationConfig("foo", **options)
+
+    with pytest.raises(ApplicationConfigError) as excinfo:
+        app.validate()
+
+    assert str(excinfo.value) == expected
+
+
+@pytest.mark.parametrize("partitions, expected", [
+    (None, ["foo.json"]),
+    (3, ["foo_part1.json", "foo_part2.json", "foo_part3.json"]),
+    (10, ["foo_part01.json", "foo_part02.json", "foo_part10.json"]),
+])
+def test_application_partitions_filenames(partitions, expected):
+    """
+    Partitioned application should have a filename for each shard.
+    """
+    app = ApplicationConfig("foo", models=["auth.User"], partitions=partitions)
+    app.validate()
+
+    filenames = app.filenames
+    if partitions == 10:
+        filenames = filenames[:2] + filenames[-1:]
+
+    assert filenames == expected
+    assert app.effective_dump_command == (
+        "diskette_dumpdata" if partitions else None
+    )
@@ -1,10 +1,18 @@
 import json
 import logging
+from io import StringIO
 
+import pytest
 from freezegun import freeze_time
 
+from django.contrib.sites.models import Site
+from django.core import serializers
+from django.db import connection
+
 from diskette.core.applications import ApplicationConfig
-from diskette.core.serializers import DumpdataSerializer, LoaddataSerializer
+from diskette.core.serializers import (
+    DumpdataSerializer, LoaddataSerializer, jsonstream
+)
 from diskette.factories import UserFactory
 from diskette.utils.loggers import LoggingOutput
 
@@ -23,6 +31,18 @@ def test_dump_command(db, tmp_path):
     app_foo = ApplicationConfig("Site objects", ["sites"])
     assert serializer.command(app_foo) == "dumpdata sites.Site"
 
+    app_bar = ApplicationConfig(
+        "Site objects", ["sites"], chunk_size=500, pagination="keyset"
+    )
+    assert serializer.command(app_bar) == (
+        "diskette_dumpdata sites.Site --chunk-size=500 --pagination=keyset"
+    )
+
+    app_values = ApplicationConfig("Site objects", ["sites"], serializer="values")
+    assert serializer.command(app_values) == (
+        "diskette_dumpdata sites.Site --serializer=values"
+    )
+
 
 @freeze_time("2012-10-15 10:00:00")
 def test_dump_call(db, tmp_path):
@@ -128,3 +148,141 @@ def test_load_command_false_option(db, tests_settings, tmp_path):
     assert command == (
         "loaddata {}/django-site.json --exclude foo --exclude bar"
     ).format(data_samples)
+
+
+def test_load_command_bulk(tests_settings):
+    """
+    Serializer should build the Diskette load command for the bulk engine.
+    """
+    data_samples = tests_settings.fixtures_path / "data_samples"
+
+    serializer = LoaddataSerializer()
+
+    dump = data_samples / "django-site.json"
+
+    assert serializer.command(dump, engine="bulk", batch_size=50) == (
+        "diskette_loaddata {}/django-site.json --batch-size=50".format(data_samples)
+    )
+
+    # Batch size is ignored with default engine
+    assert serializer.command(dump, engine="loaddata", batch_size=50) == (
+        "loaddata {}/django-site.json".format(data_samples)
+    )
+
+
+def test_load_call_bulk(db, tests_settings):
+    """
+    Serializer should load data with the bulk engine.
+    """
+    data_samples = tests_settings.fixtures_path / "data_samples"
+
+    serializer = LoaddataSerializer()
+
+    assert serializer.call(
+        data_samples / "django-site.json",
+        engine="bulk",
+        batch_size=1,
+    ) == "Installed 2 object(s) from 1 fixture(s)"
+
+    assert Site.objects.count() == 2
+
+
+def test_dump_call_stream(db):
+    """
+    Serializer should write dump to the given stream instead of returning it.
+    """
+    serializer = DumpdataSerializer()
+
+    app_site = ApplicationConfig("Site objects", ["sites"])
+    with StringIO() as stream:
+        results = serializer.call(app_site, stream=stream)
+        content = stream.getvalue()
+
+    assert json.loads(results) == {"stream": "site-objects.json"}
+    assert json.loads(content) == [
+        {
+            "model": "sites.site",
+            "pk": 1,
+            "fields": {
+                "domain": "example.com",
+                "name": "example.com"
+            }
+        }
+    ]
+
+
+def test_dump_call_tuned(db):
+    """
+    Serializer should use the Diskette dump command with tuning options from
+    application and return the same content than with Django dumpdata.
+    """
+    serializer = DumpdataSerializer()
+
+    users = [UserFactory() for i in range(3)]
+
+    app_legacy = ApplicationConfig("Django auth", ["auth.User"])
+    app_tuned = ApplicationConfig(
+        "Django auth", ["auth.User"], chunk_size=2, pagination="keyset"
+    )
+
+    assert serializer.get_command_name(app_tuned) == "diskette_dumpdata"
+
+    results = serializer.call(app_tuned)
+    assert json.loads(results) == json.loads(serializer.call(app_legacy))
+    assert [item["pk"] for item in json.loads(results)] == [
+        item.pk for item in users
+    ]
+
+
+@pytest.mark.parametrize("conflict_updates", [True, False])
+def test_load_call_bulk_twice(db, monkeypatch, tests_settings, conflict_updates):
+    """
+    Loading the same dump twice with the bulk engine should update the existing
+    objects, also when database does not support conflict updates.
+    """
+    if not conflict_updates:
+        monkeypatch.setattr(
+            connection.features, "supports_update_conflicts", False, raising=False
+        )
+
+    data_samples = tests_settings.fixtures_path / "data_samples"
+    serializer = LoaddataSerializer()
+
+    for i in range(2):
+        assert serializer.call(
+            data_samples / "django-site.json",
+            engine="bulk",
+            batch_size=1,
+        ) == "Installed 2 object(s) from 1 fixture(s)"
+
+        Site.objects.filter(pk=2).update(name="Changed")
+
+    serializer.call(data_samples / "django-site.json", engine="bulk")
+
+    assert Site.objects.count() == 2
+    assert Site.objects.get(pk=2).name == "The batcave"
+
+
+def test_load_call_streaming(db, monkeypatch, tests_settings):
+    """
+    JSON fixtures should be loaded with the streaming deserializer from the default
+    engine and the previous JSON serialization module should be restored after.
+    """
+    data_samples = tests_settings.fixtures_path / "data_samples"
+    previous = serializers.get_serializer("json")
+    calls = []
+
+    def spy(stream_or_string, **options):
+        calls.append(stream_or_string)
+        return deserializer(stream_or_string, **options)
+
+    deserializer = jsonstream.Deserializer
+    monkeypatch.setattr(jsonstream, "Deserializer", spy)
+
+    assert LoaddataSerializer().call(data_samples / "django-site.json") == (
+        "Installed 2 object(s) from 1 fixture(s)"
+    )
+
+    assert len(calls) == 1
+    assert Site.objects.count() == 2
+    assert serializers.get_serializer("json") is previous
@@ -0,0 +1,101 @@
+import json
+from io import StringIO
+
+import pytest
+
+from django.contrib.auth.models import Group, User
+from django.core import management
+
+from sandbox.djangoapp_sample.factories import (
+    ArticleFactory, BlogFactory, CategoryFactory
+)
+from sandbox.djangoapp_sample.models import Article, Blog, Category
+
+from diskette.core.serializers.values import ValuesSerializer
+from diskette.factories import UserFactory
+
+
+@pytest.fixture
+def values_samples(db):
+    """
+    Create some objects with foreign keys and many to many relations.
+    """
+    group = Group.objects.create(name="Editors")
+    picsou = UserFactory(first_name="Pîcsou")
+    picsou.groups.add(group)
+    UserFactory()
+
+    blog = BlogFactory()
+    categories = [
+        CategoryFactory(title=title)
+        for title in ("Zoo", "Aquarium", "Museum")
+    ]
+    ArticleFactory(blog=blog, author=picsou, fill_categories=categories)
+    ArticleFactory(blog=blog, fill_categories=categories[1:])
+    ArticleFactory(blog=blog)
+
+
+@pytest.mark.parametrize("format, indent", [
+    ("json", None),
+    ("json", 4),
+    ("jsonl", None),
+])
+def test_values_serializer_output(values_samples, tmp_path, format, indent):
+    """
+    Serializer output should be identical to the Django dumpdata one.
+    """
+    output = tmp_path / "dump.{}".format(format)
+
+    management.call_command(
+        "dumpdata",
+        *["auth.Group", "auth.User", "djangoapp_sample"],
+        format=format,
+        indent=indent,
+        output=output,
+    )
+    expected = output.read_text()
+
+    serializer = ValuesSerializer(format=format, indent=indent, chunk_size=2)
+    with StringIO() as out:
+        serializer.serialize(
+            [
+                model.objects.order_by("pk")
+                for model in (Group, User, Blog, Category, Article)
+            ],
+            out
+        )
+        content = out.getvalue()
+
+    assert content == expected
+
+
+@pytest.mark.parametrize("pagination", ["cursor", "keyset"])
+def test_values_serializer_m2m_queries(values_samples, django_assert_num_queries,
+                                       pagination):
+    """
+    Many to many values should be read with a single query for each chunk.
+    """
+    serializer = ValuesSerializer(chunk_size=2, pagination=pagination)
+
+    # Keyset pagination performs a query for each page instead of a single cursor
+    queries = 3 if pagination == "cursor" else 4
+
+    with StringIO() as out:
+        with django_assert_num_queries(queries):
+            serializer.serialize([Article.objects.order_by("pk")], out)
+        dump = json.loads(out.getvalue())
+
+    assert [len(item["fields"]["categories"]) for item in dump] == [3, 2, 0]
+    assert [item["fields"]["categories"] for item in dump][0] == [
+        item.pk for item in Category.objects.order_by("title")
+    ]
+
+
+def test_values_serializer_invalid_format():
+    """
+    Serializer should refuse formats it does not implement.
+    """
+    with pytest.raises(ValueError) as excinfo:
+        ValuesSerializer(format="xml")
+
+    assert str(excinfo.value) == "Values serializer does not support format: xml"
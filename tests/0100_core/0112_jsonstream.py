@@ -0,0 +1,52 @@
+import io
+
+import pytest
+
+from django.core import serializers
+from django.core.serializers.base import DeserializationError
+
+from diskette.core.serializers import jsonstream
+
+
+@pytest.mark.parametrize("filename", [
+    "django-site.json",
+    "django-auth.json",
+    "blog-sample.json",
+])
+def test_jsonstream_deserializer(db, tests_settings, filename):
+    """
+    Streaming deserializer should return the same objects than Django JSON
+    deserializer from text or binary streams and strings.
+    """
+    path = tests_settings.fixtures_path / "data_samples" / filename
+    options = {"handle_forward_references": True}
+
+    expected = [
+        (item.object.__class__, item.object.pk, item.m2m_data)
+        for item in serializers.deserialize("json", path.read_text(), **options)
+    ]
+
+    for source in (
+        path.open("r"),
+        path.open("rb"),
+        path.read_text(),
+        path.read_bytes(),
+    ):
+        assert [
+            (item.object.__class__, item.object.pk, item.m2m_data)
+            for item in jsonstream.Deserializer(source, **options)
+        ] == expected
+
+        if isinstance(source, io.IOBase):
+            source.close()
+
+
+def test_jsonstream_deserializer_invalid(db):
+    """
+    Invalid content should raise a deserialization error.
+    """
+    with pytest.raises(DeserializationError):
+        list(jsonstream.Deserializer("[{\"model\": \"sites.site\", \"pk\": 1}"))
+
+    with pytest.raises(DeserializationError):
+        list(jsonstream.Deserializer("[{\"model\": \"nope.nope\", \"pk\": 1}]"))
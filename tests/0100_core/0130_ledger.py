@@ -0,0 +1,71 @@
+from diskette.core.ledger import LoadLedger
+
+
+def test_ledger_archive(tmp_path):
+    """
+    Archive should be known as loaded only when a previous load of the same archive
+    covered at least the required scope.
+    """
+    path = tmp_path / "ledger.json"
+    ledger = LoadLedger(path, database="foo")
+
+    assert ledger.is_archive_loaded("ping") is False
+    assert path.exists() is False
+
+    ledger.record_archive("ping", data_exclusions=["django-auth.json"])
+    ledger = LoadLedger(path, database="foo")
+
+    assert ledger.is_archive_loaded("ping") is False
+    assert ledger.is_archive_loaded("pong", data_exclusions=["django-auth.json"]) is (
+        False
+    )
+    assert ledger.is_archive_loaded("ping", data_exclusions=["django-auth.json"]) is (
+        True
+    )
+    assert ledger.is_archive_loaded("ping", with_data=False) is True
+    assert ledger.is_archive_loaded(
+        "ping",
+        data_exclusions=["django-auth.json", "django-site.json"],
+    ) is True
+
+    ledger.record_archive("ping", with_storages=False)
+    assert ledger.is_archive_loaded("ping") is False
+    assert ledger.is_archive_loaded("ping", with_storages=False) is True
+
+    ledger.start_archive()
+    assert LoadLedger(path, database="foo").is_archive_loaded(
+        "ping", with_storages=False
+    ) is False
+
+
+def test_ledger_contents(tmp_path):
+    """
+    Ledger should record loaded dumps and storages, a ledger from another database
+    should be ignored.
+    """
+    path = tmp_path / "ledger.json"
+    dump = tmp_path / "django-site.json"
+    dump.write_text("[]")
+
+    ledger = LoadLedger(path, database="foo")
+    assert ledger.is_data_loaded(dump) is False
+    assert ledger.is_storage_loaded("media", "ping") is False
+
+    ledger.record_data(dump)
+    ledger.record_storage("media", "ping")
+
+    ledger = LoadLedger(path, database="foo")
+    assert ledger.is_data_loaded(dump) is True
+    assert ledger.is_storage_loaded("media", "ping") is True
+    assert ledger.is_storage_loaded("media", "pong") is False
+
+    dump.write_text("[{}]")
+    assert LoadLedger(path, database="foo").is_data_loaded(dump) is False
+
+    ledger = LoadLedger(path, database="bar")
+    assert ledger.content == {
+        "database": "bar",
+        "archive": None,
+        "datas": {},
+        "storages": {},
+    }
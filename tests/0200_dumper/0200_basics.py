@@ -133,7 +133,11 @@ def test_exported_dicts():
             "dump_command": "custom_dumpdata",
             "filename": "djangocontribsites.json",
             "is_drain": False,
-            "allow_drain": False
+            "allow_drain": False,
+            "chunk_size": None,
+            "pagination": None,
+            "partitions": None,
+            "serializer": None
         },
         {
             "name": "django.contrib.auth",
@@ -159,7 +163,11 @@ def test_exported_dicts():
             "dump_command": None,
             "filename": "djangocontribauth.json",
             "is_drain": False,
-            "allow_drain": False
+            "allow_drain": False,
+            "chunk_size": None,
+            "pagination": None,
+            "partitions": None,
+            "serializer": None
         },
         {
             "name": "blog",
@@ -183,7 +191,11 @@ def test_exported_dicts():
             "dump_command": None,
             "filename": "blog.json",
             "is_drain": False,
-            "allow_drain": True
+            "allow_drain": True,
+            "chunk_size": None,
+            "pagination": None,
+            "partitions": None,
+            "serializer": None
         }
     ]
 
@@ -287,6 +299,7 @@ def test_build_dump_manifest(mocked_version, tmp_path, tests_settings):
     assert manifest == {
         "version": "0.0.0-test",
         "creation": "2012-10-15T10:00:00",
+        "compression": "gzip",
         "datas": [
             "data/users.json",
             "data/foo-bar.json"
@@ -294,5 +307,7 @@ def test_build_dump_manifest(mocked_version, tmp_path, tests_settings):
         "storages": [
             "storages/storage-1",
             "storages/storage-2"
-        ]
+        ],
+        "stored_files": None,
+        "sections": None,
     }
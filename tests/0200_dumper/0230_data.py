@@ -1,5 +1,6 @@
 import json
 
+import pytest
 from freezegun import freeze_time
 
 from sandbox.djangoapp_sample.factories import (
@@ -7,6 +8,7 @@ from sandbox.djangoapp_sample.factories import (
 )
 
 from diskette.core.dumper import Dumper
+from diskette.exceptions import DumperError
 from diskette.factories import UserFactory
 
 
@@ -283,3 +285,133 @@ def test_dump_data_drained(db, tmp_path):
             ]
         ),
     ]
+
+
+@freeze_time("2012-10-15 10:00:00")
+def test_dump_data_jobs(db, tmp_path):
+    """
+    With jobs, applications should be dumped from worker processes and results should
+    respect the application order.
+    """
+    picsou = UserFactory()
+    blog = BlogFactory()
+
+    manager = Dumper([
+        ("Django auth", {"models": ["auth.User"]}),
+        ("Django site", {"models": ["sites"]}),
+        ("Blog sample", {"models": ["djangoapp_sample.Blog"]}),
+    ])
+    results = manager.dump_data(destination=tmp_path, jobs=2)
+
+    assert [k for k, v in results] == ["Django auth", "Django site", "Blog sample"]
+    assert [json.loads(v) for k, v in results] == [
+        {"destination": str(tmp_path / "django-auth.json")},
+        {"destination": str(tmp_path / "django-site.json")},
+        {"destination": str(tmp_path / "blog-sample.json")},
+    ]
+
+    assert [
+        item["pk"]
+        for item in json.loads((tmp_path / "django-auth.json").read_text())
+    ] == [picsou.id]
+    assert [
+        item["pk"]
+        for item in json.loads((tmp_path / "blog-sample.json").read_text())
+    ] == [blog.id]
+
+    # Results without destination are returned from workers too
+    results = manager.dump_data(jobs=2)
+    assert [
+        (k, [item["model"] for item in json.loads(v)])
+        for k, v in results
+    ] == [
+        ("Django auth", ["auth.user"]),
+        ("Django site", ["sites.site"]),
+        ("Blog sample", ["djangoapp_sample.blog"]),
+    ]
+
+
+def test_dump_data_jobs_failure(db, tmp_path):
+    """
+    An error from a worker should be reported as a dumper error.
+    """
+    manager = Dumper([
+        ("Django auth", {"models": ["auth.User"]}),
+        ("Django site", {"models": ["sites"], "dump_command": "nope_dumpdata"}),
+    ])
+
+    with pytest.raises(DumperError) as excinfo:
+        manager.dump_data(destination=tmp_path, jobs=2)
+
+    assert str(excinfo.value).startswith(
+        "Data dump for application 'Django site' has failed:"
+    )
+
+
+@pytest.mark.parametrize("jobs", [None, 2])
+def test_dump_data_partitions(db, tmp_path, jobs):
+    """
+    A partitioned application should be dumped in shards with primary key ranges
+    which cover every objects without duplicates.
+    """
+    users = [UserFactory() for i in range(7)]
+
+    manager = Dumper([
+        ("Django site", {"models": ["sites"]}),
+        ("Django auth", {"models": ["auth.User"], "partitions": 3}),
+    ])
+    manager.validate_applications()
+
+    assert [
+        (app.name, shard[0] if shard else None)
+        for app, shard in manager.get_dump_tasks()
+    ] == [
+        ("Django site", None),
+        ("Django auth", 1),
+        ("Django auth", 2),
+        ("Django auth", 3),
+    ]
+
+    results = manager.dump_data(destination=tmp_path, jobs=jobs)
+
+    assert [k for k, v in results] == [
+        "Django site", "Django auth", "Django auth", "Django auth"
+    ]
+    assert [json.loads(v) for k, v in results] == [
+        {"destination": str(tmp_path / "django-site.json")},
+        {"destination": str(tmp_path / "django-auth_part1.json")},
+        {"destination": str(tmp_path / "django-auth_part2.json")},
+        {"destination": str(tmp_path / "django-auth_part3.json")},
+    ]
+
+    shards = [
+        [
+            item["pk"]
+            for item in json.loads((tmp_path / filename).read_text())
+        ]
+        for filename in manager.apps[1].filenames
+    ]
+    assert [len(item) for item in shards] == [2, 2, 3]
+    assert [pk for shard in shards for pk in shard] == [item.id for item in users]
+
+    assert manager.get_manifest_payload()["datas"] == [
+        "data/django-site.json",
+        "data/django-auth_part1.json",
+        "data/django-auth_part2.json",
+        "data/django-auth_part3.json",
+    ]
+
+
+def test_dump_data_partitions_empty(db, tmp_path):
+    """
+    Partitioned application for an empty table should still write every shards.
+    """
+    manager = Dumper([
+        ("Django auth", {"models": ["auth.User"], "partitions": 2}),
+    ])
+
+    results = manager.dump_data(destination=tmp_path)
+
+    assert len(results) == 2
+    assert json.loads((tmp_path / "django-auth_part1.json").read_text()) == []
+    assert json.loads((tmp_path / "django-auth_part2.json").read_text()) == []
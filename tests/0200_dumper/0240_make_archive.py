@@ -1,10 +1,16 @@
+import json
 import tarfile
 
 import pytest
 from freezegun import freeze_time
 
 from diskette.core.dumper import Dumper
+from diskette.exceptions import DumperError
 from diskette.factories import UserFactory
+from diskette.utils.archives import (
+    ArchiveIndex, detect_compression, open_archive_reader
+)
+from diskette.utils.hashs import file_checksum
 
 
 @pytest.fixture(scope="function")
@@ -58,9 +64,9 @@ def test_archive_data(mocked_version, tmp_path, archive_initials):
 
     # Check expected archived files are all there with their expected size
     assert archived == [
+        ("manifest.json", 202),
         ("data/django-auth.json", 328),
         ("data/django-site.json", 94),
-        ("manifest.json", 139),
     ]
 
     assert archive_path.name == "foo_data.tar.gz"
@@ -89,6 +95,7 @@ def test_archive_storages(mocked_version, tmp_path, archive_initials):
 
     # Check expected archived files are all there with their expected size
     assert archived == [
+        ("manifest.json", 250),
         ("tests/data_fixtures/storage_samples/storage-1/blue.png", 1543),
         ("tests/data_fixtures/storage_samples/storage-1/sample.txt", 11),
         ("tests/data_fixtures/storage_samples/storage-1/foo/foo_sample.txt", 3),
@@ -98,7 +105,6 @@ def test_archive_storages(mocked_version, tmp_path, archive_initials):
         ("tests/data_fixtures/storage_samples/storage-1/plop/green.png", 1681),
         ("tests/data_fixtures/storage_samples/storage-2/pong/sample.nope", 11),
         ("tests/data_fixtures/storage_samples/storage-2/ping/grey.png", 1646),
-        ("manifest.json", 187),
     ]
 
     assert archive_path.name == "foo_storages.tar.gz"
@@ -136,6 +142,7 @@ def test_archive_all(mocked_version, tmp_path, archive_initials):
 
     # Check expected archived files are all there with their expected size
     assert archived == [
+        ("manifest.json", 296),
         ("data/django-auth.json", 328),
         ("data/django-site.json", 94),
         ("tests/data_fixtures/storage_samples/storage-1/blue.png", 1543),
@@ -147,7 +154,6 @@ def test_archive_all(mocked_version, tmp_path, archive_initials):
         ("tests/data_fixtures/storage_samples/storage-1/plop/green.png", 1681),
         ("tests/data_fixtures/storage_samples/storage-2/pong/sample.nope", 11),
         ("tests/data_fixtures/storage_samples/storage-2/ping/grey.png", 1646),
-        ("manifest.json", 233),
     ]
 
     assert archive_path.name == "foo_data_storages.tar.gz"
@@ -187,11 +193,274 @@ def test_archive_excludes(mocked_version, tmp_path, archive_initials):
 
     # Check expected archived files are all there with their expected size
     assert archived == [
+        ("manifest.json", 296),
         ("data/django-auth.json", 328),
         ("data/django-site.json", 94),
         ("tests/data_fixtures/storage_samples/storage-1/blue.png", 1543),
         ("tests/data_fixtures/storage_samples/storage-1/sample.txt", 11),
         ("tests/data_fixtures/storage_samples/storage-1/foo/grass.png", 1659),
         ("tests/data_fixtures/storage_samples/storage-2/ping/grey.png", 1646),
-        ("manifest.json", 233),
     ]
+
+
+@pytest.mark.parametrize("compression, threads, streaming, filename", [
+    ("gzip:1", 1, False, "foo_data.tar.gz"),
+    ("gzip", 4, False, "foo_data.tar.gz"),
+    ("gzip:6", 4, True, "foo_data.tar.gz"),
+    ("bz2", None, False, "foo_data.tar.bz2"),
+    ("xz:0", None, True, "foo_data.tar.xz"),
+    ("none", None, True, "foo_data.tar"),
+])
+def test_archive_compression(tmp_path, archive_initials, compression, threads,
+                             streaming, filename):
+    """
+    Archive should be compressed with the given codec which is recorded in manifest
+    and archive filename extension.
+    """
+    manager = Dumper(
+        [("Django site", {"models": ["sites"]})],
+        compression=compression,
+        compression_threads=threads,
+    )
+    manager.validate()
+    archive_path = manager.make_archive(
+        tmp_path,
+        "foo{features}.tar.gz",
+        with_storages=False,
+        streaming=streaming,
+    )
+
+    assert archive_path.name == filename
+    assert detect_compression(archive_path) == compression.split(":")[0]
+
+    with open_archive_reader(archive_path) as archive:
+        contents = {
+            tarinfo.name: archive.extractfile(tarinfo).read()
+            for tarinfo in archive
+            if tarinfo.isfile()
+        }
+
+    assert json.loads(contents["manifest.json"])["compression"] == (
+        compression.split(":")[0]
+    )
+    assert json.loads(contents["data/django-site.json"])[0]["model"] == "sites.site"
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_archive_store_incompressible(tmp_path, archive_initials, streaming):
+    """
+    Incompressible storage files should be appended last without compression and
+    listed in manifest.
+    """
+    manager = Dumper(
+        [],
+        storages=archive_initials["storages"],
+        compression_threads=1,
+        store_incompressible=True,
+    )
+    manager.validate()
+    archive_path = manager.make_archive(
+        tmp_path,
+        "foo{features}.tar.gz",
+        with_data=False,
+        streaming=streaming,
+    )
+
+    with open_archive_reader(archive_path) as archive:
+        contents = {
+            tarinfo.name: archive.extractfile(tarinfo).read()
+            for tarinfo in archive
+            if tarinfo.isfile()
+        }
+
+    images = [
+        "tests/data_fixtures/storage_samples/storage-1/blue.png",
+        "tests/data_fixtures/storage_samples/storage-1/foo/grass.png",
+        "tests/data_fixtures/storage_samples/storage-1/plop/green.png",
+        "tests/data_fixtures/storage_samples/storage-2/ping/grey.png",
+    ]
+    # Walk order depends on filesystem
+    names = [name for name in contents if name != "manifest.json"]
+    assert len(names) == 9
+    assert sorted(names[-4:]) == images
+    assert sorted(json.loads(contents["manifest.json"])["stored_files"]) == images
+
+    # Stored files are written as is
+    archive_content = archive_path.read_bytes()
+    for name in images:
+        assert contents[name] == (archive_initials["storage_samples_path"].parent / (
+            name.split("data_fixtures/")[1]
+        )).read_bytes()
+        assert contents[name] in archive_content
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_archive_sections(tmp_path, archive_initials, streaming):
+    """
+    With the sections layout, data and each storage should be archives compressed
+    on their own inside an uncompressed archive.
+    """
+    manager = Dumper(
+        [("Django site", {"models": ["sites"]})],
+        storages=archive_initials["storages"],
+        storages_basepath=archive_initials["storage_samples_path"],
+        compression="xz",
+        layout="sections",
+    )
+    manager.validate()
+    archive_path = manager.make_archive(
+        tmp_path,
+        "foo{features}.tar.gz",
+        streaming=streaming,
+    )
+
+    assert archive_path.name == "foo_data_storages.tar"
+    assert detect_compression(archive_path) == "none"
+    assert [item.name for item in tmp_path.iterdir()] == ["foo_data_storages.tar"]
+
+    with tarfile.open(archive_path, "r:") as archive:
+        assert archive.getnames() == [
+            "manifest.json",
+            "sections/data.tar.xz",
+            "sections/storage-1.tar.xz",
+            "sections/storage-2.tar.xz",
+        ]
+        manifest = json.load(archive.extractfile("manifest.json"))
+
+        sections = {}
+        for name in archive.getnames()[1:]:
+            with open_archive_reader(archive.extractfile(name)) as section:
+                sections[name] = sorted(section.getnames())
+
+    assert manifest["sections"] == {
+        "data": "sections/data.tar.xz",
+        "storages": {
+            "storage-1": "sections/storage-1.tar.xz",
+            "storage-2": "sections/storage-2.tar.xz",
+        },
+    }
+    assert sections["sections/data.tar.xz"][-1] == "data/django-site.json"
+    assert sections["sections/storage-2.tar.xz"] == [
+        "storage-2/ping/grey.png",
+        "storage-2/pong/sample.nope",
+    ]
+    assert len(sections["sections/storage-1.tar.xz"]) == 7
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_archive_indexed(tmp_path, archive_initials, streaming):
+    """
+    With the indexed layout, archive should start with an index to read any member
+    on its own.
+    """
+    manager = Dumper(
+        [("Django site", {"models": ["sites"]})],
+        storages=archive_initials["storages"],
+        storages_basepath=archive_initials["storage_samples_path"],
+        layout="indexed",
+    )
+    manager.validate()
+    archive_path = manager.make_archive(
+        tmp_path,
+        "foo{features}.tar.gz",
+        streaming=streaming,
+    )
+
+    assert archive_path.name == "foo_data_storages.tar.gz"
+    assert [item.name for item in tmp_path.iterdir()] == ["foo_data_storages.tar.gz"]
+
+    index = ArchiveIndex.read(archive_path)
+    manifest = json.loads(index.read_member("manifest.json"))
+    assert manifest["datas"] == ["data/django-site.json"]
+    assert json.loads(
+        index.read_member("data/django-site.json")
+    )[0]["model"] == "sites.site"
+    assert index.read_member("storage-2/pong/sample.nope") == (
+        archive_initials["storages"][1] / "pong" / "sample.nope"
+    ).read_bytes()
+
+    with tarfile.open(archive_path, "r:gz") as archive:
+        assert archive.getnames()[0] == "index.json"
+        assert sorted(archive.getnames()[1:]) == sorted(index.members)
+
+
+@pytest.mark.parametrize("layout", ["single", "sections", "indexed"])
+@pytest.mark.parametrize("streaming", [False, True])
+def test_archive_checksum(tmp_path, archive_initials, layout, streaming):
+    """
+    Archive checksum should be computed while archive is written and be the same
+    than the checksum of the written file.
+    """
+    manager = Dumper(
+        [("Django site", {"models": ["sites"]})],
+        storages=archive_initials["storages"],
+        storages_basepath=archive_initials["storage_samples_path"],
+        layout=layout,
+    )
+    manager.validate()
+    assert manager.checksum is None
+
+    archive_path = manager.make_archive(
+        tmp_path,
+        "foo{features}.tar.gz",
+        streaming=streaming,
+    )
+
+    assert manager.checksum == file_checksum(archive_path)
+    assert [item.name for item in tmp_path.iterdir()] == [archive_path.name]
+
+
+@freeze_time("2012-10-15 10:00:00")
+def test_archive_streaming(mocked_version, settings, tmp_path, archive_initials):
+    """
+    Streaming mode should write the manifest first then data dumps in application
+    order, without any temporary data directory and with the same contents than the
+    common mode.
+    """
+    # Force data dump to be spilled on filesystem
+    settings.DISKETTE_DUMP_SPOOL_SIZE = 100
+
+    manager = Dumper(
+        [
+            ("Django site", {"models": ["sites"]}),
+            ("Django auth", {"models": ["auth.Group", "auth.User"]}),
+        ],
+        storages=archive_initials["storages"],
+    )
+    manager.validate()
+    archive_path = manager.make_archive(
+        tmp_path,
+        "foo{features}.tar.gz",
+        with_storages=False,
+        streaming=True,
+    )
+
+    with tarfile.open(archive_path, "r:gz") as archive:
+        archived = [
+            (tarinfo.name, tarinfo.size)
+            for tarinfo in archive.getmembers()
+            if tarinfo.isfile()
+        ]
+        manifest = json.load(archive.extractfile("manifest.json"))
+        auth_dump = json.load(archive.extractfile("data/django-auth.json"))
+
+    assert archived == [
+        ("manifest.json", 202),
+        ("data/django-site.json", 94),
+        ("data/django-auth.json", 328),
+    ]
+    assert manifest["datas"] == ["data/django-site.json", "data/django-auth.json"]
+    assert auth_dump[0]["fields"]["username"] == "picsou"
+
+    # Only the archive remains in destination
+    assert [item.name for item in tmp_path.iterdir()] == ["foo_data.tar.gz"]
+
+
+def test_archive_streaming_jobs(tmp_path, archive_initials):
+    """
+    Streaming mode does not support parallel dumps.
+    """
+    manager = Dumper([("Django site", {"models": ["sites"]})])
+
+    with pytest.raises(DumperError):
+        manager.make_archive(tmp_path, "foo.tar.gz", streaming=True, jobs=2)
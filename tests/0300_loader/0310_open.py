@@ -1,10 +1,17 @@
+import json
+import os
 import shutil
+import tarfile
 
 import pytest
 import requests
 
 from diskette.exceptions import DisketteError
+from diskette.core.dumper import Dumper
+from diskette.core import loader as loader_module
 from diskette.core.loader import Loader
+from diskette.utils import hashs
+from diskette.utils.archives import open_archive_writer
 
 
 def test_open_download_success(caplog, requests_mock, tmp_path, tests_settings):
@@ -21,20 +28,205 @@ def test_open_download_success(caplog, requests_mock, tmp_path, tests_settings):
     assert destination.read_text() == "faked file"
 
 
-def test_open_download_error(caplog, requests_mock, tmp_path, tests_settings):
+def test_open_download_error(caplog, settings, requests_mock, tmp_path,
+                             tests_settings):
     """
-    Encountered HTTP errors should be raised during operation.
+    Encountered HTTP errors should be raised during operation once there is no retry
+    left.
     """
+    settings.DISKETTE_DOWNLOAD_RETRY_DELAY = 0
     destination = tmp_path / "downloaded.tar.gz"
 
     url = "http://foo/basic_data_storages.tar.gz"
-    # requests_mock.get(url, exc=requests.exceptions.ConnectTimeout)
     requests_mock.get(url, status_code=500, text="some error")
 
     loader = Loader()
     with pytest.raises(requests.exceptions.HTTPError):
         loader.download_archive(url, destination=destination)
 
+    assert requests_mock.call_count == settings.DISKETTE_DOWNLOAD_RETRIES + 1
+
+    # Client errors are not retried
+    requests_mock.reset_mock()
+    requests_mock.get(url, status_code=404, text="some error")
+    with pytest.raises(requests.exceptions.HTTPError):
+        loader.download_archive(url, destination=destination)
+
+    assert requests_mock.call_count == 1
+
+
+def test_open_download_retry(caplog, settings, requests_mock, tmp_path):
+    """
+    An interrupted download should be retried from where it stopped and be checksumed
+    while downloaded.
+    """
+    settings.DISKETTE_DOWNLOAD_RETRY_DELAY = 0
+    destination = tmp_path / "downloaded.tar.gz"
+    content = b"0123456789" * 100
+
+    url = "http://foo/basic_data_storages.tar.gz"
+    requests_mock.get(url, [
+        {"exc": requests.exceptions.ConnectTimeout},
+        # Connection ends before the announced length
+        {
+            "content": content[:300],
+            "headers": {"ETag": '"v1"', "Content-Length": "1000"},
+        },
+        {"status_code": 503},
+        {
+            "status_code": 206,
+            "content": content[300:],
+            "headers": {"ETag": '"v1"', "Content-Range": "bytes 300-999/1000"},
+        },
+    ])
+
+    loader = Loader()
+    assert loader.download_archive(url, destination=destination) == destination
+    assert destination.read_bytes() == content
+    assert loader.download_checksum == hashs.file_checksum(destination)
+    assert [item.name for item in tmp_path.iterdir()] == ["downloaded.tar.gz"]
+
+    history = requests_mock.request_history
+    # New downloads probe if server accepts ranges
+    assert [item.headers["Range"] for item in history] == [
+        "bytes=0-", "bytes=0-", "bytes=300-", "bytes=300-",
+    ]
+    assert history[-1].headers["If-Range"] == '"v1"'
+
+
+@pytest.mark.parametrize("response", [
+    # Archive has changed so server sends the whole new archive
+    {"content": b"new archive", "headers": {"ETag": '"v2"'}},
+    # Range does not match the partial file
+    {
+        "status_code": 206,
+        "content": b"archive",
+        "headers": {"ETag": '"v1"', "Content-Range": "bytes 4-10/11"},
+    },
+    # Range is not satisfiable
+    {"status_code": 416},
+])
+def test_open_download_resume_restart(requests_mock, tmp_path, response):
+    """
+    Download should restart from scratch when the partial file does not match the
+    served archive.
+    """
+    destination = tmp_path / "downloaded.tar.gz"
+    url = "http://foo/basic_data_storages.tar.gz"
+    (tmp_path / "downloaded.tar.gz.part").write_bytes(b"old ")
+    (tmp_path / "downloaded.tar.gz.part.json").write_text(json.dumps({
+        "url": url,
+        "etag": '"v1"',
+        "length": 12,
+    }))
+
+    requests_mock.get(url, [
+        response,
+        {"content": b"new archive", "headers": {"ETag": '"v2"'}},
+    ])
+
+    loader = Loader()
+    loader.download_archive(url, destination=destination)
+    assert destination.read_bytes() == b"new archive"
+    assert loader.download_checksum == hashs.file_checksum(destination)
+    assert [item.name for item in tmp_path.iterdir()] == ["downloaded.tar.gz"]
+    assert requests_mock.request_history[0].headers["Range"] == "bytes=4-"
+
+
+@pytest.mark.parametrize("accept_ranges, segments, expected", [
+    (True, 4, ["bytes=0-", "bytes=2500-4999", "bytes=5000-7499", "bytes=7500-9999"]),
+    (True, 1, [None]),
+    (False, 4, ["bytes=0-"]),
+])
+def test_open_download_segments(settings, monkeypatch, http_server, tmp_path,
+                                accept_ranges, segments, expected):
+    """
+    Archive should be downloaded in concurrent segments when server accepts ranges,
+    else in a single stream.
+    """
+    monkeypatch.setattr(loader_module, "DOWNLOAD_SEGMENT_MINIMAL_SIZE", 1000)
+    settings.DISKETTE_DOWNLOAD_SEGMENTS = segments
+    http_server.accept_ranges = accept_ranges
+    content = os.urandom(10000)
+    (http_server.directory / "archive.tar.gz").write_bytes(content)
+    destination = tmp_path / "downloaded.tar.gz"
+
+    loader = Loader()
+    loader.download_archive(http_server.url + "archive.tar.gz", destination)
+
+    assert destination.read_bytes() == content
+    assert loader.download_checksum == hashs.file_checksum(destination)
+    assert sorted(
+        [item.get("Range") for item in http_server.requests],
+        key=str
+    ) == expected
+    assert sorted([item.name for item in tmp_path.iterdir()]) == [
+        "downloaded.tar.gz", "http_server"
+    ]
+
+
+def test_open_download_segments_retry(settings, monkeypatch, http_server, tmp_path):
+    """
+    An interrupted segment should be resumed from where it stopped while the complete
+    segments are not downloaded again.
+    """
+    monkeypatch.setattr(loader_module, "DOWNLOAD_SEGMENT_MINIMAL_SIZE", 1000)
+    settings.DISKETTE_DOWNLOAD_SEGMENTS = 4
+    settings.DISKETTE_DOWNLOAD_RETRY_DELAY = 0
+    settings.DISKETTE_DOWNLOAD_CHUNK = 100
+    http_server.interruptions = 1
+    content = os.urandom(10000)
+    (http_server.directory / "archive.tar.gz").write_bytes(content)
+    destination = tmp_path / "downloaded.tar.gz"
+
+    loader = Loader()
+    loader.download_archive(http_server.url + "archive.tar.gz", destination)
+
+    assert destination.read_bytes() == content
+    assert loader.download_checksum == hashs.file_checksum(destination)
+
+    ranges = [
+        [int(value) for value in item["Range"][6:].split("-") if value]
+        for item in http_server.requests
+    ]
+    assert len(ranges) == 5
+    # Interrupted segment is resumed after its received content
+    start, end = ranges[-1]
+    assert start % 2500 > 0
+    assert end in [4999, 7499, 9999]
+
+
+def test_open_download_cache(settings, http_server, tmp_path, tests_settings):
+    """
+    With the download cache enabled, archive should be downloaded again only when it
+    has been modified and cached archive should never be removed.
+    """
+    settings.DISKETTE_DOWNLOAD_CACHE_PATH = tmp_path / "cache"
+    archive_name = "basic_data_storages.tar.gz"
+    served = http_server.directory / archive_name
+    shutil.copy(tests_settings.fixtures_path / "archive_samples" / archive_name, served)
+    url = http_server.url + archive_name
+
+    loader = Loader()
+    for i in range(2):
+        extracted = loader.open(url, checksum=hashs.file_checksum(served))
+        assert (extracted / "manifest.json").exists()
+        shutil.rmtree(extracted)
+
+    cached = loader.get_download_cache().get_archive_path(url)
+    assert cached.read_bytes() == served.read_bytes()
+    assert [item.get("If-None-Match") for item in http_server.requests] == [
+        None, loader.get_download_cache().get(url)["etag"]
+    ]
+
+    # Modified archive is downloaded again into the cache
+    served.write_bytes(b"new archive")
+    assert loader.download_archive(url) == cached
+    assert cached.read_bytes() == b"new archive"
+    assert loader.download_checksum == hashs.file_checksum(served)
+    assert len(http_server.requests) == 3
+    assert len(list((tmp_path / "cache").iterdir())) == 2
+
 
 def test_open_file(caplog, mocked_version, tmp_path, tests_settings):
     """
@@ -62,6 +254,265 @@ def test_open_file(caplog, mocked_version, tmp_path, tests_settings):
             shutil.rmtree(extract_archive)
 
 
+@pytest.mark.parametrize("mode", ["w:bz2", "w:xz", "w"])
+def test_open_file_compression(tmp_path, tests_settings, mode):
+    """
+    Archive compression should be detected from its content whatever its filename is.
+    """
+    archive_path = tmp_path / "archive.tar.gz"
+    with tarfile.open(archive_path, mode) as tar:
+        tar.add(
+            tests_settings.fixtures_path / "manifest_samples" / "basic.json",
+            arcname="manifest.json"
+        )
+
+    loader = Loader()
+    extract_archive = None
+    try:
+        extract_archive = loader.open(archive_path, checksum=False)
+
+        assert [v.name for v in extract_archive.iterdir()] == ["manifest.json"]
+    finally:
+        if extract_archive and extract_archive.exists():
+            shutil.rmtree(extract_archive)
+
+
+@pytest.mark.parametrize("with_data, with_storages, expected", [
+    (True, True, ["data", "manifest.json", "storage-1", "storage-2"]),
+    (True, False, ["data", "manifest.json"]),
+    (False, True, ["manifest.json", "storage-1", "storage-2"]),
+])
+def test_open_sections(db, tmp_path, tests_settings, with_data, with_storages,
+                       expected):
+    """
+    Only the required sections should be extracted from an archive with the sections
+    layout.
+    """
+    storage_samples = tests_settings.fixtures_path / "storage_samples"
+    archive_path = Dumper(
+        [("Django site", {"models": ["sites"]})],
+        storages=[storage_samples / "storage-1", storage_samples / "storage-2"],
+        storages_basepath=storage_samples,
+        layout="sections",
+    ).make_archive(tmp_path, "foo{features}.tar.gz")
+
+    loader = Loader()
+    extract_archive = None
+    try:
+        extract_archive = loader.open(
+            archive_path,
+            checksum=False,
+            with_data=with_data,
+            with_storages=with_storages,
+        )
+
+        assert sorted([v.name for v in extract_archive.iterdir()]) == expected
+        assert [
+            str(item) for item in loader.get_manifest(extract_archive)["datas"]
+        ] == ["data/django-site.json"]
+    finally:
+        if extract_archive and extract_archive.exists():
+            shutil.rmtree(extract_archive)
+
+
+def list_files(path):
+    """
+    List relative paths of all files from a directory.
+    """
+    return sorted([
+        str(item.relative_to(path)) for item in path.rglob("*") if item.is_file()
+    ])
+
+
+@pytest.mark.parametrize("layout", ["single", "indexed", "sections"])
+@pytest.mark.parametrize("streaming", [False, True])
+@pytest.mark.parametrize("options, expected", [
+    (
+        {},
+        [
+            "data/django-auth.json", "data/django-site.json", "manifest.json",
+            "storage-1/foo.txt", "storage-2/pong/sample.nope",
+        ],
+    ),
+    (
+        {"with_storages": False},
+        ["data/django-auth.json", "data/django-site.json", "manifest.json"],
+    ),
+    (
+        {"with_data": False},
+        ["manifest.json", "storage-1/foo.txt", "storage-2/pong/sample.nope"],
+    ),
+    (
+        {"with_storages": False, "data_exclusions": ["django-auth.json"]},
+        ["data/django-site.json", "manifest.json"],
+    ),
+])
+def test_open_selective(db, tmp_path, layout, streaming, options, expected):
+    """
+    Only the archive files required by load options should be extracted, whatever
+    the archive layout is.
+    """
+    storages = tmp_path / "storages"
+    (storages / "storage-1").mkdir(parents=True)
+    (storages / "storage-1" / "foo.txt").write_text("Foo")
+    (storages / "storage-2" / "pong").mkdir(parents=True)
+    (storages / "storage-2" / "pong" / "sample.nope").write_text("Pong")
+
+    archive_path = Dumper(
+        [
+            ("Django site", {"models": ["sites"]}),
+            ("Django auth", {"models": ["auth.Group", "auth.User"]}),
+        ],
+        storages=[storages / "storage-1", storages / "storage-2"],
+        storages_basepath=storages,
+        layout=layout,
+    ).make_archive(tmp_path, "foo{features}.tar.gz", streaming=streaming)
+
+    loader = Loader()
+    extract_archive = None
+    try:
+        extract_archive = loader.open(archive_path, checksum=False, **options)
+
+        assert list_files(extract_archive) == expected
+    finally:
+        if extract_archive and extract_archive.exists():
+            shutil.rmtree(extract_archive)
+
+
+@pytest.mark.parametrize("layout", ["single", "sections"])
+@pytest.mark.parametrize("options, expected", [
+    (
+        {},
+        [
+            "data/django-auth.json", "data/django-site.json", "manifest.json",
+            "storage-1/foo.txt", "storage-2/pong/sample.nope",
+        ],
+    ),
+    (
+        {"with_storages": False, "data_exclusions": ["django-auth.json"]},
+        ["data/django-site.json", "manifest.json"],
+    ),
+])
+def test_open_stream(db, tmp_path, pipe_stream, layout, options, expected):
+    """
+    Archive streamed to a file object should be extracted from a stream.
+    """
+    storages = tmp_path / "storages"
+    (storages / "storage-1").mkdir(parents=True)
+    (storages / "storage-1" / "foo.txt").write_text("Foo")
+    (storages / "storage-2" / "pong").mkdir(parents=True)
+    (storages / "storage-2" / "pong" / "sample.nope").write_text("Pong")
+
+    output = pipe_stream()
+    Dumper(
+        [
+            ("Django site", {"models": ["sites"]}),
+            ("Django auth", {"models": ["auth.Group", "auth.User"]}),
+        ],
+        storages=[storages / "storage-1", storages / "storage-2"],
+        storages_basepath=storages,
+        layout=layout,
+    ).stream_archive(output)
+
+    content = output.getvalue()
+    (tmp_path / "archive").write_bytes(content)
+
+    loader = Loader()
+    extract_archive = None
+    try:
+        extract_archive = loader.open(
+            pipe_stream(content),
+            checksum=hashs.file_checksum(tmp_path / "archive"),
+            **options
+        )
+
+        assert list_files(extract_archive) == expected
+    finally:
+        if extract_archive and extract_archive.exists():
+            shutil.rmtree(extract_archive)
+
+    # Checksum is compared once stream has been read
+    with pytest.raises(DisketteError) as excinfo:
+        loader.open(pipe_stream(content), checksum="Nope")
+
+    assert str(excinfo.value) == (
+        "Checksums do not match. Your archive file is probably corrupted."
+    )
+
+
+def test_open_stream_manifest_last(tmp_path, pipe_stream):
+    """
+    Archive read from a stream must start with its manifest.
+    """
+    source = tmp_path / "manifest.json"
+    source.write_text(json.dumps({"datas": [], "storages": []}))
+    output = pipe_stream()
+    with open_archive_writer(output, "gzip") as tar:
+        tar.add(source, arcname="foo.json")
+        tar.add(source, arcname="manifest.json")
+
+    with pytest.raises(DisketteError) as excinfo:
+        Loader().open(pipe_stream(output.getvalue()), checksum=False)
+
+    assert str(excinfo.value) == (
+        "Archive read from a stream must start with its manifest file "
+        "'manifest.json'"
+    )
+
+
+def test_open_selective_manifest_last(tmp_path):
+    """
+    Required archive files should be extracted from an archive with the manifest at
+    its end.
+    """
+    sources = tmp_path / "sources"
+    (sources / "data").mkdir(parents=True)
+    (sources / "data" / "foo.json").write_text("[]")
+    (sources / "data" / "bar.json").write_text("[]")
+    (sources / "storage-1").mkdir()
+    (sources / "storage-1" / "ping.txt").write_text("Ping")
+    (sources / "manifest.json").write_text(json.dumps({
+        "datas": ["data/foo.json", "data/bar.json"],
+        "storages": ["storage-1"],
+    }))
+
+    archive_path = tmp_path / "archive.tar.gz"
+    with tarfile.open(archive_path, "w:gz") as tar:
+        for name in ("data", "storage-1", "manifest.json"):
+            tar.add(sources / name, arcname=name)
+
+    loader = Loader()
+    extract_archive = None
+    try:
+        extract_archive = loader.open(
+            archive_path,
+            checksum=False,
+            with_storages=False,
+            data_exclusions=["bar.json"],
+        )
+
+        assert list_files(extract_archive) == ["data/foo.json", "manifest.json"]
+    finally:
+        if extract_archive and extract_archive.exists():
+            shutil.rmtree(extract_archive)
+
+
+@pytest.mark.parametrize("layout", ["single", "indexed"])
+def test_get_archive_manifest(db, tmp_path, layout):
+    """
+    Manifest should be read from archive without extracting it.
+    """
+    archive_path = Dumper(
+        [("Django site", {"models": ["sites"]})],
+        layout=layout,
+    ).make_archive(tmp_path, "foo{features}.tar.gz", with_storages=False)
+
+    manifest = Loader().get_archive_manifest(archive_path)
+
+    assert [str(item) for item in manifest["datas"]] == ["data/django-site.json"]
+    assert manifest["storages"] == []
+
+
 def test_open_url(caplog, mocked_version, requests_mock, tmp_path, tests_settings):
     """
     Archive from an URL should be correctly downloaded then extracted into temp
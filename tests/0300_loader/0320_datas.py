@@ -1,14 +1,17 @@
 import json
 import logging
 import shutil
+import time
 from pathlib import Path
 
+import pytest
 from freezegun import freeze_time
 
 from django.apps import apps
 from django.contrib.sites.models import Site
 
 from diskette.core.loader import Loader
+from diskette.exceptions import LoaderError
 from diskette.utils.loggers import LoggingOutput
 
 
@@ -118,3 +121,142 @@ def test_deploy_datas_exclusions(caplog, db, tmp_path, settings, tests_settings)
     User = apps.get_registered_model(user_app, user_model)
     assert User.objects.count() == 0
     assert Site.objects.count() == 2
+
+
+def test_get_data_dependencies(tmp_path, tests_settings):
+    """
+    Dumps should depend on previous dumps which include models they relate to and
+    dumps which can not be scanned should depend on every previous ones.
+    """
+    archive = tmp_path / "archive"
+    shutil.copytree(tests_settings.fixtures_path / "data_samples", archive)
+    (archive / "foo.xml").write_text("<nope/>")
+
+    loader = Loader()
+
+    assert loader.get_data_dependencies(archive, [
+        Path("django-site.json"),
+        Path("django-auth.json"),
+        Path("blog-sample.json"),
+    ]) == [set(), set(), {1}]
+
+    # Order from dump list is respected even if a dump relates to a next one
+    assert loader.get_data_dependencies(archive, [
+        Path("blog-sample.json"),
+        Path("django-auth.json"),
+        Path("django-site.json"),
+    ]) == [set(), set(), set()]
+
+    assert loader.get_data_dependencies(archive, [
+        Path("django-site.json"),
+        Path("foo.xml"),
+        Path("django-auth.json"),
+    ]) == [set(), {0}, {1}]
+
+
+def fake_call(self, dump, **kwargs):
+    """
+    Fake load which only records its start and end times.
+    """
+    start = time.time()
+    time.sleep(0.5)
+    self.logger.info("Loaded {}".format(dump.name))
+
+    return json.dumps({"start": start, "end": time.time()})
+
+
+def test_deploy_datas_jobs(caplog, monkeypatch, tmp_path, tests_settings):
+    """
+    With jobs, dumps should be loaded concurrently from worker processes once the
+    dumps they depend on have been loaded and results should respect the dump order.
+    """
+    caplog.set_level(logging.DEBUG)
+    monkeypatch.setattr(Loader, "can_load_parallel", lambda self: True)
+    monkeypatch.setattr(Loader, "call", fake_call)
+
+    archive = tmp_path / "archive"
+    shutil.copytree(tests_settings.fixtures_path / "data_samples", archive)
+
+    manifest = {
+        "datas": [
+            Path("django-site.json"),
+            Path("django-auth.json"),
+            Path("blog-sample.json"),
+        ],
+        "storages": []
+    }
+
+    loader = Loader(logger=LoggingOutput())
+    results = loader.deploy_datas(archive, manifest, jobs=2)
+
+    assert [name for name, output in results] == [
+        "django-site.json", "django-auth.json", "blog-sample.json",
+    ]
+    site, auth, blog = [json.loads(output) for name, output in results]
+
+    # Independent dumps are loaded at the same time
+    assert site["start"] < auth["end"] and auth["start"] < site["end"]
+    # Dependent dump is loaded after its dependency
+    assert blog["start"] >= auth["end"]
+
+    assert [msg for name, lv, msg in caplog.record_tuples] == [
+        "Loading data with 2 worker processes",
+        "Loaded django-site.json",
+        "Loaded django-auth.json",
+        "Loaded blog-sample.json",
+    ]
+
+
+def test_deploy_datas_jobs_failure(monkeypatch, tmp_path, tests_settings):
+    """
+    An error from a worker should be reported as a loader error.
+    """
+    def failing_call(self, dump, **kwargs):
+        if dump.name == "django-auth.json":
+            raise ValueError("Nope")
+
+        return fake_call(self, dump, **kwargs)
+
+    monkeypatch.setattr(Loader, "can_load_parallel", lambda self: True)
+    monkeypatch.setattr(Loader, "call", failing_call)
+
+    archive = tmp_path / "archive"
+    shutil.copytree(tests_settings.fixtures_path / "data_samples", archive)
+
+    manifest = {
+        "datas": [Path("django-site.json"), Path("django-auth.json")],
+        "storages": []
+    }
+
+    loader = Loader()
+
+    with pytest.raises(LoaderError) as excinfo:
+        loader.deploy_datas(archive, manifest, jobs=2)
+
+    assert str(excinfo.value) == (
+        "Data dump 'django-auth.json' loading has failed: Nope"
+    )
+
+
+def test_deploy_datas_jobs_sqlite(caplog, db, tmp_path, tests_settings):
+    """
+    With SQLite, dumps should be loaded sequentially even with jobs.
+    """
+    caplog.set_level(logging.DEBUG)
+
+    archive = tmp_path / "archive"
+    shutil.copytree(tests_settings.fixtures_path / "data_samples", archive)
+
+    manifest = {
+        "datas": [Path("django-site.json"), Path("django-auth.json")],
+        "storages": []
+    }
+
+    loader = Loader(logger=LoggingOutput())
+    loader.deploy_datas(archive, manifest, jobs=2)
+
+    assert [msg for name, lv, msg in caplog.record_tuples][0] == (
+        "Database does not support concurrent loading, data dumps are loaded "
+        "sequentially."
+    )
+    assert Site.objects.count() == 2
@@ -1,12 +1,20 @@
+import datetime
 import logging
 import shutil
 
+import pytest
 from freezegun import freeze_time
 
 from django.apps import apps
+from django.contrib.auth import get_user_model
 from django.contrib.sites.models import Site
+from django.db.migrations.recorder import MigrationRecorder
+from django.utils import timezone
 
+from diskette.core.dumper import Dumper
 from diskette.core.loader import Loader
+from diskette.exceptions import DisketteError
+from diskette.factories import UserFactory
 from diskette.utils.loggers import LoggingOutput
 
 
@@ -37,3 +45,265 @@ def test_deploy(caplog, db, settings, tests_settings, tmp_path):
     User = apps.get_registered_model(user_app, user_model)
     assert User.objects.count() == 3
     assert Site.objects.count() == 2
+
+
+@pytest.mark.parametrize("layout", ["single", "sections", "indexed"])
+@pytest.mark.parametrize("options, expected_datas, expected_storages", [
+    ({}, ["django-site.json", "django-auth.json"], ["storage-1", "storage-2"]),
+    ({"with_storages": False}, ["django-site.json", "django-auth.json"], None),
+    ({"with_data": False}, None, ["storage-1", "storage-2"]),
+    (
+        {"data_exclusions": ["django-auth.json"]},
+        ["django-site.json"],
+        ["storage-1", "storage-2"],
+    ),
+])
+def test_deploy_pipelined(caplog, db, tmp_path, layout, options, expected_datas,
+                          expected_storages):
+    """
+    Data dumps should be loaded in the manifest order while archive is extracted
+    then storages should be deployed.
+    """
+    caplog.set_level(logging.DEBUG)
+
+    storages = tmp_path / "storages"
+    (storages / "storage-1").mkdir(parents=True)
+    (storages / "storage-1" / "foo.txt").write_text("Foo")
+    (storages / "storage-2" / "pong").mkdir(parents=True)
+    (storages / "storage-2" / "pong" / "sample.nope").write_text("Pong")
+    UserFactory()
+
+    archive_path = Dumper(
+        [
+            ("Django site", {"models": ["sites"]}),
+            ("Django auth", {"models": ["auth.Group", "auth.User"]}),
+        ],
+        storages=[storages / "storage-1", storages / "storage-2"],
+        storages_basepath=storages,
+        layout=layout,
+    ).make_archive(tmp_path, "foo{features}.tar.gz")
+    User = get_user_model()
+    Site.objects.all().delete()
+    User.objects.all().delete()
+
+    destination = tmp_path / "deployed"
+    deployed = Loader(logger=LoggingOutput()).deploy(
+        archive_path,
+        destination,
+        pipeline=True,
+        **options
+    )
+
+    if expected_datas is None:
+        assert "datas" not in deployed
+        assert Site.objects.count() == 0
+        assert User.objects.count() == 0
+    else:
+        assert [name for name, output in deployed["datas"]] == expected_datas
+        assert Site.objects.count() == 1
+        assert User.objects.count() == len(expected_datas) - 1
+
+    if expected_storages is None:
+        assert "storages" not in deployed
+        assert destination.exists() is False
+    else:
+        assert sorted([item.name for item in destination.iterdir()]) == (
+            expected_storages
+        )
+        assert (destination / "storage-2" / "pong" / "sample.nope").read_text() == (
+            "Pong"
+        )
+
+    assert archive_path.exists() is False
+    assert [
+        item for item in tmp_path.iterdir() if item.name.startswith("diskette_")
+    ] == []
+
+
+def test_deploy_pipelined_error(db, tmp_path):
+    """
+    An extraction error should be raised once the extraction thread is over.
+    """
+    archive_path = tmp_path / "archive.tar.gz"
+    archive_path.write_bytes(b"nope")
+
+    with pytest.raises(DisketteError) as excinfo:
+        Loader(logger=LoggingOutput()).deploy(
+            archive_path,
+            tmp_path,
+            pipeline=True,
+            checksum="foo",
+        )
+
+    assert str(excinfo.value) == (
+        "Checksums do not match. Your archive file is probably corrupted."
+    )
+
+
+@pytest.mark.parametrize("pipeline", [False, True])
+def test_deploy_if_changed(caplog, db, settings, tmp_path, pipeline):
+    """
+    A load should be skipped when the same archive has already been loaded and only
+    the changed data dumps and storages should be loaded from another archive.
+    """
+    caplog.set_level(logging.INFO)
+    settings.DISKETTE_LOAD_LEDGER_PATH = tmp_path / "ledger.json"
+
+    storages = tmp_path / "storages"
+    (storages / "storage-1").mkdir(parents=True)
+    (storages / "storage-1" / "foo.txt").write_text("Foo")
+    UserFactory()
+
+    def make_archive(name):
+        (tmp_path / name).mkdir()
+        return Dumper(
+            [
+                ("Django site", {"models": ["sites"]}),
+                ("Django auth", {"models": ["auth.Group", "auth.User"]}),
+            ],
+            storages=[storages / "storage-1"],
+            storages_basepath=storages,
+        ).make_archive(tmp_path / name, "foo{features}.tar.gz")
+
+    first_archive = make_archive("first")
+    destination = tmp_path / "deployed"
+    loader = Loader(logger=LoggingOutput())
+    options = {"if_changed": True, "keep": True, "pipeline": pipeline}
+
+    deployed = loader.deploy(first_archive, destination, **options)
+    assert [name for name, output in deployed["datas"]] == [
+        "django-site.json", "django-auth.json"
+    ]
+    assert len(deployed["storages"]) == 1
+
+    # Same archive is not loaded again
+    caplog.clear()
+    assert loader.deploy(first_archive, destination, **options) == {}
+    assert "Archive has already been loaded, nothing to do" in caplog.messages
+
+    # Only the changed site dump is loaded from a new archive
+    Site.objects.create(domain="bar.com", name="Bar")
+    second_archive = make_archive("second")
+    Site.objects.filter(domain="bar.com").delete()
+
+    caplog.clear()
+    deployed = loader.deploy(second_archive, destination, **options)
+    assert [name for name, output in deployed["datas"]] == ["django-site.json"]
+    assert deployed["storages"] == []
+    assert "Ignored dump 'django-auth.json' because it has not changed" in (
+        caplog.messages
+    )
+    assert "Ignored storage 'storage-1' because it has not changed" in (
+        caplog.messages
+    )
+    assert Site.objects.filter(domain="bar.com").count() == 1
+
+    # A load with a narrower scope than the one of the loaded archive is skipped
+    assert loader.deploy(
+        second_archive,
+        destination,
+        data_exclusions=["django-auth.json"],
+        **options
+    ) == {}
+
+    # A storage modified since its deploy is deployed again
+    (destination / "storage-1" / "foo.txt").write_text("Modified")
+    deployed = loader.deploy(first_archive, destination, **options)
+    assert [name for name, output in deployed["datas"]] == ["django-site.json"]
+    assert len(deployed["storages"]) == 1
+    assert (destination / "storage-1" / "foo.txt").read_text() == "Foo"
+
+
+def test_deploy_extraction_cache(caplog, db, settings, tmp_path):
+    """
+    Archive should be extracted once into the extraction cache then the next loads
+    should be deployed from the cached directory which is left untouched.
+    """
+    caplog.set_level(logging.INFO)
+    settings.DISKETTE_EXTRACTION_CACHE_PATH = tmp_path / "cache"
+
+    storages = tmp_path / "storages"
+    (storages / "storage-1").mkdir(parents=True)
+    (storages / "storage-1" / "foo.txt").write_text("Foo")
+    UserFactory()
+
+    archive_path = Dumper(
+        [
+            ("Django site", {"models": ["sites"]}),
+            ("Django auth", {"models": ["auth.Group", "auth.User"]}),
+        ],
+        storages=[storages / "storage-1"],
+        storages_basepath=storages,
+    ).make_archive(tmp_path, "foo{features}.tar.gz")
+    User = get_user_model()
+
+    loader = Loader(logger=LoggingOutput())
+    for destination in ("first", "second"):
+        Site.objects.all().delete()
+        User.objects.all().delete()
+        caplog.clear()
+
+        deployed = loader.deploy(
+            archive_path,
+            tmp_path / destination,
+            keep=True,
+            pipeline=True,
+        )
+
+        assert [name for name, output in deployed["datas"]] == [
+            "django-site.json", "django-auth.json"
+        ]
+        assert Site.objects.count() == 1
+        assert User.objects.count() == 1
+        assert (tmp_path / destination / "storage-1" / "foo.txt").read_text() == (
+            "Foo"
+        )
+        assert ("Using extracted archive from cache" in caplog.messages) is (
+            destination == "second"
+        )
+
+    cached = tmp_path / "cache" / loader.archive_checksum
+    assert sorted([
+        str(item.relative_to(cached)) for item in cached.rglob("*") if item.is_file()
+    ]) == [
+        "data/django-auth.json",
+        "data/django-site.json",
+        "manifest.json",
+        "storage-1/foo.txt",
+    ]
+
+    # Archive is removed once used when it is not kept
+    loader.deploy(archive_path, tmp_path / "third")
+    assert archive_path.exists() is False
+    assert cached.exists() is True
+
+
+def test_deploy_if_changed_recreated(db, settings, tmp_path):
+    """
+    An archive already loaded should be loaded again into a database which has been
+    recreated under the same name.
+    """
+    settings.DISKETTE_LOAD_LEDGER_PATH = tmp_path / "ledger.json"
+    UserFactory()
+
+    archive_path = Dumper(
+        [("Django auth", {"models": ["auth.Group", "auth.User"]})],
+    ).make_archive(tmp_path, "foo{features}.tar.gz")
+    User = get_user_model()
+    User.objects.all().delete()
+
+    loader = Loader(logger=LoggingOutput())
+    options = {"if_changed": True, "keep": True, "with_storages": False}
+
+    assert len(loader.deploy(archive_path, tmp_path, **options)["datas"]) == 1
+    assert loader.deploy(archive_path, tmp_path, **options) == {}
+    assert User.objects.count() == 1
+
+    # Recreated database is empty and has been migrated again
+    User.objects.all().delete()
+    MigrationRecorder.Migration.objects.update(
+        applied=timezone.now() + datetime.timedelta(days=1)
+    )
+
+    assert len(loader.deploy(archive_path, tmp_path, **options)["datas"]) == 1
+    assert User.objects.count() == 1
@@ -159,6 +159,7 @@ def test_dump(caplog, settings, db, mocked_checksum, mocked_version, tests_setti
         "diskette:10:diskette==0.0.0-test",
         "diskette:10:- Tarball will be written into: {}".format(tmp_path),
         "diskette:10:- Tarball filename pattern: diskette{features}.tar.gz",
+        "diskette:10:- Tarball compression: gzip",
         "diskette:10:- Data dump enabled for application:",
         "diskette:10:  ├── Django auth",
         "diskette:10:  └── Django site",
@@ -200,6 +201,7 @@ def test_dump(caplog, settings, db, mocked_checksum, mocked_version, tests_setti
             "diskette:10:diskette==0.0.0-test",
             "diskette:10:- Tarball will be written into: {tmp_path}",
             "diskette:10:- Tarball filename pattern: diskette{{features}}.tar.gz",
+            "diskette:10:- Tarball compression: gzip",
             "diskette:10:- Data dump enabled for application:",
             "diskette:10:  ├── Django auth",
             "diskette:10:  └── Django site",
@@ -240,6 +242,7 @@ def test_dump(caplog, settings, db, mocked_checksum, mocked_version, tests_setti
             "diskette:10:diskette==0.0.0-test",
             "diskette:10:- Tarball will be written into: {tmp_path}",
             "diskette:10:- Tarball filename pattern: diskette{{features}}.tar.gz",
+            "diskette:10:- Tarball compression: gzip",
             "diskette:10:- Data dump enabled for application:",
             "diskette:10:  ├── Django auth",
             "diskette:10:  └── Django site",
@@ -278,6 +281,7 @@ def test_dump(caplog, settings, db, mocked_checksum, mocked_version, tests_setti
             "diskette:10:diskette==0.0.0-test",
             "diskette:10:- Tarball will be written into: {tmp_path}",
             "diskette:10:- Tarball filename pattern: diskette{{features}}.tar.gz",
+            "diskette:10:- Tarball compression: gzip",
             "diskette:10:- Data dump is disabled",
             "diskette:10:- Storage dump enabled for:",
             "diskette:10:  ├── {storage_1}",
@@ -304,6 +308,7 @@ def test_dump(caplog, settings, db, mocked_checksum, mocked_version, tests_setti
             "diskette:10:diskette==0.0.0-test",
             "diskette:10:- Tarball will be written into: {tmp_path}",
             "diskette:10:- Tarball filename pattern: diskette{{features}}.tar.gz",
+            "diskette:10:- Tarball compression: gzip",
             "diskette:10:- Data dump enabled for application:",
             "diskette:10:  ├── Django auth",
             "diskette:10:  └── Django site",
@@ -8,6 +8,7 @@ from django.apps import apps
 from django.contrib.sites.models import Site
 
 from diskette.core.handlers import LoadCommandHandler
+from diskette.exceptions import DisketteError
 from diskette.utils.loggers import LoggingOutput
 
 
@@ -28,6 +29,24 @@ def test_storages_basepath_valid(settings, setting, arg, expected):
     assert handler.get_storages_basepath(arg) == expected
 
 
+@pytest.mark.parametrize("engine, batch_size, expected", [
+    ("foo", None, "Given load engine 'foo' is not allowed, it must be one of: "
+                  "loaddata, bulk"),
+    ("bulk", 0, "Batch size must be a positive integer."),
+])
+def test_load_engine_invalid(engine, batch_size, expected):
+    """
+    Invalid load engine options should raise a critical error.
+    """
+    handler = LoadCommandHandler()
+    handler.logger = LoggingOutput()
+
+    with pytest.raises(DisketteError) as excinfo:
+        handler.get_load_engine(engine, batch_size=batch_size)
+
+    assert str(excinfo.value) == expected
+
+
 @pytest.mark.parametrize("options, expected", [
     (
         {
@@ -96,6 +115,24 @@ def test_storages_basepath_valid(settings, setting, arg, expected):
             "diskette:10:Installed 2 object(s) from 1 fixture(s)"
         ]
     ),
+    (
+        {
+            "no_data": False,
+            "no_storages": True,
+            "engine": "bulk",
+            "batch_size": 2,
+        },
+        [
+            "diskette:20:=== Starting restoration ===",
+            "diskette:10:diskette==0.0.0-test",
+            "diskette:10:- Storages contents will be restored into: {tmp_path}",
+            "diskette:10:Archive checksum: dummy-checksum",
+            "diskette:20:Loading data from dump 'django-auth.json' (959 bytes)",
+            "diskette:10:Installed 3 object(s) from 1 fixture(s)",
+            "diskette:20:Loading data from dump 'django-site.json' (194 bytes)",
+            "diskette:10:Installed 2 object(s) from 1 fixture(s)"
+        ]
+    ),
     (
         {
             "no_data": True,
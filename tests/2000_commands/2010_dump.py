@@ -42,6 +42,7 @@ def test_dump_cmd(caplog, db, tests_settings, tmp_path):
 
     # Check expected archived files are all there
     assert archived == [
+        "manifest.json",
         "data/djangocontribauth.json",
         "data/djangocontribsites.json",
         "tests/data_fixtures/storage_samples/storage-1/blue.png",
@@ -50,7 +51,6 @@ def test_dump_cmd(caplog, db, tests_settings, tmp_path):
         "tests/data_fixtures/storage_samples/storage-1/foo/grass.png",
         "tests/data_fixtures/storage_samples/storage-1/foo/bar/bar.txt",
         "tests/data_fixtures/storage_samples/storage-1/plop/green.png",
-        "manifest.json"
     ]
 
 
@@ -130,7 +130,7 @@ def test_dump_cmd_check(caplog, db, tests_settings, tmp_path):
 
 def test_dump_cmd_incompatible_save(db, settings):
     """
-    Save mode is incompatible with check, no archive and disabled admin.
+    Save mode is incompatible with check, no archive, output and disabled admin.
     """
     with StringIO() as out:
         args = [
@@ -143,7 +143,8 @@ def test_dump_cmd_incompatible_save(db, settings):
 
         assert str(excinfo.value) == (
             "The option '--save' is incompatible with options '--check', "
-            "'--no-archive' and disabled admin from setting 'DISKETTE_ADMIN_ENABLED'."
+            "'--no-archive', '--output' and disabled admin from setting "
+            "'DISKETTE_ADMIN_ENABLED'."
         )
 
     with StringIO() as out:
@@ -157,7 +158,23 @@ def test_dump_cmd_incompatible_save(db, settings):
 
         assert str(excinfo.value) == (
             "The option '--save' is incompatible with options '--check', "
-            "'--no-archive' and disabled admin from setting 'DISKETTE_ADMIN_ENABLED'."
+            "'--no-archive', '--output' and disabled admin from setting "
+            "'DISKETTE_ADMIN_ENABLED'."
+        )
+
+    with StringIO() as out:
+        args = [
+            "--output=-",
+            "--save",
+        ]
+
+        with pytest.raises(CommandError) as excinfo:
+            management.call_command("diskette_dump", *args, stdout=out)
+
+        assert str(excinfo.value) == (
+            "The option '--save' is incompatible with options '--check', "
+            "'--no-archive', '--output' and disabled admin from setting "
+            "'DISKETTE_ADMIN_ENABLED'."
         )
 
     settings.DISKETTE_ADMIN_ENABLED = False
@@ -171,7 +188,8 @@ def test_dump_cmd_incompatible_save(db, settings):
 
         assert str(excinfo.value) == (
             "The option '--save' is incompatible with options '--check', "
-            "'--no-archive' and disabled admin from setting 'DISKETTE_ADMIN_ENABLED'."
+            "'--no-archive', '--output' and disabled admin from setting "
+            "'DISKETTE_ADMIN_ENABLED'."
         )
 
 
@@ -213,3 +231,45 @@ def test_dump_cmd_save(caplog, db, tests_settings, tmp_path):
     assert latest.status == STATUS_PROCESSED
     assert latest.path == str(archive_path.name)
     assert latest.size > 0
+
+
+def test_dump_cmd_jobs(caplog, db, tests_settings, tmp_path):
+    """
+    With jobs option the command should dump applications from worker processes and
+    still output their messages in the application order.
+    """
+    appconf = tests_settings.fixtures_path / "basic_apps.json"
+    archive_path = tmp_path / "foo_data.tar.gz"
+
+    with StringIO() as out:
+        args = [
+            "--destination={}".format(tmp_path),
+            "--appconf={}".format(appconf),
+            "--no-storages",
+            "--filename=foo{features}.tar.gz",
+            "--jobs=2",
+        ]
+
+        management.call_command("diskette_dump", *args, stdout=out)
+        content = out.getvalue()
+
+    assert archive_path.exists() is True
+
+    with tarfile.open(archive_path, "r:gz") as archive:
+        archived = [
+            tarinfo.name
+            for tarinfo in archive.getmembers()
+            if tarinfo.isfile()
+        ]
+
+    assert archived == [
+        "manifest.json",
+        "data/djangocontribauth.json",
+        "data/djangocontribsites.json",
+    ]
+
+    assert content.split("\n")[1:4] == [
+        "Dumping data with 2 worker processes",
+        "Dumping data for application 'django.contrib.sites'",
+        "Dumping data for application 'django.contrib.auth'",
+    ]
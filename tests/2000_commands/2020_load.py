@@ -1,6 +1,6 @@
 import os
 import shutil
-from io import StringIO
+from io import StringIO, TextIOWrapper
 from pathlib import Path
 
 from django.core import management
@@ -53,3 +53,56 @@ def test_load_cmd(caplog, db, settings, tests_settings, tmp_path):
         "storage_samples/storage-2/ping/grey.png",
         "storage_samples/storage-2/pong/sample.nope"
     ]
+
+
+def test_load_cmd_stdin(capsysbinary, monkeypatch, db, tests_settings, tmp_path,
+                        pipe_stream):
+    """
+    Archive dumped to the standard output should be restored from the standard input.
+    """
+    appconf = tests_settings.fixtures_path / "basic_apps.json"
+    storage_1 = tests_settings.fixtures_path / "storage_samples" / "storage-1"
+    Site.objects.create(domain="foo.com", name="Foo")
+
+    management.call_command(
+        "diskette_dump",
+        "--output=-",
+        "--appconf={}".format(appconf),
+        "--storage={}".format(storage_1),
+        "--storages-exclude=*.nope",
+    )
+    captured = capsysbinary.readouterr()
+
+    assert b"Dump archive was streamed to: standard output" in captured.err
+    assert b"Checksum: " in captured.err
+
+    Site.objects.all().delete()
+    monkeypatch.setattr("sys.stdin", TextIOWrapper(pipe_stream(captured.out)))
+
+    with StringIO() as out:
+        management.call_command(
+            "diskette_load",
+            "-",
+            "--storages-basepath={}".format(tmp_path),
+            stdout=out
+        )
+
+    assert sorted(Site.objects.values_list("domain", flat=True)) == [
+        "example.com", "foo.com"
+    ]
+
+    storages_files = []
+    for root, dirs, files in os.walk(tmp_path):
+        storages_files.extend([
+            str((Path(root) / item).relative_to(tmp_path))
+            for item in files
+        ])
+
+    assert sorted(storages_files) == [
+        "tests/data_fixtures/storage_samples/storage-1/blue.png",
+        "tests/data_fixtures/storage_samples/storage-1/foo/bar/bar.txt",
+        "tests/data_fixtures/storage_samples/storage-1/foo/foo_sample.txt",
+        "tests/data_fixtures/storage_samples/storage-1/foo/grass.png",
+        "tests/data_fixtures/storage_samples/storage-1/plop/green.png",
+        "tests/data_fixtures/storage_samples/storage-1/sample.txt",
+    ]
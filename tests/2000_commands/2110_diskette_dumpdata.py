@@ -0,0 +1,181 @@
+import json
+from io import StringIO
+
+import pytest
+
+from django.contrib.auth.models import Permission
+from django.core import management
+from django.core.management.base import CommandError
+
+from sandbox.djangoapp_sample.factories import ArticleFactory, CategoryFactory
+
+from diskette.factories import UserFactory
+
+
+@pytest.mark.parametrize("arguments", [
+    [],
+    ["--chunk-size=1"],
+    ["--pagination=cursor", "--chunk-size=2"],
+    ["--pagination=keyset", "--chunk-size=2"],
+    ["--serializer=values"],
+    ["--serializer=values", "--pagination=keyset", "--chunk-size=2"],
+])
+def test_diskette_dumpdata_cmd_basic(db, arguments):
+    """
+    Command should dump the same data than Django dumpdata whatever the iteration
+    options are.
+    """
+    [UserFactory() for i in range(3)]
+
+    with StringIO() as out:
+        management.call_command("dumpdata", "auth.User", "sites", stdout=out)
+        expected = json.loads(out.getvalue())
+
+    with StringIO() as out:
+        management.call_command(
+            "diskette_dumpdata",
+            *["auth.User", "sites"] + arguments,
+            stdout=out
+        )
+        dump = json.loads(out.getvalue())
+
+    assert len(dump) == 4
+    assert dump == expected
+
+
+def test_diskette_dumpdata_cmd_output(db, tmp_path):
+    """
+    Command should write dump to the given file path and with the given format.
+    """
+    output_path = tmp_path / "sites.xml"
+
+    management.call_command(
+        "diskette_dumpdata",
+        "sites",
+        "--format=xml",
+        "--output={}".format(output_path),
+    )
+
+    content = output_path.read_text()
+    assert content.startswith("<?xml")
+    assert "<object model=\"sites.site\" pk=\"1\">" in content
+
+
+def test_diskette_dumpdata_cmd_pks(db):
+    """
+    Command should only dump objects with the given primary keys.
+    """
+    users = [UserFactory() for i in range(3)]
+
+    with StringIO() as out:
+        management.call_command(
+            "diskette_dumpdata",
+            "auth.User",
+            "--pks={},{}".format(users[0].pk, users[2].pk),
+            "--pagination=keyset",
+            stdout=out
+        )
+        dump = json.loads(out.getvalue())
+
+    assert [item["pk"] for item in dump] == [users[0].pk, users[2].pk]
+
+
+@pytest.mark.parametrize("arguments, expected", [
+    (["sites", "--format=nope"], "Unknown serialization format: nope"),
+    (["sites", "--pks=1"], "You can only use --pks option with one model"),
+    (
+        ["sites", "--chunk-size=0"],
+        "Option '--chunk-size' must be a positive integer.",
+    ),
+    (
+        ["sites", "--serializer=values", "--format=xml"],
+        "Values serializer only support these formats: json, jsonl",
+    ),
+    (
+        ["sites", "--serializer=values", "--natural-foreign"],
+        "Values serializer does not support natural keys.",
+    ),
+])
+def test_diskette_dumpdata_cmd_invalid_args(db, arguments, expected):
+    """
+    Command should raise an error for invalid argument values.
+    """
+    with StringIO() as out:
+        with pytest.raises(CommandError) as excinfo:
+            management.call_command("diskette_dumpdata", *arguments, stdout=out)
+
+    assert str(excinfo.value) == expected
+
+
+@pytest.mark.parametrize("command, arguments, queries", [
+    ("diskette_dumpdata", ["--chunk-size=2"], 4),
+    ("diskette_dumpdata", ["--chunk-size=2", "--pagination=keyset"], 7),
+    ("diskette_dumpdata", ["--chunk-size=10"], 2),
+    ("polymorphic_dumpdata", ["--chunk-size=2"], 4),
+    ("diskette_dumpdata", ["--chunk-size=2", "--serializer=values"], 4),
+])
+def test_diskette_dumpdata_cmd_m2m_queries(db, django_assert_num_queries, command,
+                                           arguments, queries):
+    """
+    Many to many relations should be fetched with a single query for each chunk of
+    objects instead of a query for each object.
+    """
+    categories = [CategoryFactory() for i in range(3)]
+    articles = [
+        ArticleFactory(fill_categories=categories[:i % 4])
+        for i in range(6)
+    ]
+
+    with StringIO() as out:
+        with django_assert_num_queries(queries):
+            management.call_command(
+                command,
+                *["djangoapp_sample.Article"] + arguments,
+                stdout=out
+            )
+        dump = json.loads(out.getvalue())
+
+    assert sorted([
+        (item["pk"], sorted(item["fields"]["categories"]))
+        for item in dump
+    ]) == [
+        (article.pk, sorted([category.pk for category in categories[:i % 4]]))
+        for i, article in enumerate(articles)
+    ]
+
+
+@pytest.mark.parametrize("label, arguments, queries", [
+    ("djangoapp_sample.Article", ["--chunk-size=2"], 5),
+    ("djangoapp_sample.Article", ["--chunk-size=2", "--pagination=keyset"], 8),
+    ("auth.User", ["--chunk-size=10"], 3),
+])
+def test_diskette_dumpdata_cmd_natural_foreign(db, django_assert_num_queries,
+                                               label, arguments, queries):
+    """
+    With natural foreign keys, related objects should be fetched once instead of a
+    query for each object and the dump should be the same than Django dumpdata.
+    """
+    authors = [UserFactory() for i in range(2)]
+    for author in authors:
+        author.user_permissions.set(Permission.objects.order_by("pk")[:3])
+
+    categories = [CategoryFactory() for i in range(3)]
+    [
+        ArticleFactory(author=authors[i % 2], fill_categories=categories[:i % 4])
+        for i in range(6)
+    ]
+
+    with StringIO() as out:
+        management.call_command("dumpdata", label, "--natural-foreign", stdout=out)
+        expected = json.loads(out.getvalue())
+
+    with StringIO() as out:
+        with django_assert_num_queries(queries):
+            management.call_command(
+                "diskette_dumpdata",
+                *[label, "--natural-foreign"] + arguments,
+                stdout=out
+            )
+        dump = json.loads(out.getvalue())
+
+    assert dump == expected
@@ -0,0 +1,183 @@
+import json
+from io import StringIO
+
+import pytest
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Permission
+from django.core import management
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from sandbox.djangoapp_sample.factories import (
+    ArticleFactory, BlogFactory, CategoryFactory
+)
+from sandbox.djangoapp_sample.models import Article, Blog, Category
+
+from diskette.factories import UserFactory
+
+
+def create_objects(length=6):
+    """
+    Create some users, blogs, categories and articles with relations.
+    """
+    authors = [UserFactory() for i in range(2)]
+    for author in authors:
+        author.user_permissions.set(Permission.objects.order_by("pk")[:3])
+
+    blog = BlogFactory()
+    categories = [CategoryFactory() for i in range(3)]
+
+    return [
+        ArticleFactory(
+            blog=blog,
+            author=authors[i % 2],
+            fill_categories=categories[:i % 4],
+        )
+        for i in range(length)
+    ]
+
+
+def delete_objects():
+    """
+    Delete every objects created from ``create_objects``.
+    """
+    Article.objects.all().delete()
+    Blog.objects.all().delete()
+    Category.objects.all().delete()
+    get_user_model().objects.all().delete()
+
+
+def dump_objects(*arguments):
+    """
+    Dump objects created from ``create_objects`` with Django dumpdata.
+    """
+    with StringIO() as out:
+        management.call_command(
+            "dumpdata",
+            *["auth.User", "djangoapp_sample"] + list(arguments),
+            stdout=out
+        )
+        return out.getvalue()
+
+
+@pytest.mark.parametrize("dump_arguments, arguments", [
+    ([], []),
+    ([], ["--batch-size=1"]),
+    ([], ["--batch-size=2"]),
+    (["--natural-foreign"], ["--batch-size=2"]),
+])
+def test_diskette_loaddata_cmd_basic(db, tmp_path, dump_arguments, arguments):
+    """
+    Command should load the same data than Django loaddata.
+    """
+    create_objects()
+    expected = dump_objects(*dump_arguments)
+
+    fixture = tmp_path / "fixture.json"
+    fixture.write_text(expected)
+    delete_objects()
+
+    with StringIO() as out:
+        management.call_command(
+            "diskette_loaddata",
+            *[str(fixture)] + arguments,
+            stdout=out
+        )
+        assert out.getvalue() == "Installed 12 object(s) from 1 fixture(s)\n"
+
+    assert json.loads(dump_objects(*dump_arguments)) == json.loads(expected)
+
+
+def test_diskette_loaddata_cmd_update(db, tmp_path):
+    """
+    Command should update objects which already exist and replace their many to
+    many relations.
+    """
+    articles = create_objects()
+    fixture = tmp_path / "fixture.json"
+    fixture.write_text(dump_objects())
+
+    Article.objects.update(title="Changed")
+    articles[3].categories.clear()
+
+    management.call_command("diskette_loaddata", str(fixture), verbosity=0)
+
+    assert Article.objects.count() == 6
+    assert sorted(Article.objects.values_list("title", flat=True)) == sorted([
+        item.title for item in articles
+    ])
+    assert articles[3].categories.count() == 3
+
+
+def test_diskette_loaddata_cmd_exclude(db, tmp_path):
+    """
+    Command should only load objects which are not excluded.
+    """
+    create_objects()
+    fixture = tmp_path / "fixture.json"
+    fixture.write_text(dump_objects())
+    delete_objects()
+
+    with StringIO() as out:
+        management.call_command(
+            "diskette_loaddata",
+            str(fixture),
+            "--exclude=djangoapp_sample.Article",
+            stdout=out
+        )
+        assert out.getvalue() == (
+            "Installed 6 object(s) (of 12) from 1 fixture(s)\n"
+        )
+
+    assert Article.objects.count() == 0
+    assert Category.objects.count() == 3
+
+
+def test_diskette_loaddata_cmd_queries(db, tmp_path):
+    """
+    Number of queries should not depend on the number of objects to load.
+    """
+    counts = []
+
+    for length in (5, 20):
+        create_objects(length)
+        fixture = tmp_path / "fixture.json"
+        fixture.write_text(dump_objects())
+        delete_objects()
+
+        with CaptureQueriesContext(connection) as queries:
+            management.call_command("diskette_loaddata", str(fixture), verbosity=0)
+
+        counts.append(len(queries))
+        assert Article.objects.count() == length
+        delete_objects()
+
+    assert counts[0] == counts[1]
+
+
+@pytest.mark.parametrize("arguments, expected", [
+    (["nope.json"], "No fixture named 'nope.json' found."),
+    (["{tmp_path}/fixture.foo"], (
+        "Problem installing fixture '{tmp_path}/fixture.foo': foo is not a known "
+        "serialization format."
+    )),
+    (["{tmp_path}/fixture.json", "--batch-size=0"], (
+        "Option '--batch-size' must be a positive integer."
+    )),
+])
+def test_diskette_loaddata_cmd_invalid_args(db, tmp_path, arguments, expected):
+    """
+    Command should raise an error for invalid arguments.
+    """
+    (tmp_path / "fixture.foo").write_text("[]")
+    (tmp_path / "fixture.json").write_text("[]")
+
+    with pytest.raises(CommandError) as excinfo:
+        management.call_command(
+            "diskette_loaddata",
+            *[item.format(tmp_path=tmp_path) for item in arguments]
+        )
+
+    assert str(excinfo.value) == expected.format(tmp_path=tmp_path)
@@ -1,6 +1,12 @@
 """
 Pytest fixtures
 """
+import hashlib
+import io
+import re
+import threading
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 
 import pytest
@@ -97,11 +103,168 @@ def mocked_version(monkeypatch):
 @pytest.fixture
 def mocked_checksum(monkeypatch):
     """
-    Mock ``diskette.utils.hashs.file_checksum`` to return a stable dummy checksum.
+    Mock ``diskette.utils.hashs.file_checksum`` and
+    ``diskette.utils.hashs.ChecksumStream.hexdigest`` to return a stable dummy
+    checksum.
     """
     def _callable(*args, **kwargs):
         return "dummy-checksum"
 
     monkeypatch.setattr(hashs, "file_checksum", _callable)
+    monkeypatch.setattr(hashs.ChecksumStream, "hexdigest", _callable)
 
     return _callable
+
+
+class PipeIO(io.RawIOBase):
+    """
+    Binary file object which can not be seeked, alike a pipe.
+
+    Arguments:
+        content (bytes): Initial content to read.
+    """
+    def __init__(self, content=b""):
+        self.content = io.BytesIO(content)
+
+    def readable(self):
+        return True
+
+    def writable(self):
+        return True
+
+    def readinto(self, b):
+        return self.content.readinto(b)
+
+    def write(self, b):
+        return self.content.write(b)
+
+    def getvalue(self):
+        return self.content.getvalue()
+
+
+@pytest.fixture
+def pipe_stream():
+    """
+    Return a function to create a binary file object which can not be seeked.
+
+    Without content, the file object is to be written. With a content, the file
+    object is buffered so its content can be peeked alike the standard input.
+    """
+    def _callable(content=None):
+        if content is None:
+            return PipeIO()
+
+        return io.BufferedReader(PipeIO(content))
+
+    return _callable
+
+
+class RangeRequestHandler(BaseHTTPRequestHandler):
+    """
+    HTTP request handler to serve files from the server directory, with entity tags,
+    conditional requests and byte ranges support alike a common HTTP server.
+
+    Server options are:
+
+    * ``accept_ranges``: If false, requested ranges are ignored and whole files are
+      served;
+    * ``interruptions``: Number of responses on a range that does not start from the
+      file start which are interrupted in the middle of their content.
+
+    Headers of each request are recorded in server attribute ``requests``.
+    """
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests.append(dict(self.headers))
+
+        path = server.directory / self.path.lstrip("/")
+        if not path.is_file():
+            self.send_error(404)
+            return
+
+        content = path.read_bytes()
+        etag = '"{}"'.format(hashlib.md5(content).hexdigest())
+        last_modified = formatdate(path.stat().st_mtime, usegmt=True)
+        start, end = 0, len(content)
+
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+
+        match = re.match(r"^bytes=(\d+)-(\d*)$", self.headers.get("Range", ""))
+        if_range = self.headers.get("If-Range")
+        is_range = bool(
+            server.accept_ranges and match and if_range in (None, etag)
+        )
+        if is_range:
+            start = int(match.group(1))
+            if match.group(2):
+                end = min(int(match.group(2)) + 1, len(content))
+
+            if start >= len(content):
+                self.send_response(416)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+
+        body = content[start:end]
+        self.send_response(206 if is_range else 200)
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", last_modified)
+        self.send_header("Content-Length", str(len(body)))
+        if server.accept_ranges:
+            self.send_header("Accept-Ranges", "bytes")
+        if is_range:
+            self.send_header(
+                "Content-Range",
+                "bytes {}-{}/{}".format(start, end - 1, len(content))
+            )
+        self.end_headers()
+
+        with server.lock:
+            interrupted = start > 0 and server.interruptions > 0
+            if interrupted:
+                server.interruptions -= 1
+
+        if interrupted:
+            self.wfile.write(body[:len(body) // 2])
+            self.close_connection = True
+            return
+
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def http_server(tmp_path):
+    """
+    Start a local HTTP server which serves files from a temporary directory.
+
+    Server object has attributes ``directory`` where to write files to serve,
+    ``url`` to the server root and the options from ``RangeRequestHandler``.
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), RangeRequestHandler)
+    server.daemon_threads = True
+    server.directory = tmp_path / "http_server"
+    server.directory.mkdir()
+    server.url = "http://127.0.0.1:{}/".format(server.server_address[1])
+    server.accept_ranges = True
+    server.interruptions = 0
+    server.requests = []
+    server.lock = threading.Lock()
+
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    yield server
+
+    server.shutdown()
+    server.server_close()
+    thread.join()